@@ -3,127 +3,427 @@ import pandas as pd
 import numpy as np
 import re
 import string
-import nltk
+import hashlib
+import datetime
+import json
+import os
 import threading
 import time
-from queue import Queue
-from textblob import TextBlob
-from collections import Counter, defaultdict
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-
-# Define a timeout function to prevent stemming from hanging
-def stem_with_timeout(stemmer, word, timeout=0.5):
-    """Stem a word with a timeout to prevent hanging"""
-    # Skip stemming for very short words or non-alphabetic strings
-    if len(word) <= 3 or not word.isalpha():
-        return word, False
+import zlib
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from stem_store import stem_store
+from aspect_analysis import aggregate_aspects, aspect_dictionary_hash, aspect_masks, generate_aspect_summary, resolve_aspects
+from aspect_analysis import extract_aspects as _extract_aspects
+
+# Time budget for stemming the vocabulary of one batch, in seconds
+STEM_BATCH_TIMEOUT = 30.0
+
+# Parallel preprocessing settings, overridable through the environment
+PREPROCESS_WORKERS = int(os.environ.get('PREPROCESS_WORKERS', 1))
+PREPROCESS_CHUNK_SIZE = int(os.environ.get('PREPROCESS_CHUNK_SIZE', 2000))
+
+# Levels of per-review preprocessing details, from cheapest to most complete
+DETAIL_LEVELS = ('none', 'counts', 'full')
+
+# Reviews processed together by the streaming pipeline
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 200))
+
+# Tokenizer used by preprocess_reviews, 'nltk' or 'whitespace'
+PREPROCESS_TOKENIZER = os.environ.get('PREPROCESS_TOKENIZER', 'nltk')
+
+# Bump whenever a change to preprocessing or sentiment analysis changes their output,
+# so cached analysis results from the previous pipeline are no longer used
+PIPELINE_VERSION = 1
+
+# Same fields as TextBlob's sentiment result
+Sentiment = namedtuple('Sentiment', ['polarity', 'subjectivity'])
+
+# Sentiment engine used by analyze_sentiment, 'textblob', 'lexicon' or 'model'
+SENTIMENT_ENGINE = os.environ.get('SENTIMENT_ENGINE', 'textblob')
+SENTIMENT_ENGINES = ('textblob', 'lexicon', 'model')
+
+# Engines that score the original review text instead of the preprocessed text
+RAW_TEXT_ENGINES = ('lexicon', 'model')
+
+# Indonesian lexicon engine settings
+SENTIMENT_LEXICON_PATH = os.environ.get('SENTIMENT_LEXICON_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'sentiment', 'lexicon_id.json'))
+NEGATION_FACTOR = -0.74  # Weight multiplier for negated words, as in VADER
+NEGATION_SCOPE = 3  # Tokens after a negation that it can apply to
+LEXICON_NORMALIZATION_ALPHA = 15.0  # Maps summed weights into (-1, 1), as in VADER
+
+# Rating-supervised model engine settings (see train_sentiment_model.py)
+SENTIMENT_MODEL_PATH = os.environ.get('SENTIMENT_MODEL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sentiment_model.npy'))
+HASHED_FEATURES = 2 ** 20  # Default size of the hashed n-gram feature space
+_BIGRAM_HASH_MULTIPLIER = np.uint64(1000003)
+
+# Guards the lazy loading of NLTK and Sastrawi resources
+_nlp_lock = threading.Lock()
+_punkt_available = None
+_tokenizer_fallback_warned = False
+_stemmer_version = None
+
+def _check_punkt():
+    """Check once whether NLTK's Punkt data is installed locally"""
+    global _punkt_available
+    if _punkt_available is None:
+        with _nlp_lock:
+            if _punkt_available is None:
+                import nltk
+                try:
+                    nltk.data.find('tokenizers/punkt_tab')
+                    _punkt_available = True
+                except LookupError:
+                    logger.info("NLTK punkt data is not installed, the 'nltk' tokenizer falls back to whitespace splitting")
+                    _punkt_available = False
+    return _punkt_available
+
+def _warn_tokenizer_fallback(tokenizer):
+    """Warn once per process when the requested 'nltk' tokenizer will really split on whitespace"""
+    global _tokenizer_fallback_warned
+    if tokenizer == 'nltk' and not _tokenizer_fallback_warned and not _check_punkt():
+        _tokenizer_fallback_warned = True
+        logger.warning("Preprocessing with tokenizer 'nltk' but NLTK punkt data is not installed, "
+                       "tokenizing on whitespace instead (install it with: python -m nltk.downloader punkt_tab)")
+
+def nltk_tokenize(text):
+    """Tokenize text with NLTK's Punkt + Treebank word tokenizer"""
+    if not _check_punkt():
+        return whitespace_tokenize(text)
+
+    import nltk
+    return nltk.word_tokenize(text)
+
+def stemmer_version():
+    """
+    Identify the Sastrawi release and root-word dictionary the stemmer is built from
 
-    result_queue = Queue()
+    Either changing changes the stems, so stored stems and cached analysis
+    results are keyed by this version. Computed without building the stemmer.
 
-    def worker():
+    Returns:
+        str: Version string, e.g. 'sastrawi1.0.1.426a3c4a'
+    """
+    global _stemmer_version
+    if _stemmer_version is None:
+        import importlib.metadata
+        import importlib.util
         try:
-            result = stemmer.stem(word)
-            result_queue.put(result)
-        except Exception as e:
-            result_queue.put(word)  # Return original word on error
+            release = importlib.metadata.version('Sastrawi')
+        except importlib.metadata.PackageNotFoundError:
+            release = 'unknown'
+
+        digest = 'nodict'
+        spec = importlib.util.find_spec('Sastrawi')
+        if spec is not None and spec.submodule_search_locations:
+            dictionary_path = os.path.join(spec.submodule_search_locations[0], 'Stemmer', 'data', 'kata-dasar.txt')
+            try:
+                with open(dictionary_path, 'rb') as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()[:8]
+            except OSError as e:
+                logger.warning(f"Error reading the Sastrawi dictionary for its version: {str(e)}")
+        _stemmer_version = f"sastrawi{release}.{digest}"
+    return _stemmer_version
+
+def pipeline_version(tokenizer=None, engine=None):
+    """
+    Identify the preprocessing + sentiment pipeline that produces analysis results
 
-    # Start worker thread
-    thread = threading.Thread(target=worker)
-    thread.daemon = True
-    thread.start()
+    Args:
+        tokenizer (str, optional): Tokenizer name, defaults to PREPROCESS_TOKENIZER
+        engine (str, optional): Sentiment engine name, defaults to SENTIMENT_ENGINE
 
-    try:
-        # Wait for result with timeout
-        result = result_queue.get(timeout=timeout)
-        return result, False
-    except:
-        return word, True  # Return original word on timeout
-
-# Download NLTK resources if not already available
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-# Initialize Sastrawi components
-stemmer_factory = StemmerFactory()
-stemmer = stemmer_factory.create_stemmer()
-
-stopword_factory = StopWordRemoverFactory()
-stopword_remover = stopword_factory.create_stop_word_remover()
-stopwords_list = stopword_factory.get_stop_words()
-
-# Add custom stopwords - common words in reviews that don't contribute to sentiment
+    Returns:
+        str: Version string, e.g. 'v1-nltk-sastrawi1.0.1.426a3c4a-textblob'
+    """
+    tokenizer = tokenizer or PREPROCESS_TOKENIZER
+    # Without punkt the 'nltk' tokenizer really splits on whitespace
+    if tokenizer == 'nltk' and not _check_punkt():
+        tokenizer = 'whitespace'
+    engine = engine or SENTIMENT_ENGINE
+    if engine == 'model':
+        # Retraining changes the scores, so the model's own version is part of the pipeline's
+        engine = f"model.{_load_sentiment_model()['version']}"
+    elif engine == 'lexicon':
+        # So do lexicon edits, so cached scores and aggregates follow the lexicon's content
+        engine = f"lexicon.{_load_sentiment_lexicon()['version']}"
+    return f"v{PIPELINE_VERSION}-{tokenizer}-{stemmer_version()}-{engine}"
+
+def review_content_hash(content):
+    """
+    Hash review text for caching analysis results by content
+
+    Args:
+        content (str): Raw review text
+
+    Returns:
+        str: Hex SHA-1 digest of the text
+    """
+    return hashlib.sha1((content or '').encode('utf-8')).hexdigest()
+
+def whitespace_tokenize(text):
+    """
+    Tokenize already cleaned text by splitting on whitespace
+
+    ASCII punctuation and digits are gone by the time text is tokenized, so
+    this is the fast path; it only differs from NLTK on leftover non-ASCII
+    punctuation (see benchmark_tokenizer.py).
+    """
+    return text.split()
+
+TOKENIZERS = {
+    'nltk': nltk_tokenize,
+    'whitespace': whitespace_tokenize
+}
+
+def stem_vocabulary(stemmer, words, timeout=STEM_BATCH_TIMEOUT, store=stem_store):
+    """
+    Stem each distinct word of a batch once, within a single time budget
+
+    Known stems come from the persistent stem store shared by all workers;
+    only the remaining words are stemmed, and their stems are added to the
+    store. Stemming runs on one worker thread so a pathological word can't
+    hang the request; words not reached before the budget runs out are left
+    unstemmed.
+
+    Args:
+        stemmer: Sastrawi stemmer
+        words (iterable): Words to stem, duplicates allowed
+        timeout (float): Time budget for the whole batch, in seconds
+        store (StemStore): Persistent token -> stem store
+
+    Returns:
+        dict: Mapping of every input word to its stem
+    """
+    vocabulary = set(words)
+    store.use_version(stemmer_version())
+    # Skip stemming for very short words or non-alphabetic strings
+    stemmable = [word for word in vocabulary if len(word) > 3 and word.isalpha()]
+    known = store.lookup(stemmable)
+    pending = [word for word in stemmable if word not in known]
+    stems = {}
+    failed = set()
+    stop = threading.Event()
+
+    def worker():
+        for word in pending:
+            if stop.is_set():
+                break
+            try:
+                stems[word] = stemmer.stem(word)
+            except Exception as e:
+                logger.error(f"Error stemming word '{word}': {str(e)}")
+                failed.add(word)
+                stems[word] = word  # Use original word if stemming fails
+
+    if pending:
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            stop.set()
+            logger.warning(f"Stemming timed out after {timeout}s, {len(pending) - len(stems)} words left unstemmed")
+
+    stems = dict(stems)
+    store.add({word: stem for word, stem in stems.items() if word not in failed})
+    stems.update(known)
+    return {word: stems.get(word, word) for word in vocabulary}
+
+# Custom stopwords - common words in reviews that don't contribute to sentiment
 custom_stopwords = [
     'app', 'aplikasi', 'bank', 'jago', 'allo', 'blu', 'btpn', 'bca', 'jenius',
     'seabank', 'raya', 'neo', 'update', 'version', 'versi', 'download', 'user',
     'please', 'tolong', 'mohon', 'ya', 'iya', 'ok', 'oke', 'okay'
 ]
-all_stopwords = stopwords_list + custom_stopwords
+
+# NLP resources are built on first use (or by warmup()) instead of at import
+stemmer = None
+all_stopwords = None
+all_stopwords_set = None
+
+def _load_nlp_resources():
+    """
+    Build the Sastrawi stemmer and the stopword set once per process
+
+    Returns:
+        tuple: (stemmer, stopword set)
+    """
+    global stemmer, all_stopwords, all_stopwords_set
+    if all_stopwords_set is None:
+        with _nlp_lock:
+            if all_stopwords_set is None:
+                from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+                from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+
+                stemmer = StemmerFactory().create_stemmer()
+                all_stopwords = StopWordRemoverFactory().get_stop_words() + custom_stopwords
+                all_stopwords_set = frozenset(all_stopwords)
+    return stemmer, all_stopwords_set
+
+def warmup():
+    """
+    Load every NLP resource used by the analysis functions
+
+    Call this before forking workers (e.g. from gunicorn with preload_app) so
+    the workers share the loaded dictionaries instead of each building its
+    own. Never downloads anything: missing NLTK data only switches the 'nltk'
+    tokenizer to its whitespace fallback.
+    """
+    started = time.perf_counter()
+    _load_nlp_resources()
+    _check_punkt()
+
+    # TextBlob loads its sentiment lexicon on first use
+    from textblob import TextBlob
+    TextBlob('warmup').sentiment
+
+    if SENTIMENT_ENGINE == 'lexicon':
+        _load_sentiment_lexicon()
+    elif SENTIMENT_ENGINE == 'model':
+        _load_sentiment_model()
+
+    # Compile the aspect matcher once for all workers
+    resolve_aspects(None, ASPECT_DICTIONARY)
+
+    import sklearn.feature_extraction.text  # noqa: F401
+
+    logger.info(f"NLP resources warmed up in {time.perf_counter() - started:.2f}s")
 
 logger = logging.getLogger(__name__)
 
-def preprocess_reviews(reviews):
+def preprocess_reviews(reviews, workers=None, chunk_size=PREPROCESS_CHUNK_SIZE, details='full', tokenizer=None):
     """
     Preprocess review text for sentiment analysis with detailed Indonesian language processing
 
+    With `workers` > 1, large batches are split into chunks that are
+    preprocessed in a process pool. The stemmer and stopwords are built once
+    per process on first use (or inherited on fork after warmup()) and
+    reused for every chunk. Output order and
+    format are the same as in the single-process mode.
+
+    The `details` level controls how much of each review's processing is
+    recorded: 'full' keeps every intermediate string for display, 'counts'
+    only the token counts, and 'none' skips the details entirely.
+
     Args:
         reviews (list): List of review dictionaries
+        workers (int, optional): Number of worker processes, defaults to PREPROCESS_WORKERS
+        chunk_size (int): Reviews per chunk in parallel mode
+        details (str): Detail level, one of 'none', 'counts' or 'full'
+        tokenizer (str, optional): Name of a TOKENIZERS entry, defaults to PREPROCESS_TOKENIZER
 
     Returns:
         list: List of preprocessed review texts and processing details
+        (an empty list of details when details is 'none')
+
+    Raises:
+        ValueError: If the detail level or tokenizer is unknown
     """
+    if details not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown preprocessing detail level '{details}', expected one of {DETAIL_LEVELS}")
+    if tokenizer is None:
+        tokenizer = PREPROCESS_TOKENIZER
+    if tokenizer not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer '{tokenizer}', expected one of {tuple(TOKENIZERS)}")
+    _warn_tokenizer_fallback(tokenizer)
+
+    if workers is None:
+        workers = PREPROCESS_WORKERS
+    if workers <= 1 or len(reviews) <= chunk_size:
+        return _preprocess_chunk(reviews, details, tokenizer)
+
+    chunks = [reviews[start:start + chunk_size] for start in range(0, len(reviews), chunk_size)]
+    logger.info(f"Preprocessing {len(reviews)} reviews in {len(chunks)} chunks on {workers} processes")
+
     processed_texts = []
     preprocessing_details = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        # map() yields results in submission order, so chunks are reassembled in input order
+        for chunk_texts, chunk_details in executor.map(_preprocess_chunk, chunks, [details] * len(chunks),
+                                                          [tokenizer] * len(chunks)):
+            processed_texts.extend(chunk_texts)
+            preprocessing_details.extend(chunk_details)
 
-    for review in reviews:
-        if 'content' in review and review['content']:
-            text = review['content']
+    return processed_texts, preprocessing_details
 
-            # Store original text for comparison
-            original_text = text
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_DIGITS_PATTERN = re.compile(r'\d+')
+
+def clean_review_text(text):
+    """
+    Apply the cleaning steps that precede tokenization
+
+    Args:
+        text (str): Raw review text
+
+    Returns:
+        str: Lowercased text without URLs, punctuation and numbers
+    """
+    # Step 1: Convert to lowercase
+    text = text.lower()
 
-            # Step 1: Convert to lowercase
-            text = text.lower()
+    # Step 2: Remove URLs
+    text = _URL_PATTERN.sub('', text)
 
-            # Step 2: Remove URLs
-            text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    # Step 3: Remove punctuation and special characters
+    text = text.translate(_PUNCTUATION_TABLE)
 
-            # Step 3: Remove punctuation and special characters
-            text = text.translate(str.maketrans('', '', string.punctuation))
+    # Step 4: Remove numbers
+    text = _DIGITS_PATTERN.sub('', text)
 
-            # Step 4: Remove numbers
-            text = re.sub(r'\d+', '', text)
+    return text
+
+def _preprocess_chunk(reviews, details='full', tokenizer='nltk'):
+    """
+    Preprocess a batch of reviews in the current process
+
+    Args:
+        reviews (list): List of review dictionaries
+        details (str): Detail level, one of 'none', 'counts' or 'full'
+        tokenizer (str): Name of a TOKENIZERS entry
+
+    Returns:
+        list: List of preprocessed review texts and processing details
+    """
+    tokenize = TOKENIZERS[tokenizer]
+    stemmer, stopwords = _load_nlp_resources()
+    processed_texts = []
+    preprocessing_details = []
+
+    # First pass: clean and tokenize every review, collecting the batch vocabulary
+    tokenized_reviews = []
+    vocabulary = set()
+
+    for review in reviews:
+        if 'content' in review and review['content']:
+            # Store original text for comparison
+            original_text = review['content']
+
+            # Steps 1-4: Lowercase, remove URLs, punctuation and numbers
+            text = clean_review_text(original_text)
 
             # Step 5: Tokenization
-            tokens = nltk.word_tokenize(text)
+            tokens = tokenize(text)
 
             # Step 6: Remove stopwords
-            filtered_tokens = [word for word in tokens if word not in all_stopwords]
+            filtered_tokens = [word for word in tokens if word not in stopwords]
 
-            # Step 7: Stemming with Sastrawi (with error handling and timeout)
-            stemmed_tokens = []
-            for word in filtered_tokens:
-                try:
-                    # Skip very short words (likely not Indonesian)
-                    if len(word) <= 2:
-                        stemmed_tokens.append(word)
-                    else:
-                        # Use threaded stemmer with timeout
-                        stemmed_word, timed_out = stem_with_timeout(stemmer, word, timeout=1.0)
-                        stemmed_tokens.append(stemmed_word)
-
-                        if timed_out:
-                            logger.warning(f"Stemming timed out for word: {word}")
-                except Exception as e:
-                    logger.error(f"Error stemming word '{word}': {str(e)}")
-                    stemmed_tokens.append(word)  # Use original word if stemming fails
+            tokenized_reviews.append((original_text, text, tokens, filtered_tokens))
+            vocabulary.update(filtered_tokens)
+        else:
+            tokenized_reviews.append(None)
+
+    # Step 7: Stemming with Sastrawi, once per distinct word in the batch
+    stems = stem_vocabulary(stemmer, vocabulary)
+
+    # Second pass: map stems back onto each review
+    for tokenized in tokenized_reviews:
+        if tokenized is not None:
+            original_text, text, tokens, filtered_tokens = tokenized
+            stemmed_tokens = [stems[word] for word in filtered_tokens]
 
             # Step 8: Join tokens back to text
             preprocessed_text = ' '.join(stemmed_tokens)
@@ -131,46 +431,66 @@ def preprocess_reviews(reviews):
             # Step 9: Remove extra spaces
             preprocessed_text = re.sub(r'\s+', ' ', preprocessed_text).strip()
 
-            # Store processing details for display
-            processing_detail = {
-                'original': original_text,
-                'lowercase': text,
-                'after_tokenization': ' '.join(tokens),
-                'after_stopword_removal': ' '.join(filtered_tokens),
-                'after_stemming': preprocessed_text,
-                'original_token_count': len(tokens),
-                'processed_token_count': len(stemmed_tokens),
-                'removed_stopwords': [word for word in tokens if word in all_stopwords]
-            }
-
             processed_texts.append(preprocessed_text)
-            preprocessing_details.append(processing_detail)
+
+            # Store processing details for display
+            if details == 'full':
+                preprocessing_details.append({
+                    'original': original_text,
+                    'lowercase': text,
+                    'after_tokenization': ' '.join(tokens),
+                    'after_stopword_removal': ' '.join(filtered_tokens),
+                    'after_stemming': preprocessed_text,
+                    'original_token_count': len(tokens),
+                    'processed_token_count': len(stemmed_tokens),
+                    'removed_stopwords': [word for word in tokens if word in stopwords]
+                })
+            elif details == 'counts':
+                preprocessing_details.append({
+                    'original_token_count': len(tokens),
+                    'processed_token_count': len(stemmed_tokens)
+                })
         else:
             # Handle empty reviews
             processed_texts.append("")
-            preprocessing_details.append({
-                'original': "",
-                'lowercase': "",
-                'after_tokenization': "",
-                'after_stopword_removal': "",
-                'after_stemming': "",
-                'original_token_count': 0,
-                'processed_token_count': 0,
-                'removed_stopwords': []
-            })
+            if details == 'full':
+                preprocessing_details.append({
+                    'original': "",
+                    'lowercase': "",
+                    'after_tokenization': "",
+                    'after_stopword_removal': "",
+                    'after_stemming': "",
+                    'original_token_count': 0,
+                    'processed_token_count': 0,
+                    'removed_stopwords': []
+                })
+            elif details == 'counts':
+                preprocessing_details.append({
+                    'original_token_count': 0,
+                    'processed_token_count': 0
+                })
 
     return processed_texts, preprocessing_details
 
-def analyze_sentiment(texts):
+def analyze_sentiment(texts, engine=None):
     """
     Perform sentiment analysis on preprocessed texts
 
     Args:
-        texts (list): List of preprocessed texts
+        texts (list): List of preprocessed texts (original review texts for the lexicon engine,
+            see sentiment_input_texts)
+        engine (str, optional): One of SENTIMENT_ENGINES, defaults to SENTIMENT_ENGINE
 
     Returns:
         list: List of sentiment analysis results
     """
+    engine = engine or SENTIMENT_ENGINE
+    if engine != 'textblob':
+        polarity, subjectivity = score_sentiment(texts, engine)
+        return [Sentiment(p, s) for p, s in zip(polarity.tolist(), subjectivity.tolist())]
+
+    from textblob import TextBlob
+
     sentiment_results = []
 
     for text in texts:
@@ -181,18 +501,453 @@ def analyze_sentiment(texts):
                 sentiment_results.append(analysis.sentiment)
             else:
                 # Handle empty texts
-                from collections import namedtuple
-                Sentiment = namedtuple('Sentiment', ['polarity', 'subjectivity'])
                 sentiment_results.append(Sentiment(polarity=0.0, subjectivity=0.0))
         except Exception as e:
             logger.error(f"Error analyzing sentiment: {str(e)}")
             # Return neutral sentiment if analysis fails
-            from collections import namedtuple
-            Sentiment = namedtuple('Sentiment', ['polarity', 'subjectivity'])
             sentiment_results.append(Sentiment(polarity=0.0, subjectivity=0.0))
 
     return sentiment_results
 
+def sentiment_input_texts(reviews, processed_texts, engine=None):
+    """
+    Pick the texts a sentiment engine should score
+
+    The lexicon and model engines need negations such as 'tidak', which
+    stopword removal drops from the preprocessed text, so they score the
+    original review text.
+
+    Args:
+        reviews (list): List of review dictionaries
+        processed_texts (list): Preprocessed texts for the same reviews
+        engine (str, optional): One of SENTIMENT_ENGINES, defaults to SENTIMENT_ENGINE
+
+    Returns:
+        list: Texts to pass to analyze_sentiment or score_sentiment
+    """
+    if (engine or SENTIMENT_ENGINE) in RAW_TEXT_ENGINES:
+        return [review.get('content') or '' for review in reviews]
+    return processed_texts
+
+def score_sentiment(texts, engine=None):
+    """
+    Score a batch of texts and return the scores as arrays
+
+    Args:
+        texts (list): Texts to score, see analyze_sentiment
+        engine (str, optional): One of SENTIMENT_ENGINES, defaults to SENTIMENT_ENGINE
+
+    Returns:
+        tuple: (polarity, subjectivity) float64 NumPy arrays
+
+    Raises:
+        ValueError: If the engine is unknown
+    """
+    engine = engine or SENTIMENT_ENGINE
+    if engine == 'lexicon':
+        return lexicon_sentiment_scores(texts)
+    if engine == 'model':
+        return model_sentiment_scores(texts)
+    if engine == 'textblob':
+        results = analyze_sentiment(texts, engine='textblob')
+        return (np.array([r.polarity for r in results], dtype=np.float64),
+                np.array([r.subjectivity for r in results], dtype=np.float64))
+    raise ValueError(f"Unknown sentiment engine '{engine}', expected one of {SENTIMENT_ENGINES}")
+
+# Label codes used by SentimentBatch, index into SENTIMENT_LABELS
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+NEGATIVE, NEUTRAL, POSITIVE = range(3)
+
+def categorize_sentiments(scores, threshold=0.1):
+    """
+    Vectorized categorize_sentiment
+
+    Args:
+        scores (array-like): Sentiment polarity scores
+        threshold (float): Scores above threshold are positive, below -threshold negative
+
+    Returns:
+        numpy.ndarray: int8 label codes indexing SENTIMENT_LABELS
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    return (NEUTRAL + (scores > threshold).view(np.int8) - (scores < -threshold).view(np.int8)).astype(np.int8)
+
+def _review_timestamp(value):
+    """Convert a review 'at' value (datetime, ISO string or epoch milliseconds) to datetime64"""
+    if value is None or value == '':
+        return np.datetime64('NaT', 's')
+    if isinstance(value, (int, float)):
+        return np.datetime64(int(value) // 1000, 's')
+    try:
+        if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, 's')
+    except (TypeError, ValueError):
+        return np.datetime64('NaT', 's')
+
+class SentimentBatch:
+    """
+    Columnar sentiment results for a batch of reviews
+
+    Polarity and subjectivity are float64 arrays in review order, with
+    optional star ratings (0 where missing) and review timestamps
+    (datetime64, NaT where missing). Categorisation and summaries run on the
+    arrays instead of per-review Python objects. Indexing and iterating still
+    yield Sentiment tuples for code written against analyze_sentiment.
+    """
+    __slots__ = ('polarity', 'subjectivity', 'ratings', 'timestamps')
+
+    def __init__(self, polarity, subjectivity, ratings=None, timestamps=None):
+        self.polarity = np.asarray(polarity, dtype=np.float64)
+        self.subjectivity = np.asarray(subjectivity, dtype=np.float64)
+        self.ratings = None if ratings is None else np.asarray(ratings, dtype=np.int8)
+        self.timestamps = None if timestamps is None else np.asarray(timestamps, dtype='datetime64[s]')
+
+    @classmethod
+    def from_reviews(cls, reviews, polarity, subjectivity):
+        """
+        Build a batch and attach the ratings and timestamps of the scored reviews
+
+        Args:
+            reviews (list): Review dictionaries, in the same order as the scores
+            polarity (array-like): Polarity scores
+            subjectivity (array-like): Subjectivity scores
+
+        Returns:
+            SentimentBatch: Batch with ratings and timestamps columns
+        """
+        ratings = np.fromiter((_review_rating(review.get('score')) for review in reviews),
+                              dtype=np.int8, count=len(reviews))
+        timestamps = np.array([_review_timestamp(review.get('at')) for review in reviews], dtype='datetime64[s]')
+        return cls(polarity, subjectivity, ratings, timestamps)
+
+    def __len__(self):
+        return len(self.polarity)
+
+    def __getitem__(self, index):
+        return Sentiment(float(self.polarity[index]), float(self.subjectivity[index]))
+
+    def __iter__(self):
+        return map(Sentiment, self.polarity.tolist(), self.subjectivity.tolist())
+
+    def take(self, indices):
+        """Return a new batch with the rows at indices"""
+        return SentimentBatch(
+            self.polarity[indices],
+            self.subjectivity[indices],
+            None if self.ratings is None else self.ratings[indices],
+            None if self.timestamps is None else self.timestamps[indices]
+        )
+
+    def label_codes(self, threshold=0.0):
+        """
+        Categorise polarity into label codes
+
+        Args:
+            threshold (float): 0.0 labels by sign as the endpoints do, 0.1 matches categorize_sentiment
+
+        Returns:
+            numpy.ndarray: int8 codes indexing SENTIMENT_LABELS
+        """
+        return categorize_sentiments(self.polarity, threshold)
+
+    def labels(self, threshold=0.0):
+        """Sentiment label strings in review order"""
+        return np.array(SENTIMENT_LABELS, dtype=object)[self.label_codes(threshold)].tolist()
+
+    def counts(self, threshold=0.0):
+        """
+        Count reviews per sentiment label
+
+        Returns:
+            dict: {'positive': int, 'neutral': int, 'negative': int}
+        """
+        counts = np.bincount(self.label_codes(threshold), minlength=len(SENTIMENT_LABELS))
+        return {
+            'positive': int(counts[POSITIVE]),
+            'neutral': int(counts[NEUTRAL]),
+            'negative': int(counts[NEGATIVE])
+        }
+
+    def rating_distribution(self):
+        """
+        Count reviews per star rating
+
+        Returns:
+            dict: Counts keyed by '5' down to '1', reviews without a valid rating are left out
+        """
+        if self.ratings is None:
+            return {str(star): 0 for star in range(5, 0, -1)}
+        counts = np.bincount(self.ratings[(self.ratings >= 1) & (self.ratings <= 5)], minlength=6)
+        return {str(star): int(counts[star]) for star in range(5, 0, -1)}
+
+    def average_rating(self):
+        """Mean star rating over all reviews, missing ratings count as 0"""
+        if self.ratings is None or not len(self.ratings):
+            return 0
+        return float(self.ratings.mean())
+
+    def summary(self, threshold=0.1):
+        """
+        Summarise the batch, see generate_review_sentiment_summary
+
+        Returns:
+            dict: Label counts and average polarity
+        """
+        counts = self.counts(threshold)
+        return {
+            'positive_count': counts['positive'],
+            'neutral_count': counts['neutral'],
+            'negative_count': counts['negative'],
+            'avg_sentiment': float(self.polarity.mean()) if len(self.polarity) else 0
+        }
+
+def _review_rating(value):
+    """Star rating as an int, 0 when missing or invalid"""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def analyze_sentiment_batch(texts, engine=None, reviews=None):
+    """
+    Score texts and return the results as a SentimentBatch
+
+    Args:
+        texts (list): Texts to score, see analyze_sentiment
+        engine (str, optional): One of SENTIMENT_ENGINES, defaults to SENTIMENT_ENGINE
+        reviews (list, optional): The scored reviews, to attach their ratings and timestamps
+
+    Returns:
+        SentimentBatch: Sentiment results in text order
+    """
+    polarity, subjectivity = score_sentiment(texts, engine)
+    if reviews is not None:
+        return SentimentBatch.from_reviews(reviews, polarity, subjectivity)
+    return SentimentBatch(polarity, subjectivity)
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def _load_sentiment_lexicon():
+    """
+    Load the Indonesian sentiment lexicon once per process
+
+    Lexicon words are stemmed like review tokens so inflected forms match
+    (e.g. 'mengecewakan' and 'kecewa'). Negations and intensifiers are
+    matched on unstemmed tokens.
+
+    Returns:
+        dict: 'index' (stem -> feature id), 'weights' (NumPy array), 'negations',
+        'intensifiers', 'post_intensifiers' and 'version' (content hash of the file)
+    """
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                with open(SENTIMENT_LEXICON_PATH, 'rb') as f:
+                    raw = f.read()
+                data = json.loads(raw.decode('utf-8'))
+
+                stemmer, _ = _load_nlp_resources()
+                stems = stem_vocabulary(stemmer, data['words'])
+                weights_by_stem = {}
+                for word, weight in data['words'].items():
+                    stem = stems[word]
+                    # Keep the strongest weight when several words share a stem
+                    if abs(weight) > abs(weights_by_stem.get(stem, 0)):
+                        weights_by_stem[stem] = weight
+
+                _lexicon = {
+                    'index': {stem: i for i, stem in enumerate(weights_by_stem)},
+                    'weights': np.array(list(weights_by_stem.values()), dtype=np.float64),
+                    'negations': frozenset(data.get('negations', [])),
+                    'intensifiers': data.get('intensifiers', {}),
+                    'post_intensifiers': data.get('post_intensifiers', {}),
+                    'version': hashlib.sha1(raw).hexdigest()[:8]
+                }
+                logger.info(f"Loaded sentiment lexicon with {len(weights_by_stem)} stems from {SENTIMENT_LEXICON_PATH}")
+    return _lexicon
+
+def lexicon_sentiment_scores(texts):
+    """
+    Score texts with the Indonesian sentiment lexicon
+
+    Each lexicon hit becomes one entry (review, lexicon word, multiplier) of a
+    sparse review x word matrix, where the multiplier carries negation
+    (NEGATION_FACTOR within NEGATION_SCOPE tokens) and intensifiers. Raw
+    scores are the product of that matrix with the weight vector, computed
+    for the whole batch with np.bincount, and normalized into (-1, 1).
+    Subjectivity is the share of tokens that are lexicon words.
+
+    Args:
+        texts (list): Review texts, ideally the original content so negations are kept
+
+    Returns:
+        tuple: (polarity, subjectivity) float64 NumPy arrays
+    """
+    lexicon = _load_sentiment_lexicon()
+    index = lexicon['index']
+    negations = lexicon['negations']
+    intensifiers = lexicon['intensifiers']
+    post_intensifiers = lexicon['post_intensifiers']
+
+    token_lists = [whitespace_tokenize(clean_review_text(text)) if text else [] for text in texts]
+    stemmer, _ = _load_nlp_resources()
+    stems = stem_vocabulary(stemmer, (token for tokens in token_lists for token in tokens))
+
+    doc_ids = []
+    feature_ids = []
+    multipliers = []
+    token_counts = np.zeros(len(texts), dtype=np.float64)
+
+    for doc_id, tokens in enumerate(token_lists):
+        token_counts[doc_id] = len(tokens)
+        negation_left = 0
+        boost = 1.0
+        after_hit = False
+
+        for token in tokens:
+            if after_hit and token in post_intensifiers:
+                # 'bagus banget': strengthen the word just scored
+                multipliers[-1] *= post_intensifiers[token]
+                after_hit = False
+                continue
+            if token in negations:
+                negation_left = NEGATION_SCOPE
+                after_hit = False
+                continue
+            if token in intensifiers:
+                boost *= intensifiers[token]
+                after_hit = False
+                continue
+
+            feature_id = index.get(stems[token])
+            if feature_id is None:
+                negation_left = max(0, negation_left - 1)
+                boost = 1.0
+                after_hit = False
+                continue
+
+            doc_ids.append(doc_id)
+            feature_ids.append(feature_id)
+            multipliers.append(boost * (NEGATION_FACTOR if negation_left else 1.0))
+            negation_left = 0
+            boost = 1.0
+            after_hit = True
+
+    doc_ids = np.array(doc_ids, dtype=np.intp)
+    contributions = np.array(multipliers, dtype=np.float64) * lexicon['weights'][np.array(feature_ids, dtype=np.intp)]
+
+    raw_scores = np.bincount(doc_ids, weights=contributions, minlength=len(texts)).astype(np.float64)
+    hits = np.bincount(doc_ids, minlength=len(texts)).astype(np.float64)
+
+    polarity = raw_scores / np.sqrt(raw_scores * raw_scores + LEXICON_NORMALIZATION_ALPHA)
+    subjectivity = np.divide(hits, token_counts, out=np.zeros_like(hits), where=token_counts > 0)
+    return polarity, subjectivity
+
+def hashed_ngram_features(texts, n_features=HASHED_FEATURES, bigrams=True):
+    """
+    Map texts to binary hashed unigram + bigram features
+
+    Texts are cleaned like preprocess_reviews but neither stopword-filtered nor
+    stemmed, so negation bigrams such as 'tidak bagus' survive. Token hashes
+    are stable CRC32 values (Python's hash() is salted per process) and
+    bigram hashes are combined from them with NumPy.
+
+    Args:
+        texts (list): Review texts
+        n_features (int): Size of the feature space, a power of two
+        bigrams (bool): Whether to add bigram features
+
+    Returns:
+        tuple: (doc_ids, feature_ids) int64 NumPy arrays, one entry per distinct
+        feature of each text, i.e. the coordinates of a sparse binary matrix
+    """
+    token_lists = [whitespace_tokenize(clean_review_text(text)) if text else [] for text in texts]
+
+    vocabulary = {}
+    token_ids = [vocabulary.setdefault(token, len(vocabulary)) for tokens in token_lists for token in tokens]
+    vocabulary_hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in vocabulary),
+                                    dtype=np.uint64, count=len(vocabulary))
+    token_hashes = vocabulary_hashes[np.array(token_ids, dtype=np.intp)]
+    token_docs = np.repeat(np.arange(len(texts), dtype=np.int64),
+                           np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(texts)))
+
+    mask = np.uint64(n_features - 1)
+    doc_ids = [token_docs]
+    feature_ids = [token_hashes & mask]
+    if bigrams and len(token_hashes) > 1:
+        # Consecutive tokens of the same text form a bigram
+        same_doc = token_docs[:-1] == token_docs[1:]
+        bigram_hashes = (token_hashes[:-1][same_doc] * _BIGRAM_HASH_MULTIPLIER) ^ token_hashes[1:][same_doc]
+        doc_ids.append(token_docs[:-1][same_doc])
+        feature_ids.append(bigram_hashes & mask)
+
+    # Binary features: keep each (text, feature) pair once (sorting beats np.unique's hashing here)
+    keys = np.concatenate(doc_ids) * n_features + np.concatenate(feature_ids).astype(np.int64)
+    keys.sort()
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+    return keys // n_features, keys % n_features
+
+_sentiment_model = None
+_sentiment_model_lock = threading.Lock()
+
+def _load_sentiment_model():
+    """
+    Load the trained sentiment model once per process
+
+    Weights are memory-mapped read-only, so forked workers share one copy
+    through the page cache.
+
+    Returns:
+        dict: 'weights' (memory-mapped NumPy array) plus the model metadata
+    """
+    global _sentiment_model
+    if _sentiment_model is None:
+        with _sentiment_model_lock:
+            if _sentiment_model is None:
+                metadata_path = os.path.splitext(SENTIMENT_MODEL_PATH)[0] + '.json'
+                if not os.path.exists(SENTIMENT_MODEL_PATH) or not os.path.exists(metadata_path):
+                    raise FileNotFoundError(
+                        f"No sentiment model at {SENTIMENT_MODEL_PATH}, train one with train_sentiment_model.py"
+                    )
+                with open(metadata_path, encoding='utf-8') as f:
+                    metadata = json.load(f)
+                _sentiment_model = dict(metadata, weights=np.load(SENTIMENT_MODEL_PATH, mmap_mode='r'))
+                logger.info(f"Loaded sentiment model {metadata['version']} trained on {metadata['train_count']} reviews")
+    return _sentiment_model
+
+def model_sentiment_scores(texts):
+    """
+    Score texts with the rating-supervised hashed n-gram model
+
+    The batch becomes one sparse binary text x feature matrix and the scores
+    are its product with the weight vector, computed with np.bincount.
+
+    Args:
+        texts (list): Review texts, ideally the original content so negations are kept
+
+    Returns:
+        tuple: (polarity, subjectivity) float64 NumPy arrays. Polarity is
+        2 * P(positive) - 1; subjectivity is the share of a text's features
+        seen during training
+    """
+    model = _load_sentiment_model()
+    weights = model['weights']
+    doc_ids, feature_ids = hashed_ngram_features(texts, n_features=model['n_features'], bigrams=model['bigrams'])
+
+    feature_weights = np.asarray(weights[feature_ids], dtype=np.float64)
+    # bincount returns integers for empty input, so cast explicitly
+    scores = np.bincount(doc_ids, weights=feature_weights, minlength=len(texts)).astype(np.float64)
+    known = np.bincount(doc_ids, weights=(feature_weights != 0).astype(np.float64), minlength=len(texts)).astype(np.float64)
+    totals = np.bincount(doc_ids, minlength=len(texts)).astype(np.float64)
+
+    # Texts without any feature seen in training stay neutral instead of getting the class prior
+    polarity = np.where(known > 0, np.tanh((scores + model['bias']) / 2), 0.0)
+    subjectivity = np.divide(known, totals, out=np.zeros_like(known), where=totals > 0)
+    return polarity, subjectivity
+
 def generate_summary_statistics(app_data):
     """
     Generate summary statistics from app data
@@ -244,208 +999,204 @@ def generate_review_sentiment_summary(reviews):
     Generate a summary of review sentiment analysis
 
     Args:
-        reviews (list): List of review dictionaries with sentiment scores
+        reviews (list or SentimentBatch): List of review dictionaries with sentiment scores,
+            or the SentimentBatch they were scored into
 
     Returns:
         dict: Dictionary containing sentiment summary
     """
     try:
-        sentiments = [r.get('sentiment_score', 0) for r in reviews]
-        categories = [categorize_sentiment(score) for score in sentiments]
-
-        summary = {
-            'positive_count': categories.count('positive'),
-            'neutral_count': categories.count('neutral'),
-            'negative_count': categories.count('negative'),
-            'avg_sentiment': sum(sentiments) / len(sentiments) if sentiments else 0
-        }
+        if isinstance(reviews, SentimentBatch):
+            return reviews.summary()
 
-        return summary
+        sentiments = np.fromiter((r.get('sentiment_score', 0) for r in reviews), dtype=np.float64, count=len(reviews))
+        return SentimentBatch(sentiments, np.zeros_like(sentiments)).summary()
     except Exception as e:
         logger.error(f"Error generating review sentiment summary: {str(e)}")
         return {}
 
-# Define common aspects for banking apps
-BANKING_ASPECTS = {
-    'ui': ['ui', 'interface', 'design', 'tampilan', 'layout', 'antarmuka', 'desain', 'tema', 'warna', 'color'],
-    'performance': ['performance', 'speed', 'fast', 'slow', 'lag', 'crash', 'hang', 'kinerja', 'cepat', 'lambat', 'loading', 'berat', 'ringan', 'lancar'],
-    'security': ['security', 'secure', 'keamanan', 'aman', 'password', 'pin', 'otp', 'verification', 'verifikasi', 'biometric', 'fingerprint', 'face'],
-    'features': ['feature', 'fitur', 'function', 'fungsi', 'kemampuan', 'capability', 'tools', 'alat'],
-    'usability': ['usability', 'user-friendly', 'easy', 'difficult', 'mudah', 'sulit', 'simple', 'sederhana', 'kompleks', 'complex', 'intuitive', 'intuitif'],
-    'customer_service': ['customer service', 'support', 'help', 'bantuan', 'layanan', 'service', 'cs', 'call center', 'chat', 'response', 'respon'],
-    'transaction': ['transaction', 'transfer', 'payment', 'pembayaran', 'transaksi', 'bayar', 'kirim', 'terima', 'receive', 'send', 'bill', 'tagihan'],
-    'reliability': ['reliable', 'reliability', 'stable', 'stabil', 'konsisten', 'consistent', 'dependable', 'andal', 'error', 'bug', 'issue', 'masalah', 'problem'],
-    'updates': ['update', 'upgrade', 'version', 'versi', 'pembaruan', 'perbaikan', 'improvement', 'enhancement', 'peningkatan']
-}
+# Aspect dictionary used by the analysis pipeline, see aspect_analysis (config/aspects/<name>.json)
+ASPECT_DICTIONARY = os.environ.get('ASPECT_DICTIONARY', 'banking')
+
+def find_review_aspects(content, aspect_keywords=None):
+    """
+    Find the aspects mentioned in a single review
 
-def extract_aspects(reviews, aspect_keywords=BANKING_ASPECTS):
+    Keywords only match whole words, see aspect_matcher.
+
+    Args:
+        content (str): Review text
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the ASPECT_DICTIONARY dictionary
+
+    Returns:
+        dict: Mapping of each mentioned aspect to the keywords found for it
+    """
+    _, matcher = resolve_aspects(aspect_keywords, ASPECT_DICTIONARY)
+    return matcher.find(content)
+
+def extract_aspects(reviews, aspect_keywords=None):
     """
     Extract aspects from review texts and analyze sentiment for each aspect
 
+    Uses the shared engine in aspect_analysis with the ASPECT_DICTIONARY
+    dictionary, categorising sentiment like categorize_sentiment.
+
     Args:
         reviews (list): List of review dictionaries with content and sentiment scores
-        aspect_keywords (dict): Dictionary mapping aspect categories to keywords
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the ASPECT_DICTIONARY dictionary
 
     Returns:
         dict: Dictionary containing aspect-based sentiment analysis results
     """
-    try:
-        # Initialize results structure
-        aspect_results = {
-            'aspects': {},
-            'review_aspects': []
-        }
-
-        # Initialize counters for each aspect
-        for aspect in aspect_keywords:
-            aspect_results['aspects'][aspect] = {
-                'positive': 0,
-                'neutral': 0,
-                'negative': 0,
-                'total': 0,
-                'avg_sentiment': 0.0,
-                'keywords': []
-            }
+    return _extract_aspects(reviews, aspect_keywords, dictionary=ASPECT_DICTIONARY, threshold=0.1)
 
-        # Process each review
-        for review in reviews:
-            content = review.get('content', '').lower()
-            sentiment_score = review.get('sentiment_score', 0)
-            sentiment_category = categorize_sentiment(sentiment_score)
+def aggregate_review_aspects(reviews, aspect_keywords=None):
+    """
+    Count aspect mentions like extract_aspects, as a mergeable AspectAggregate
 
-            # Skip empty reviews
-            if not content:
-                continue
+    Args:
+        reviews (iterable): Review dictionaries with content and sentiment scores
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the ASPECT_DICTIONARY dictionary
 
-            # Find aspects in the review
-            review_aspects = []
-
-            for aspect, keywords in aspect_keywords.items():
-                # Check if any keyword is in the review
-                found_keywords = [keyword for keyword in keywords if keyword in content]
-
-                if found_keywords:
-                    # Add aspect to review's aspects
-                    review_aspects.append({
-                        'aspect': aspect,
-                        'sentiment': sentiment_category,
-                        'score': sentiment_score,
-                        'keywords': found_keywords
-                    })
-
-                    # Update aspect counters
-                    aspect_results['aspects'][aspect][sentiment_category] += 1
-                    aspect_results['aspects'][aspect]['total'] += 1
-                    aspect_results['aspects'][aspect]['avg_sentiment'] += sentiment_score
-
-                    # Track keywords found
-                    aspect_results['aspects'][aspect]['keywords'].extend(found_keywords)
-
-            # Add aspects to review if any were found
-            if review_aspects:
-                aspect_results['review_aspects'].append({
-                    'review_id': review.get('reviewId', ''),
-                    'aspects': review_aspects
-                })
+    Returns:
+        AspectAggregate: Aspect counters for the reviews
+    """
+    return aggregate_aspects(reviews, aspect_keywords, dictionary=ASPECT_DICTIONARY, threshold=0.1)
 
-        # Calculate average sentiment for each aspect
-        for aspect in aspect_keywords:
-            total = aspect_results['aspects'][aspect]['total']
-            if total > 0:
-                aspect_results['aspects'][aspect]['avg_sentiment'] /= total
+def review_aspect_masks(reviews, aspect_keywords=None):
+    """
+    Tag each review with a bitmask of the ASPECT_DICTIONARY aspects it mentions
 
-            # Count keyword frequencies
-            keyword_counter = Counter(aspect_results['aspects'][aspect]['keywords'])
-            aspect_results['aspects'][aspect]['keywords'] = [
-                {'keyword': k, 'count': c}
-                for k, c in keyword_counter.most_common(5)
-            ]
+    Args:
+        reviews (iterable): Review dictionaries with content
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords
 
-        return aspect_results
-    except Exception as e:
-        logger.error(f"Error in aspect-based sentiment analysis: {str(e)}")
-        return {'aspects': {}, 'review_aspects': []}
+    Returns:
+        tuple: (aspect_names, masks), see aspect_analysis.aspect_masks
+    """
+    return aspect_masks(reviews, aspect_keywords, dictionary=ASPECT_DICTIONARY)
 
-def generate_aspect_summary(aspect_results):
+def aspect_aggregate_version():
     """
-    Generate a summary of aspect-based sentiment analysis
+    Identify what stored aspect aggregates were computed with
 
-    Args:
-        aspect_results (dict): Results from extract_aspects function
+    Combines pipeline_version() with the ASPECT_DICTIONARY name and content
+    hash, so aggregates are recomputed after a sentiment pipeline or
+    dictionary change.
 
     Returns:
-        dict: Dictionary containing aspect summary statistics
+        str: Version string, e.g. 'v1-nltk-textblob-banking.1a2b3c4d'
     """
-    try:
-        summary = {
-            'most_positive_aspect': None,
-            'most_negative_aspect': None,
-            'most_mentioned_aspect': None,
-            'aspect_count': len(aspect_results['aspects']),
-            'aspects_by_sentiment': []
-        }
+    return f"{pipeline_version()}-{ASPECT_DICTIONARY}.{aspect_dictionary_hash(ASPECT_DICTIONARY)[:8]}"
+
+def _iter_batches(items, batch_size):
+    """Yield lists of up to batch_size items from any iterable"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_enriched_reviews(reviews, batch_size=STREAM_BATCH_SIZE, aspect_keywords=None,
+                          details='none'):
+    """
+    Stream reviews through preprocessing, sentiment analysis and aspect tagging
 
-        # Find most positive, negative, and mentioned aspects
-        max_positive_ratio = -1
-        max_negative_ratio = -1
-        max_mentions = -1
+    Reviews are consumed lazily and processed in small batches, so memory use
+    depends on batch_size rather than on the total number of reviews.
 
-        for aspect, data in aspect_results['aspects'].items():
-            total = data['total']
+    Args:
+        reviews (iterable): Review dictionaries, e.g. a generator over stored reviews
+        batch_size (int): Number of reviews processed together
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the ASPECT_DICTIONARY dictionary
+        details (str): Preprocessing detail level to attach, one of 'none', 'counts' or 'full'
+
+    Yields:
+        dict: Copy of each review with processed_text, sentiment_score,
+        sentiment_subjectivity, sentiment_label and aspects added
+    """
+    for batch in _iter_batches(reviews, batch_size):
+        # Resolved per batch so long streams pick up dictionary edits
+        _, matcher = resolve_aspects(aspect_keywords, ASPECT_DICTIONARY)
+        processed_texts, preprocessing_details = preprocess_reviews(batch, details=details)
+        sentiment_batch = analyze_sentiment_batch(sentiment_input_texts(batch, processed_texts))
+        columns = zip(batch, processed_texts, sentiment_batch.polarity.tolist(),
+                      sentiment_batch.subjectivity.tolist(), sentiment_batch.labels())
+
+        for i, (review, processed_text, polarity, subjectivity, label) in enumerate(columns):
+            enriched = dict(review)
+            enriched['processed_text'] = processed_text
+            enriched['sentiment_score'] = polarity
+            enriched['sentiment_subjectivity'] = subjectivity
+            enriched['sentiment_label'] = label
+            enriched['aspects'] = matcher.find(review.get('content') or '')
+            if details != 'none':
+                enriched['preprocessing'] = preprocessing_details[i]
+            yield enriched
+
+# TF-IDF terms are runs of word characters, like TfidfVectorizer's (?u)\b\w+\b token pattern
+_TFIDF_TERM_PATTERN = re.compile(r'(?u)\b\w+\b')
+
+def tfidf_terms(tokens):
+    """
+    Turn a preprocessed token list into TF-IDF terms
 
-            # Skip aspects with no mentions
-            if total == 0:
-                continue
+    Pipeline tokens are used as they are, except ones with non-word
+    characters left over from cleaning (e.g. emoji), which are split into
+    their word parts.
 
-            positive_ratio = data['positive'] / total if total > 0 else 0
-            negative_ratio = data['negative'] / total if total > 0 else 0
-
-            # Check if this is the most positive aspect
-            if positive_ratio > max_positive_ratio:
-                max_positive_ratio = positive_ratio
-                summary['most_positive_aspect'] = aspect
-
-            # Check if this is the most negative aspect
-            if negative_ratio > max_negative_ratio:
-                max_negative_ratio = negative_ratio
-                summary['most_negative_aspect'] = aspect
-
-            # Check if this is the most mentioned aspect
-            if total > max_mentions:
-                max_mentions = total
-                summary['most_mentioned_aspect'] = aspect
-
-            # Add to sorted list
-            summary['aspects_by_sentiment'].append({
-                'aspect': aspect,
-                'sentiment_score': data['avg_sentiment'],
-                'total_mentions': total,
-                'positive_ratio': positive_ratio,
-                'negative_ratio': negative_ratio
-            })
+    Args:
+        tokens (list): Tokens of one preprocessed review
 
-        # Sort aspects by sentiment score (descending)
-        summary['aspects_by_sentiment'].sort(key=lambda x: x['sentiment_score'], reverse=True)
+    Returns:
+        list: Terms of the review
+    """
+    terms = []
+    for token in tokens:
+        if token.isalnum():
+            terms.append(token)
+        else:
+            terms.extend(_TFIDF_TERM_PATTERN.findall(token))
+    return terms
 
-        return summary
-    except Exception as e:
-        logger.error(f"Error generating aspect summary: {str(e)}")
-        return {
-            'most_positive_aspect': None,
-            'most_negative_aspect': None,
-            'most_mentioned_aspect': None,
-            'aspect_count': 0,
-            'aspects_by_sentiment': []
-        }
+def count_original_tokens(reviews, tokenizer=None):
+    """
+    Count each review's tokens before stopword removal and stemming
+
+    Matches preprocess_reviews' original_token_count without stemming anything.
+
+    Args:
+        reviews (list): List of review dictionaries with content
+        tokenizer (str, optional): Name of a TOKENIZERS entry, defaults to PREPROCESS_TOKENIZER
+
+    Returns:
+        list: Token count per review
+    """
+    tokenize = TOKENIZERS[tokenizer or PREPROCESS_TOKENIZER]
+    return [len(tokenize(clean_review_text(review['content']))) if review.get('content') else 0 for review in reviews]
 
-def calculate_tf_idf(reviews, max_features=50, min_df=2):
+def calculate_tf_idf(reviews, max_features=50, min_df=2, tokens=None, preprocessed=None):
     """
     Calculate TF-IDF scores for review texts
 
+    Preprocessing is skipped when the caller already has its output: pass
+    either the token lists or the (processed_texts, preprocessing_details)
+    tuple returned by preprocess_reviews (any detail level). The term matrix
+    is built straight from the token lists.
+
     Args:
         reviews (list): List of review dictionaries with content
         max_features (int): Maximum number of features to extract
         min_df (int): Minimum document frequency for a term to be included
+        tokens (list, optional): Preprocessed token list per review
+        preprocessed (tuple, optional): preprocess_reviews output for the same reviews
 
     Returns:
         dict: Dictionary containing TF-IDF results and calculation details
@@ -466,47 +1217,58 @@ def calculate_tf_idf(reviews, max_features=50, min_df=2):
 
         logger.info(f"Starting TF-IDF analysis on {len(review_texts)} reviews")
 
-        # Preprocess texts
-        processed_texts, preprocessing_details = preprocess_reviews(reviews)
+        # Preprocess texts, unless the caller already did
+        preprocessing_details = []
+        if tokens is None:
+            if preprocessed is None:
+                preprocessed = preprocess_reviews(reviews, details='counts')
+            processed_texts, preprocessing_details = preprocessed
+            tokens = [text.split() if text else [] for text in processed_texts]
+
+        if len(tokens) != len(reviews):
+            raise ValueError(f"Got {len(tokens)} token lists for {len(reviews)} reviews")
 
         # Filter out empty processed texts
         valid_indices = []
-        valid_processed_texts = []
+        valid_tokens = []
         valid_original_texts = []
 
-        for i, text in enumerate(processed_texts):
-            if text and len(text.strip()) > 0:
+        for i, review_tokens in enumerate(tokens):
+            if review_tokens:
                 valid_indices.append(i)
-                valid_processed_texts.append(text)
-                valid_original_texts.append(review_texts[i] if i < len(review_texts) else "")
+                valid_tokens.append(review_tokens)
+                valid_original_texts.append(reviews[i].get('content') or "")
 
-        if not valid_processed_texts:
+        if not valid_tokens:
             logger.warning("No valid processed texts after preprocessing")
             return {
                 'status': 'error',
                 'message': 'All texts were empty after preprocessing'
             }
 
-        logger.info(f"After preprocessing: {len(valid_processed_texts)} valid texts out of {len(processed_texts)} total")
+        logger.info(f"After preprocessing: {len(valid_tokens)} valid texts out of {len(tokens)} total")
 
         # Log some preprocessing statistics
-        total_original_tokens = sum(detail.get('original_token_count', 0) for detail in preprocessing_details)
-        total_processed_tokens = sum(detail.get('processed_token_count', 0) for detail in preprocessing_details)
-        logger.info(f"Preprocessing reduced token count from {total_original_tokens} to {total_processed_tokens} ({total_processed_tokens/total_original_tokens*100:.1f}%)")
+        if preprocessing_details:
+            total_original_tokens = sum(detail.get('original_token_count', 0) for detail in preprocessing_details)
+            total_processed_tokens = sum(detail.get('processed_token_count', 0) for detail in preprocessing_details)
+        else:
+            total_original_tokens = sum(count_original_tokens(reviews))
+            total_processed_tokens = sum(len(review_tokens) for review_tokens in tokens)
+        if total_original_tokens:
+            logger.info(f"Preprocessing reduced token count from {total_original_tokens} to {total_processed_tokens} ({total_processed_tokens/total_original_tokens*100:.1f}%)")
 
         # Initialize TF-IDF vectorizer with appropriate parameters
         tfidf_vectorizer = TfidfVectorizer(
             max_features=max_features,
             min_df=min_df,
-            stop_words=None,  # We've already removed stopwords in preprocessing
-            ngram_range=(1, 1),  # Only use unigrams for simplicity
-            token_pattern=r"(?u)\b\w+\b",  # Simple token pattern to match our preprocessed text
+            analyzer=tfidf_terms,  # Build the vocabulary straight from the token lists
             lowercase=False  # Text is already lowercased in preprocessing
         )
 
         # Calculate TF-IDF
         try:
-            tfidf_matrix = tfidf_vectorizer.fit_transform(valid_processed_texts)
+            tfidf_matrix = tfidf_vectorizer.fit_transform(valid_tokens)
             logger.info(f"TF-IDF matrix shape: {tfidf_matrix.shape}")
         except Exception as e:
             logger.error(f"Error in TF-IDF vectorization: {str(e)}")
@@ -526,8 +1288,12 @@ def calculate_tf_idf(reviews, max_features=50, min_df=2):
                 'message': 'No features could be extracted from the processed texts'
             }
 
+        # Work column-wise on the sparse matrix: column i holds the documents containing term i
+        tfidf_csc = tfidf_matrix.tocsc()
+        tfidf_csc.sort_indices()
+
         # Calculate document frequencies
-        df = np.bincount(tfidf_matrix.nonzero()[1], minlength=len(feature_names))
+        df = np.diff(tfidf_csc.indptr)
 
         # Calculate IDF values
         idf = tfidf_vectorizer.idf_
@@ -535,31 +1301,31 @@ def calculate_tf_idf(reviews, max_features=50, min_df=2):
         # Calculate average TF-IDF score for each term
         tfidf_means = np.asarray(tfidf_matrix.mean(axis=0)).flatten()
 
+        # TF of every term in the example document, which is the same for all terms
+        example_tokens = valid_tokens[0]
+        example_counts = Counter(tfidf_terms(example_tokens))
+
+        def truncate(text):
+            return text[:100] + '...' if len(text) > 100 else text
+
         # Create results dictionary with term details
         term_details = []
         for i, term in enumerate(feature_names):
-            # Calculate term frequency in each document
-            term_indices = np.where(tfidf_matrix.toarray()[:, i] > 0)[0]
-            term_tfidf_values = tfidf_matrix.toarray()[term_indices, i]
-
-            # Get document examples for this term
+            # The first 3 documents containing the term and their scores
+            start = tfidf_csc.indptr[i]
+            end = min(tfidf_csc.indptr[i + 1], start + 3)  # Limit to 3 examples
             doc_examples = []
-            for doc_idx in term_indices[:3]:  # Limit to 3 examples
-                if doc_idx < len(valid_indices):
-                    original_idx = valid_indices[doc_idx]
-                    if original_idx < len(reviews):
-                        doc_examples.append({
-                            'text': valid_original_texts[doc_idx][:100] + '...' if len(valid_original_texts[doc_idx]) > 100 else valid_original_texts[doc_idx],
-                            'processed_text': valid_processed_texts[doc_idx][:100] + '...' if len(valid_processed_texts[doc_idx]) > 100 else valid_processed_texts[doc_idx],
-                            'tfidf_score': float(tfidf_matrix.toarray()[doc_idx, i]),
-                            'review_id': reviews[original_idx].get('reviewId', '') if original_idx < len(reviews) else ''
-                        })
+            for doc_idx, score in zip(tfidf_csc.indices[start:end].tolist(), tfidf_csc.data[start:end].tolist()):
+                original_idx = valid_indices[doc_idx]
+                doc_examples.append({
+                    'text': truncate(valid_original_texts[doc_idx]),
+                    'processed_text': truncate(' '.join(valid_tokens[doc_idx])),
+                    'tfidf_score': score,
+                    'review_id': reviews[original_idx].get('reviewId', '')
+                })
 
             # Calculate TF for example calculation
-            example_text = valid_processed_texts[0] if valid_processed_texts else ""
-            example_tokens = example_text.split()
-            example_term_count = example_text.split().count(term) if example_tokens else 0
-            example_tf = example_term_count / len(example_tokens) if example_tokens else 0
+            example_tf = example_counts[term] / len(example_tokens) if example_tokens else 0
 
             term_details.append({
                 'term': term,
@@ -584,8 +1350,8 @@ def calculate_tf_idf(reviews, max_features=50, min_df=2):
 
         # Calculate corpus statistics
         corpus_stats = {
-            'num_documents': len(valid_processed_texts),
-            'avg_document_length': np.mean([len(text.split()) for text in valid_processed_texts]) if valid_processed_texts else 0,
+            'num_documents': len(valid_tokens),
+            'avg_document_length': np.mean([len(review_tokens) for review_tokens in valid_tokens]),
             'vocabulary_size': len(feature_names),
             'max_idf': float(np.max(idf)) if len(idf) > 0 else 0,
             'min_idf': float(np.min(idf)) if len(idf) > 0 else 0,
@@ -2,24 +2,31 @@ import os
 import logging
 import csv
 import io
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, send_file, Response
-from scraper import get_app_info, get_app_reviews
-from analysis import analyze_sentiment, preprocess_reviews, extract_aspects, generate_aspect_summary
+from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, send_file, Response, stream_with_context
+from scraper import (get_app_info, get_app_reviews, get_scraper_stats, fetch_review_segment, serialize_review_token,
+                     deserialize_review_token, IncompleteSyncError, ScraperError, LOCALES)
+from analysis import preprocess_reviews, generate_aspect_summary, iter_enriched_reviews, DETAIL_LEVELS, SentimentBatch, score_sentiment, pipeline_version, review_content_hash, sentiment_input_texts, aggregate_review_aspects, aspect_aggregate_version, review_aspect_masks, categorize_sentiment
+from aspect_analysis import AspectAggregate
 # Import calculate_tf_idf function
 try:
     from analysis import calculate_tf_idf
 except ImportError:
     # Define a fallback function if the import fails
-    def calculate_tf_idf(reviews, max_features=50, min_df=2):
+    def calculate_tf_idf(reviews, max_features=50, min_df=2, tokens=None, preprocessed=None):
         logger.error("calculate_tf_idf function not available in analysis module")
         return {
             'status': 'error',
             'message': 'TF-IDF analysis functionality not available'
         }
-from models import db, ScrapedApp, ScrapedReview
+from sqlalchemy import distinct, func
+from sqlalchemy.exc import IntegrityError
+from models import db, ScrapedApp, ScrapedReview, ReviewAnalysis, AspectDailyAggregate, ReviewSyncState, ReviewSnapshot
 import pandas as pd
+import numpy as np
 import json
 import datetime
+import hashlib
+import threading
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -72,6 +79,684 @@ DEFAULT_APP_PACKAGES = [
     'com.bnc.finance'  # neobank
 ]
 
+# Approximate number of reviews fetched by a single incremental sync, so one request never pages
+# an app's whole history; the stretches it stops short of are resumed by the next syncs
+SYNC_MAX_NEW_REVIEWS = 1000
+
+# Stored review IDs looked up per query when skipping already stored reviews
+STORED_REVIEW_QUERY_CHUNK = 500
+
+# Content hashes looked up per query in the review analysis cache
+ANALYSIS_CACHE_QUERY_CHUNK = 500
+
+# Default and maximum page size of /fetch_review_aspects
+REVIEW_ASPECTS_PAGE_SIZE = 50
+REVIEW_ASPECTS_MAX_PAGE_SIZE = 300
+
+# Seconds an aspect analysis' tagged reviews stay available to /fetch_review_aspects
+REVIEW_SNAPSHOT_TTL = 6 * 60 * 60
+
+# Stored reviews analysed at a time when rebuilding aspect aggregates
+AGGREGATE_REBUILD_BATCH_SIZE = 2000
+
+def review_datetime(review):
+    """
+    Get a review's 'at' timestamp as a datetime
+
+    Args:
+        review (dict): Review dictionary with 'at' in epoch milliseconds or as a datetime
+
+    Returns:
+        datetime.datetime: Review time, the current time if it is missing or invalid
+    """
+    timestamp_ms = review.get('at')
+    if timestamp_ms is None:
+        logger.warning(f"Review missing 'at' timestamp: {review.get('reviewId', 'unknown')}")
+        return datetime.datetime.now()  # Use current time as fallback
+    if isinstance(timestamp_ms, (int, float)):
+        try:
+            return datetime.datetime.fromtimestamp(timestamp_ms / 1000)
+        except Exception as date_error:
+            logger.warning(f"Error converting timestamp {timestamp_ms}: {str(date_error)}")
+            return datetime.datetime.now()  # Use current time as fallback
+    # If it's already a datetime object, use it as is
+    return timestamp_ms
+
+_app_locks = {}
+_app_locks_guard = threading.Lock()
+
+def app_lock(app_id):
+    """
+    Get the lock serializing review storage and aggregate updates for an app
+
+    Syncs and fetches of the same app then can't interleave within a worker
+    process; across processes the unique (app_id, review_id) constraint keeps
+    reviews from being stored twice.
+
+    Args:
+        app_id (str): App package name
+
+    Returns:
+        threading.RLock: The app's lock
+    """
+    with _app_locks_guard:
+        return _app_locks.setdefault(app_id, threading.RLock())
+
+def _new_review_row(app_id, review):
+    """Build the ScrapedReview row for a review dictionary"""
+    return ScrapedReview(
+        app_id = app_id,
+        review_id = review.get('reviewId') or '',
+        user_name = review.get('userName', 'Anonymous'),
+        rating = review.get('score', 0),
+        text = review.get('content', ''),
+        date = review_datetime(review)  # Convert timestamp to datetime for database storage
+    )
+
+def store_reviews(app_id, reviews):
+    """
+    Save scraped reviews to the database, skipping reviews already stored for the app
+
+    The app's per-day aspect aggregates are updated with the reviews that
+    were actually inserted, whichever path stored them.
+
+    Args:
+        app_id (str): App package name
+        reviews (list): List of review dictionaries
+
+    Returns:
+        list: The review dictionaries that were actually inserted
+    """
+    with app_lock(app_id):
+        # Drop repeats within the batch, then reviews stored by earlier fetches
+        candidates = {}
+        for review in reviews:
+            candidates.setdefault(review.get('reviewId') or '', review)
+
+        review_ids = list(candidates)
+        for start in range(0, len(review_ids), STORED_REVIEW_QUERY_CHUNK):
+            rows = (ScrapedReview.query
+                    .filter(ScrapedReview.app_id == app_id,
+                            ScrapedReview.review_id.in_(review_ids[start:start + STORED_REVIEW_QUERY_CHUNK]))
+                    .with_entities(ScrapedReview.review_id)
+                    .all())
+            for row in rows:
+                candidates.pop(row.review_id, None)
+
+        new_reviews = list(candidates.values())
+        if not new_reviews:
+            return []
+
+        try:
+            db.session.add_all([_new_review_row(app_id, review) for review in new_reviews])
+            db.session.commit()
+            inserted = new_reviews
+        except IntegrityError:
+            # Another process stored some of the same reviews concurrently, insert one at a time
+            db.session.rollback()
+            inserted = []
+            for review in new_reviews:
+                try:
+                    with db.session.begin_nested():
+                        db.session.add(_new_review_row(app_id, review))
+                    inserted.append(review)
+                except IntegrityError:
+                    continue
+            db.session.commit()
+            logger.debug(f"Skipped {len(new_reviews) - len(inserted)} reviews stored concurrently for {app_id}")
+
+        if inserted:
+            try:
+                update_aspect_aggregates(app_id, inserted)
+            except Exception as aggregate_error:
+                # The reviews are stored; the rollup reports the gap until rebuild_aspect_aggregates runs
+                logger.error(f"Error updating aspect aggregates for {app_id}: {str(aggregate_error)}")
+                db.session.rollback()
+        return inserted
+
+def _review_row_to_dict(row, app_id):
+    """
+    Convert a stored ScrapedReview row back to the scraper's review format
+
+    Args:
+        row (ScrapedReview): Stored review row
+        app_id (str): App package name
+
+    Returns:
+        dict: Review dictionary
+    """
+    return {
+        'reviewId': row.review_id,
+        'userName': row.user_name,
+        'score': row.rating,
+        'content': row.text,
+        'at': row.date,
+        'sortOrder': 'newest',
+        'appId': app_id
+    }
+
+def load_stored_reviews(app_id, count):
+    """
+    Load the newest stored reviews for an app in the scraper's review format
+
+    Args:
+        app_id (str): App package name
+        count (int): Maximum number of reviews to load
+
+    Returns:
+        list: List of review dictionaries, newest first
+    """
+    rows = (ScrapedReview.query
+            .filter_by(app_id=app_id)
+            .order_by(ScrapedReview.date.desc())
+            .limit(count)
+            .all())
+
+    return [_review_row_to_dict(row, app_id) for row in rows]
+
+def iter_stored_reviews(app_id, batch_size=500):
+    """
+    Iterate over all stored reviews for an app without loading them at once
+
+    Args:
+        app_id (str): App package name
+        batch_size (int): Number of rows fetched from the database at a time
+
+    Yields:
+        dict: Review dictionaries in the scraper's review format, newest first
+    """
+    rows = (ScrapedReview.query
+            .filter_by(app_id=app_id)
+            .order_by(ScrapedReview.date.desc())
+            .yield_per(batch_size))
+
+    for row in rows:
+        yield _review_row_to_dict(row, app_id)
+
+def iter_stored_review_batches(app_id, batch_size=AGGREGATE_REBUILD_BATCH_SIZE):
+    """
+    Iterate over all stored reviews for an app in batches
+
+    Uses keyset pagination on the row id rather than an open cursor, so the
+    caller can query and commit between batches.
+
+    Args:
+        app_id (str): App package name
+        batch_size (int): Number of reviews per batch
+
+    Yields:
+        list: Review dictionaries in the scraper's review format, oldest rows first
+    """
+    last_id = 0
+    while True:
+        rows = (ScrapedReview.query
+                .filter(ScrapedReview.app_id == app_id, ScrapedReview.id > last_id)
+                .order_by(ScrapedReview.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield [_review_row_to_dict(row, app_id) for row in rows]
+
+def review_list_snapshot(reviews):
+    """
+    Fingerprint the order and identity of a list of reviews
+
+    An aspect analysis saves its tagged reviews under this ID (see
+    store_review_snapshot), so /fetch_review_aspects pages through exactly
+    the reviews that were analysed, even after the Play Store response
+    cache has moved on to other reviews.
+
+    Args:
+        reviews (list): Review dictionaries
+
+    Returns:
+        str: Hex digest identifying the list
+    """
+    digest = hashlib.sha1()
+    for review in reviews:
+        digest.update(str(review.get('reviewId', '')).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()[:16]
+
+def store_review_snapshot(app_id, reviews, sentiment_batch):
+    """
+    Save the aspect-tagged reviews of an analysis for /fetch_review_aspects to page through
+
+    Pages are served from this snapshot rather than by fetching and tagging
+    the reviews again, so they always belong to the analysis that was shown,
+    whether or not the Play Store response cache still holds its reviews.
+    Snapshots older than REVIEW_SNAPSHOT_TTL are removed.
+
+    Args:
+        app_id (str): App package name
+        reviews (list): The analysed review dictionaries
+        sentiment_batch (SentimentBatch): Their sentiment scores
+
+    Returns:
+        str: The snapshot ID, review_list_snapshot(reviews)
+    """
+    snapshot_id = review_list_snapshot(reviews)
+    aspect_names, masks = review_aspect_masks(reviews)
+    tagged = []
+    for review, mask, polarity, label in zip(reviews, masks, sentiment_batch.polarity.tolist(), sentiment_batch.labels()):
+        if mask:
+            tagged.append({
+                'reviewId': review.get('reviewId', ''),
+                'userName': review.get('userName'),
+                'score': review.get('score'),
+                'content': review.get('content'),
+                'at': review_datetime(review).isoformat(),
+                'sentiment_score': polarity,
+                'sentiment_label': label,
+                'aspects': mask
+            })
+
+    expired = datetime.datetime.utcnow() - datetime.timedelta(seconds=REVIEW_SNAPSHOT_TTL)
+    try:
+        ReviewSnapshot.query.filter(ReviewSnapshot.created_at < expired).delete(synchronize_session=False)
+        db.session.merge(ReviewSnapshot(
+            snapshot_id=snapshot_id,
+            app_id=app_id,
+            aspect_names=json.dumps(aspect_names),
+            reviews=json.dumps(tagged),
+            created_at=datetime.datetime.utcnow()
+        ))
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent analysis of the same reviews stored the snapshot first
+        db.session.rollback()
+    return snapshot_id
+
+def load_review_snapshot(app_id, snapshot_id):
+    """
+    Load the aspect-tagged reviews saved by store_review_snapshot
+
+    Args:
+        app_id (str): App package name
+        snapshot_id (str): Snapshot ID returned with the analysis
+
+    Returns:
+        tuple: (aspect_names, tagged review dictionaries), or None if the snapshot is unknown or expired
+    """
+    row = ReviewSnapshot.query.get((snapshot_id, app_id))
+    expired = datetime.datetime.utcnow() - datetime.timedelta(seconds=REVIEW_SNAPSHOT_TTL)
+    if row is None or row.created_at < expired:
+        return None
+
+    tagged = json.loads(row.reviews)
+    for review in tagged:
+        review['at'] = datetime.datetime.fromisoformat(review['at'])
+    return json.loads(row.aspect_names), tagged
+
+def analyze_reviews_cached(reviews, details='none'):
+    """
+    Preprocess and score reviews, reusing stored results for already analysed content
+
+    Results are cached in ReviewAnalysis by content hash and pipeline version,
+    so only reviews with new content go through preprocessing and sentiment
+    analysis. Preprocessing details aren't cached: when details are requested
+    every review is preprocessed, but sentiment is still only computed for new
+    content.
+
+    Args:
+        reviews (list): List of review dictionaries
+        details (str): Preprocessing detail level, one of 'none', 'counts' or 'full'
+
+    Returns:
+        tuple: (processed_texts, preprocessing_details, sentiment_batch) in review order, where
+        sentiment_batch is a SentimentBatch carrying the reviews' ratings and timestamps
+    """
+    version = pipeline_version()
+    hashes = [review_content_hash(review.get('content')) for review in reviews]
+
+    cached = {}
+    try:
+        distinct_hashes = list(set(hashes))
+        for start in range(0, len(distinct_hashes), ANALYSIS_CACHE_QUERY_CHUNK):
+            rows = ReviewAnalysis.query.filter(
+                ReviewAnalysis.pipeline_version == version,
+                ReviewAnalysis.content_hash.in_(distinct_hashes[start:start + ANALYSIS_CACHE_QUERY_CHUNK])
+            ).all()
+            for row in rows:
+                cached[row.content_hash] = (row.processed_text, row.polarity, row.subjectivity)
+    except Exception as db_error:
+        logger.warning(f"Error reading cached review analysis: {str(db_error)}")
+        db.session.rollback()
+
+    if details == 'none':
+        # Only preprocess each new piece of content once
+        missing = {}
+        for review, content_hash in zip(reviews, hashes):
+            if content_hash not in cached and content_hash not in missing:
+                missing[content_hash] = review
+        to_preprocess, preprocessed_hashes = list(missing.values()), list(missing)
+    else:
+        to_preprocess, preprocessed_hashes = reviews, hashes
+
+    processed, preprocessing_details = preprocess_reviews(to_preprocess, details=details)
+    texts_by_hash = dict(zip(preprocessed_hashes, processed))
+
+    reviews_by_hash = dict(zip(hashes, reviews))
+    new_hashes = [content_hash for content_hash in reviews_by_hash if content_hash not in cached]
+    new_polarity, new_subjectivity = score_sentiment(sentiment_input_texts(
+        [reviews_by_hash[content_hash] for content_hash in new_hashes],
+        [texts_by_hash[content_hash] for content_hash in new_hashes]
+    ))
+
+    results = dict(cached)
+    new_rows = []
+    for content_hash, polarity, subjectivity in zip(new_hashes, new_polarity.tolist(), new_subjectivity.tolist()):
+        results[content_hash] = (texts_by_hash[content_hash], polarity, subjectivity)
+        new_rows.append({
+            'content_hash': content_hash,
+            'pipeline_version': version,
+            'processed_text': texts_by_hash[content_hash],
+            'polarity': polarity,
+            'subjectivity': subjectivity
+        })
+
+    if new_rows:
+        try:
+            db.session.bulk_insert_mappings(ReviewAnalysis, new_rows)
+            db.session.commit()
+        except Exception as db_error:
+            # Another request may have cached the same content concurrently
+            logger.warning(f"Error caching review analysis: {str(db_error)}")
+            db.session.rollback()
+
+    logger.debug(f"Review analysis cache: {len(reviews) - len(new_hashes)} reused, {len(new_hashes)} computed")
+
+    rows = [results[content_hash] for content_hash in hashes]
+    processed_texts = [row[0] for row in rows]
+    sentiment_batch = SentimentBatch.from_reviews(
+        reviews,
+        np.fromiter((row[1] or 0.0 for row in rows), dtype=np.float64, count=len(rows)),
+        np.fromiter((row[2] or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+    )
+    return processed_texts, preprocessing_details, sentiment_batch
+
+def sync_app_reviews(app_id, max_reviews=SYNC_MAX_NEW_REVIEWS):
+    """
+    Fetch and store only the reviews posted since the last sync
+
+    The sync keeps its own watermark per app (ReviewSyncState), so reviews
+    stored by other fetches (most relevant or per-score samples) never make
+    it skip newer reviews. Each call fetches at most about `max_reviews`
+    reviews: the newest ones first, then older stretches that earlier calls
+    stopped short of (the whole history behind the first sync included),
+    resumed from their continuation tokens. Repeated calls therefore fill the
+    history without ever leaving a gap behind the watermark.
+
+    Holds the app's lock throughout, so concurrent syncs of the same app
+    don't read the same watermark and store the same reviews twice.
+
+    Args:
+        app_id (str): App package name
+        max_reviews (int, optional): Approximate number of reviews fetched per call (None for no limit)
+
+    Returns:
+        list: The newly stored review dictionaries
+
+    Raises:
+        IncompleteSyncError: If the review stream ended before reaching the watermark (nothing is stored)
+    """
+    with app_lock(app_id):
+        return _sync_app_reviews(app_id, max_reviews)
+
+def _segment_watermark(reviews):
+    """Date of the newest review in a newest-first list and the IDs of the reviews posted then"""
+    newest = review_datetime(reviews[0])
+    return newest, [r.get('reviewId') for r in reviews if review_datetime(r) == newest]
+
+def _sync_app_reviews(app_id, max_reviews):
+    """Body of sync_app_reviews, called with the app's lock held"""
+    state = ReviewSyncState.query.get(app_id) or ReviewSyncState(app_id=app_id)
+    backfill = json.loads(state.backfill) if state.backfill else []
+    # The watermark belongs to one locale's review stream, so once set the sync never switches;
+    # before that a locale is only skipped if it fails, not if it has no reviews
+    locales = [(state.lang, state.country)] if state.lang else LOCALES
+
+    # Step 1: Reviews posted since the watermark (the newest ones on the first sync); a stream that
+    # ends before the watermark raises, so nothing is stored past a gap
+    for attempt, (lang, country) in enumerate(locales):
+        try:
+            new_reviews, resume_token = fetch_review_segment(
+                app_id, lang, country,
+                since=state.watermark,
+                known_review_ids=set(json.loads(state.watermark_review_ids or '[]')),
+                max_reviews=max_reviews
+            )
+            break
+        except IncompleteSyncError:
+            raise
+        except ScraperError as e:
+            if attempt == len(locales) - 1:
+                raise
+            logger.warning(f"Sync of {app_id} failed with lang={lang}: {str(e)}")
+
+    stored = store_reviews(app_id, new_reviews) if new_reviews else []
+    if new_reviews:
+        state.lang, state.country = lang, country
+        if resume_token is not None:
+            # Reviews between this page and the old watermark are fetched by later syncs
+            backfill.insert(0, {
+                'token': serialize_review_token(resume_token),
+                'since': state.watermark.isoformat() if state.watermark else None,
+                'review_ids': json.loads(state.watermark_review_ids or '[]')
+            })
+        watermark, watermark_review_ids = _segment_watermark(new_reviews)
+        state.watermark = watermark
+        state.watermark_review_ids = json.dumps(watermark_review_ids)
+    state.backfill = json.dumps(backfill)
+    db.session.add(state)
+    db.session.commit()
+
+    # Step 2: Older stretches earlier syncs stopped short of, with what is left of the limit
+    remaining = None if max_reviews is None else max_reviews - len(new_reviews)
+    while backfill and (remaining is None or remaining > 0):
+        stretch = backfill[0]
+        try:
+            older_reviews, resume_token = fetch_review_segment(
+                app_id, lang, country,
+                since=datetime.datetime.fromisoformat(stretch['since']) if stretch['since'] else None,
+                known_review_ids=set(stretch['review_ids']),
+                max_reviews=remaining,
+                resume_token=deserialize_review_token(stretch['token'])
+            )
+        except ScraperError as e:
+            # The stretch keeps its token, the next sync retries it
+            logger.warning(f"Backfill of older reviews for {app_id} failed: {str(e)}")
+            break
+
+        if older_reviews:
+            stored += store_reviews(app_id, older_reviews)
+        if resume_token is None:
+            backfill.pop(0)
+        else:
+            stretch['token'] = serialize_review_token(resume_token)
+        state.backfill = json.dumps(backfill)
+        db.session.commit()
+        if remaining is not None:
+            remaining -= len(older_reviews)
+
+    logger.info(f"Incremental sync stored {len(stored)} new reviews for {app_id}, "
+                f"{len(backfill)} older stretches left to backfill")
+    return stored
+
+def sync_backfill_pending(app_id):
+    """
+    Check whether older reviews are still waiting to be fetched by later syncs
+
+    Args:
+        app_id (str): App package name
+
+    Returns:
+        bool: True if a sync stopped short of the previous watermark or the end of the history
+    """
+    state = ReviewSyncState.query.get(app_id)
+    return bool(state and state.backfill and json.loads(state.backfill))
+
+def aggregate_reviews_by_day(reviews):
+    """
+    Score reviews and count their aspect mentions per review day
+
+    Args:
+        reviews (list): Review dictionaries of a single app
+
+    Returns:
+        dict: datetime.date -> (AspectAggregate, number of reviews of the day, empty ones included)
+    """
+    _, _, sentiment_batch = analyze_reviews_cached(reviews)
+    reviews_by_day = {}
+    for review, polarity in zip(reviews, sentiment_batch.polarity.tolist()):
+        day = review_datetime(review).date()
+        reviews_by_day.setdefault(day, []).append({'content': review.get('content'), 'sentiment_score': polarity})
+    return {day: (aggregate_review_aspects(day_reviews), len(day_reviews)) for day, day_reviews in reviews_by_day.items()}
+
+def _merge_daily_aggregates(app_id, version, daily):
+    """Merge per-day aggregates into the app's stored rows, without committing"""
+    for day, (aggregate, source_count) in daily.items():
+        row = (AspectDailyAggregate.query
+               .filter_by(app_id=app_id, day=day, version=version)
+               .with_for_update()
+               .first())
+        if row is None:
+            row = AspectDailyAggregate(app_id=app_id, day=day, version=version, source_count=0)
+            db.session.add(row)
+        else:
+            aggregate = AspectAggregate.from_dict(json.loads(row.data)).update(aggregate)
+        row.review_count = aggregate.review_count
+        row.source_count = (row.source_count or 0) + source_count
+        row.data = json.dumps(aggregate.to_dict())
+
+def update_aspect_aggregates(app_id, reviews):
+    """
+    Merge newly stored reviews into the app's per-day aspect aggregates
+
+    Runs under the app's lock, so concurrent writers in a process don't lose
+    each other's increments; a day row created concurrently by another
+    process is merged into on a second attempt.
+
+    Args:
+        app_id (str): App package name
+        reviews (list): Review dictionaries that were just stored, each stored once
+
+    Returns:
+        int: Number of day rows written
+    """
+    version = aspect_aggregate_version()
+    daily = aggregate_reviews_by_day(reviews)
+    with app_lock(app_id):
+        for attempt in range(2):
+            try:
+                _merge_daily_aggregates(app_id, version, daily)
+                db.session.commit()
+                break
+            except IntegrityError:
+                db.session.rollback()
+                if attempt:
+                    raise
+    logger.debug(f"Merged {len(reviews)} reviews into {len(daily)} aspect aggregate days for {app_id}")
+    return len(daily)
+
+def rebuild_aspect_aggregates(app_id):
+    """
+    Recompute an app's per-day aspect aggregates from all of its stored reviews
+
+    Needed once for reviews stored before aggregates existed, and after the
+    sentiment pipeline or aspect dictionary changes. Rows of older versions
+    are dropped. Reviews stored more than once (before review IDs were
+    unique per app) are counted once.
+
+    Args:
+        app_id (str): App package name
+
+    Returns:
+        int: Number of day rows written
+    """
+    version = aspect_aggregate_version()
+    with app_lock(app_id):
+        daily = {}
+        seen_review_ids = set()
+        for batch in iter_stored_review_batches(app_id):
+            unique_batch = []
+            for review in batch:
+                if review['reviewId'] not in seen_review_ids:
+                    seen_review_ids.add(review['reviewId'])
+                    unique_batch.append(review)
+            if not unique_batch:
+                continue
+            for day, (aggregate, source_count) in aggregate_reviews_by_day(unique_batch).items():
+                if day in daily:
+                    daily[day][0].update(aggregate)
+                    daily[day][1] += source_count
+                else:
+                    daily[day] = [aggregate, source_count]
+
+        AspectDailyAggregate.query.filter_by(app_id=app_id).delete()
+        db.session.add_all([
+            AspectDailyAggregate(app_id=app_id, day=day, version=version, review_count=aggregate.review_count,
+                                 source_count=source_count, data=json.dumps(aggregate.to_dict()))
+            for day, (aggregate, source_count) in daily.items()
+        ])
+        db.session.commit()
+    logger.info(f"Rebuilt {len(daily)} days of aspect aggregates for {app_id}")
+    return len(daily)
+
+def load_aspect_rollup(app_id, start=None, end=None):
+    """
+    Merge an app's stored per-day aspect aggregates
+
+    The rollup is only complete when every aggregate row in the range has
+    the current version and the rows account for every review stored in
+    the range. Otherwise (after a pipeline or dictionary change, for reviews
+    stored before aggregates existed, or after a failed aggregate update)
+    the aggregates need rebuild_aspect_aggregates. Reviews being stored
+    concurrently can make a rollup briefly incomplete.
+
+    Args:
+        app_id (str): App package name
+        start (datetime.date, optional): First day to include
+        end (datetime.date, optional): Last day to include
+
+    Returns:
+        tuple: (AspectAggregate, number of days merged, coverage) where coverage is a dict with
+        'complete', 'version', 'versions' (aggregate day rows per version), 'aggregated_review_count'
+        and 'stored_review_count'
+    """
+    version = aspect_aggregate_version()
+    aggregates = AspectDailyAggregate.query.filter_by(app_id=app_id)
+    stored = ScrapedReview.query.filter_by(app_id=app_id)
+    if start is not None:
+        aggregates = aggregates.filter(AspectDailyAggregate.day >= start)
+        stored = stored.filter(ScrapedReview.date >= datetime.datetime.combine(start, datetime.time.min))
+    if end is not None:
+        aggregates = aggregates.filter(AspectDailyAggregate.day <= end)
+        stored = stored.filter(ScrapedReview.date < datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min))
+
+    versions = dict(aggregates
+                    .with_entities(AspectDailyAggregate.version, func.count())
+                    .group_by(AspectDailyAggregate.version)
+                    .all())
+    rows = (aggregates
+            .filter(AspectDailyAggregate.version == version)
+            .with_entities(AspectDailyAggregate.data, AspectDailyAggregate.source_count)
+            .all())
+    stored_review_count = stored.with_entities(func.count(distinct(ScrapedReview.review_id))).scalar()
+
+    aggregated_review_count = sum(row.source_count or 0 for row in rows)
+    coverage = {
+        'complete': set(versions) <= {version} and aggregated_review_count == stored_review_count,
+        'version': version,
+        'versions': versions,
+        'aggregated_review_count': aggregated_review_count,
+        'stored_review_count': stored_review_count
+    }
+    aggregate = AspectAggregate.merge_all(AspectAggregate.from_dict(json.loads(row.data)) for row in rows)
+    return aggregate, len(rows), coverage
+
 @app.route('/')
 def index():
     """Homepage showing the list of banking apps to analyze"""
@@ -270,13 +955,29 @@ def fetch_app_reviews():
 
         count = min(int(request.json.get('count', 50)), 200)  # Limit max reviews
         sort = request.json.get('sort', 'most_relevant')
+        incremental = bool(request.json.get('incremental', False))
+        # Preprocessing detail level sent to the browser; only the reviews page renders the details
+        # (and asks for 'full'), so other clients get the cached fast path by default
+        details = request.json.get('details', 'none')
+        if details not in DETAIL_LEVELS:
+            return jsonify({
+                'status': 'error',
+                'message': f"details must be one of {', '.join(DETAIL_LEVELS)}"
+            }), 400
 
-        logger.debug(f"Fetching reviews for app: {app_id}, count: {count}, sort: {sort}")
+        logger.debug(f"Fetching reviews for app: {app_id}, count: {count}, sort: {sort}, incremental: {incremental}")
 
         # Step 1: Fetch reviews - with detailed error handling
         try:
-            reviews = get_app_reviews(app_id, count=count, sort=sort)
-            logger.debug(f"Fetched {len(reviews)} reviews")
+            if incremental:
+                # Only fetch reviews newer than the ones already stored, then serve from the database
+                with app.app_context():
+                    new_reviews = sync_app_reviews(app_id)
+                    reviews = load_stored_reviews(app_id, count)
+                logger.debug(f"Synced {len(new_reviews)} new reviews, serving {len(reviews)} stored reviews")
+            else:
+                reviews = get_app_reviews(app_id, count=count, sort=sort)
+                logger.debug(f"Fetched {len(reviews)} reviews")
 
             if not reviews:
                 logger.warning(f"No reviews found for app: {app_id}")
@@ -293,51 +994,20 @@ def fetch_app_reviews():
             }), 500
 
         # Step 2: Save reviews to database - with detailed error handling
-        try:
-            with app.app_context():
-                for review in reviews:
-                    # Convert timestamp to datetime for database storage
-                    timestamp_ms = review.get('at')
-                    if timestamp_ms is None:
-                        logger.warning(f"Review missing 'at' timestamp: {review.get('reviewId', 'unknown')}")
-                        date_obj = datetime.datetime.now()  # Use current time as fallback
-                    elif isinstance(timestamp_ms, (int, float)):
-                        try:
-                            date_obj = datetime.datetime.fromtimestamp(timestamp_ms / 1000)
-                        except Exception as date_error:
-                            logger.warning(f"Error converting timestamp {timestamp_ms}: {str(date_error)}")
-                            date_obj = datetime.datetime.now()  # Use current time as fallback
-                    else:
-                        # If it's already a datetime object, use it as is
-                        date_obj = timestamp_ms
-
-                    try:
-                        new_review = ScrapedReview(
-                            app_id = app_id,
-                            review_id = review.get('reviewId', ''),
-                            user_name = review.get('userName', 'Anonymous'),
-                            rating = review.get('score', 0),
-                            text = review.get('content', ''),
-                            date = date_obj
-                        )
-                        db.session.add(new_review)
-                    except Exception as db_error:
-                        logger.error(f"Error adding review to database: {str(db_error)}")
-                        # Continue with next review instead of failing completely
-                        continue
-
-                db.session.commit()
-                logger.debug("Reviews saved to database")
-        except Exception as db_error:
-            logger.error(f"Database error: {str(db_error)}")
-            # Continue processing even if database save fails
+        # (incremental syncs have already stored the new reviews)
+        if not incremental:
+            try:
+                with app.app_context():
+                    store_reviews(app_id, reviews)
+                    logger.debug("Reviews saved to database")
+            except Exception as db_error:
+                logger.error(f"Database error: {str(db_error)}")
+                # Continue processing even if database save fails
 
         # Step 3: Process reviews with sentiment analysis - with detailed error handling
         try:
-            processed_texts, preprocessing_details = preprocess_reviews(reviews)
-            logger.debug("Preprocessing completed")
-            sentiment_results = analyze_sentiment(processed_texts)
-            logger.debug("Sentiment analysis completed")
+            processed_texts, preprocessing_details, sentiment_batch = analyze_reviews_cached(reviews, details=details)
+            logger.debug("Preprocessing and sentiment analysis completed")
         except Exception as analysis_error:
             logger.error(f"Error in text processing or sentiment analysis: {str(analysis_error)}")
             return jsonify({
@@ -347,16 +1017,14 @@ def fetch_app_reviews():
 
         # Step 4: Combine reviews with sentiment scores and preprocessing details
         try:
-            for i, review in enumerate(reviews):
-                if i < len(sentiment_results):
-                    review['sentiment_score'] = sentiment_results[i].polarity
-                    review['sentiment_label'] = 'positive' if sentiment_results[i].polarity > 0 else ('negative' if sentiment_results[i].polarity < 0 else 'neutral')
-                else:
-                    # Handle case where sentiment_results is shorter than reviews
-                    review['sentiment_score'] = 0.0
-                    review['sentiment_label'] = 'neutral'
-
-                if i < len(preprocessing_details):
+            sentiment_columns = zip(sentiment_batch.polarity.tolist(), sentiment_batch.labels())
+            for i, (review, (polarity, label)) in enumerate(zip(reviews, sentiment_columns)):
+                review['sentiment_score'] = polarity
+                review['sentiment_label'] = label
+
+                if details == 'none':
+                    review['processed_text'] = processed_texts[i] if i < len(processed_texts) else ''
+                elif i < len(preprocessing_details):
                     review['preprocessing'] = preprocessing_details[i]
                     review['processed_text'] = processed_texts[i]
                 else:
@@ -380,11 +1048,7 @@ def fetch_app_reviews():
         # Step 5: Calculate metrics - with detailed error handling
         try:
             # Calculate sentiment metrics
-            sentiment_counts = {
-                'positive': sum(1 for r in reviews if r.get('sentiment_label') == 'positive'),
-                'neutral': sum(1 for r in reviews if r.get('sentiment_label') == 'neutral'),
-                'negative': sum(1 for r in reviews if r.get('sentiment_label') == 'negative')
-            }
+            sentiment_counts = sentiment_batch.counts()
 
             # Calculate preprocessing metrics
             total_token_count = sum(detail.get('original_token_count', 0) for detail in preprocessing_details)
@@ -409,6 +1073,9 @@ def fetch_app_reviews():
             top_stopwords = [{"word": word, "count": count} for word, count in stopword_counts.most_common(10)]
 
             preprocessing_metrics['top_stopwords'] = top_stopwords
+            if details == 'none':
+                # No details were computed, so there are no token counts to report
+                preprocessing_metrics = None
             logger.debug("Metrics calculated successfully")
         except Exception as metrics_error:
             logger.error(f"Error calculating metrics: {str(metrics_error)}")
@@ -437,6 +1104,139 @@ def fetch_app_reviews():
             'message': f"Failed to fetch app reviews: {str(e)}"
         }), 500
 
+@app.route('/sync_app_reviews', methods=['POST'])
+def sync_app_reviews_endpoint():
+    """API endpoint to store only the reviews posted since the last sync"""
+    try:
+        app_id = request.json.get('app_id')
+        if not app_id:
+            logger.error("App ID is required but not provided")
+            return jsonify({
+                'status': 'error',
+                'message': 'App ID is required'
+            }), 400
+
+        max_reviews = request.json.get('max_reviews', SYNC_MAX_NEW_REVIEWS)
+        max_reviews = int(max_reviews) if max_reviews is not None else None
+
+        with app.app_context():
+            try:
+                new_reviews = sync_app_reviews(app_id, max_reviews=max_reviews)
+            except IncompleteSyncError as e:
+                # Nothing was stored, so the watermark hasn't moved past the unfetched reviews
+                return jsonify({
+                    'status': 'error',
+                    'message': str(e)
+                }), 502
+            total_reviews = ScrapedReview.query.filter_by(app_id=app_id).count()
+            backfill_pending = sync_backfill_pending(app_id)
+
+        return jsonify({
+            'status': 'success',
+            'new_review_count': len(new_reviews),
+            'total_review_count': total_reviews,
+            'backfill_pending': backfill_pending
+        })
+    except Exception as e:
+        logger.error(f"Error syncing app reviews: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f"Failed to sync app reviews: {str(e)}"
+        }), 500
+
+@app.route('/scraper_stats')
+def scraper_stats():
+    """API endpoint exposing Play Store response cache statistics"""
+    return jsonify({
+        'status': 'success',
+        'stats': get_scraper_stats()
+    })
+
+@app.route('/stream_enriched_reviews/<app_id>')
+def stream_enriched_reviews(app_id):
+    """Stream all stored reviews for an app with sentiment and aspects as NDJSON"""
+    details = request.args.get('details', 'none')
+    if details not in DETAIL_LEVELS:
+        return jsonify({
+            'status': 'error',
+            'message': f"details must be one of {', '.join(DETAIL_LEVELS)}"
+        }), 400
+
+    def generate():
+        reviews = iter_stored_reviews(app_id)
+        for review in iter_enriched_reviews(reviews, details=details):
+            yield json.dumps(review, default=str) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/aspect_rollup/<app_id>')
+def aspect_rollup(app_id):
+    """API endpoint merging stored per-day aspect aggregates over an optional date range"""
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        try:
+            start = datetime.date.fromisoformat(start) if start else None
+            end = datetime.date.fromisoformat(end) if end else None
+        except ValueError:
+            return jsonify({
+                'status': 'error',
+                'message': 'start and end must be dates in YYYY-MM-DD format'
+            }), 400
+
+        aggregate, day_count, coverage = load_aspect_rollup(app_id, start, end)
+        if not coverage['complete']:
+            # A partial rollup would look like a complete one, so report what needs rebuilding instead
+            return jsonify({
+                'status': 'error',
+                'message': f"Aspect aggregates for {app_id} are stale or incomplete, "
+                           f"rebuild them with POST /rebuild_aspect_aggregates",
+                'stale': True,
+                **coverage
+            }), 409
+
+        aspects = aggregate.finalize()
+        return jsonify({
+            'status': 'success',
+            'app_id': app_id,
+            'version': coverage['version'],
+            'day_count': day_count,
+            'review_count': aggregate.review_count,
+            'aspects': aspects,
+            'aspect_summary': generate_aspect_summary({'aspects': aspects})
+        })
+    except Exception as e:
+        logger.error(f"Error loading aspect rollup: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f"Failed to load aspect rollup: {str(e)}"
+        }), 500
+
+@app.route('/rebuild_aspect_aggregates', methods=['POST'])
+def rebuild_aspect_aggregates_endpoint():
+    """API endpoint recomputing an app's per-day aspect aggregates from its stored reviews"""
+    try:
+        app_id = request.json.get('app_id')
+        if not app_id:
+            logger.error("App ID is required but not provided")
+            return jsonify({
+                'status': 'error',
+                'message': 'App ID is required'
+            }), 400
+
+        day_count = rebuild_aspect_aggregates(app_id)
+        return jsonify({
+            'status': 'success',
+            'day_count': day_count
+        })
+    except Exception as e:
+        logger.error(f"Error rebuilding aspect aggregates: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': f"Failed to rebuild aspect aggregates: {str(e)}"
+        }), 500
+
 @app.route('/about')
 def about():
     """About page with information about the project"""
@@ -559,10 +1359,8 @@ def fetch_app_reviews_for_data_analysis():
 
         # Step 2: Process reviews with sentiment analysis
         try:
-            processed_texts, preprocessing_details = preprocess_reviews(reviews)
-            logger.debug("Preprocessing completed for data analysis")
-            sentiment_results = analyze_sentiment(processed_texts)
-            logger.debug("Sentiment analysis completed for data analysis")
+            processed_texts, _, sentiment_batch = analyze_reviews_cached(reviews)
+            logger.debug("Preprocessing and sentiment analysis completed for data analysis")
         except Exception as analysis_error:
             logger.error(f"Error in text processing or sentiment analysis for data analysis: {str(analysis_error)}")
             return jsonify({
@@ -572,14 +1370,9 @@ def fetch_app_reviews_for_data_analysis():
 
         # Step 3: Combine reviews with sentiment scores
         try:
-            for i, review in enumerate(reviews):
-                if i < len(sentiment_results):
-                    review['sentiment_score'] = sentiment_results[i].polarity
-                    review['sentiment_label'] = 'positive' if sentiment_results[i].polarity > 0 else ('negative' if sentiment_results[i].polarity < 0 else 'neutral')
-                else:
-                    # Handle case where sentiment_results is shorter than reviews
-                    review['sentiment_score'] = 0.0
-                    review['sentiment_label'] = 'neutral'
+            for review, polarity, label in zip(reviews, sentiment_batch.polarity.tolist(), sentiment_batch.labels()):
+                review['sentiment_score'] = polarity
+                review['sentiment_label'] = label
 
             logger.debug("Reviews combined with sentiment scores for data analysis")
         except Exception as combine_error:
@@ -590,27 +1383,12 @@ def fetch_app_reviews_for_data_analysis():
             }), 500
 
         # Step 4: Calculate rating distribution
-        rating_distribution = {
-            '5': 0,
-            '4': 0,
-            '3': 0,
-            '2': 0,
-            '1': 0
-        }
-
-        for review in reviews:
-            score = str(int(review.get('score', 0)))
-            if score in rating_distribution:
-                rating_distribution[score] += 1
+        rating_distribution = sentiment_batch.rating_distribution()
 
         # Step 5: Calculate sentiment metrics and average rating
-        sentiment_counts = {
-            'positive': sum(1 for r in reviews if r.get('sentiment_label') == 'positive'),
-            'neutral': sum(1 for r in reviews if r.get('sentiment_label') == 'neutral'),
-            'negative': sum(1 for r in reviews if r.get('sentiment_label') == 'negative')
-        }
+        sentiment_counts = sentiment_batch.counts()
 
-        avg_rating = sum(r.get('score', 0) for r in reviews) / len(reviews) if reviews else 0
+        avg_rating = sentiment_batch.average_rating()
 
         # Step 6: Return the response
         logger.debug("Returning successful data analysis response")
@@ -835,10 +1613,12 @@ def fetch_tfidf_analysis():
                 'message': 'No reviews found or error fetching reviews'
             }), 404
 
-        # Step 2: Perform TF-IDF analysis
+        # Step 2: Perform TF-IDF analysis on cached preprocessing output
         try:
             logger.debug(f"Performing TF-IDF analysis with max_features={max_features}, min_df={min_df}")
-            tfidf_results = calculate_tf_idf(reviews, max_features=max_features, min_df=min_df)
+            processed_texts, preprocessing_details, _ = analyze_reviews_cached(reviews)
+            tfidf_results = calculate_tf_idf(reviews, max_features=max_features, min_df=min_df,
+                                             preprocessed=(processed_texts, preprocessing_details))
 
             if tfidf_results.get('status') == 'error':
                 logger.error(f"Error in TF-IDF analysis: {tfidf_results.get('message')}")
@@ -900,10 +1680,8 @@ def fetch_aspect_analysis():
 
         # Step 2: Process reviews with sentiment analysis
         try:
-            processed_texts, preprocessing_details = preprocess_reviews(reviews)
-            logger.debug("Preprocessing completed for aspect analysis")
-            sentiment_results = analyze_sentiment(processed_texts)
-            logger.debug("Sentiment analysis completed for aspect analysis")
+            processed_texts, _, sentiment_batch = analyze_reviews_cached(reviews)
+            logger.debug("Preprocessing and sentiment analysis completed for aspect analysis")
         except Exception as analysis_error:
             logger.error(f"Error in text processing or sentiment analysis for aspect analysis: {str(analysis_error)}")
             return jsonify({
@@ -913,14 +1691,9 @@ def fetch_aspect_analysis():
 
         # Step 3: Combine reviews with sentiment scores
         try:
-            for i, review in enumerate(reviews):
-                if i < len(sentiment_results):
-                    review['sentiment_score'] = sentiment_results[i].polarity
-                    review['sentiment_label'] = 'positive' if sentiment_results[i].polarity > 0 else ('negative' if sentiment_results[i].polarity < 0 else 'neutral')
-                else:
-                    # Handle case where sentiment_results is shorter than reviews
-                    review['sentiment_score'] = 0.0
-                    review['sentiment_label'] = 'neutral'
+            for review, polarity, label in zip(reviews, sentiment_batch.polarity.tolist(), sentiment_batch.labels()):
+                review['sentiment_score'] = polarity
+                review['sentiment_label'] = label
 
             logger.debug("Reviews combined with sentiment scores for aspect analysis")
         except Exception as combine_error:
@@ -931,8 +1704,13 @@ def fetch_aspect_analysis():
             }), 500
 
         # Step 4: Perform aspect-based sentiment analysis
+        # (per-review aspect tags are paged separately by /fetch_review_aspects)
         try:
-            aspect_results = extract_aspects(reviews)
+            aspects = aggregate_review_aspects(reviews).finalize()
+            aspect_results = {
+                'aspects': aspects,
+                'aspect_names': list(aspects)
+            }
             logger.debug("Aspect extraction completed")
             aspect_summary = generate_aspect_summary(aspect_results)
             logger.debug("Aspect summary generated")
@@ -943,18 +1721,26 @@ def fetch_aspect_analysis():
                 'message': f"Error in aspect-based sentiment analysis: {str(aspect_error)}"
             }), 500
 
-        # Step 5: Calculate overall sentiment metrics
-        sentiment_counts = {
-            'positive': sum(1 for r in reviews if r.get('sentiment_label') == 'positive'),
-            'neutral': sum(1 for r in reviews if r.get('sentiment_label') == 'neutral'),
-            'negative': sum(1 for r in reviews if r.get('sentiment_label') == 'negative')
-        }
+        # Step 5: Save the tagged reviews for /fetch_review_aspects to page through
+        try:
+            with app.app_context():
+                review_snapshot = store_review_snapshot(app_id, reviews, sentiment_batch)
+        except Exception as snapshot_error:
+            logger.error(f"Error saving the review snapshot of the aspect analysis: {str(snapshot_error)}")
+            return jsonify({
+                'status': 'error',
+                'message': f"Error saving the analysed reviews: {str(snapshot_error)}"
+            }), 500
 
-        # Step 6: Return the response
+        # Step 6: Calculate overall sentiment metrics
+        sentiment_counts = sentiment_batch.counts()
+
+        # Step 7: Return the response
         logger.debug("Returning successful aspect analysis response")
         return jsonify({
             'status': 'success',
-            'data': reviews,
+            'review_count': len(reviews),
+            'review_snapshot': review_snapshot,
             'sentiment_metrics': sentiment_counts,
             'aspect_results': aspect_results,
             'aspect_summary': aspect_summary
@@ -966,6 +1752,107 @@ def fetch_aspect_analysis():
             'message': f"Failed to perform aspect analysis: {str(e)}"
         }), 500
 
+@app.route('/fetch_review_aspects', methods=['POST'])
+def fetch_review_aspects():
+    """
+    API endpoint paging through the reviews of an aspect analysis with their aspect tags
+
+    Takes the app_id and the review_snapshot of a /fetch_aspect_analysis
+    response as snapshot, plus an optional aspect filter. Pages are served
+    from the reviews saved with that analysis, with the sentiment and aspects
+    computed then; each review's aspects come as a bitmask over aspect_names.
+    Pass next_cursor back as cursor for the following page; it is null after
+    the last page. Cursors carry their snapshot, and once the snapshot has
+    expired (REVIEW_SNAPSHOT_TTL) the request fails with 410 and the analysis
+    has to be reloaded.
+
+    Without a snapshot the reviews are fetched with the request's count and
+    sort and a new snapshot is saved and returned with the first page.
+    """
+    try:
+        app_id = request.json.get('app_id')
+        if not app_id:
+            logger.error("App ID is required but not provided")
+            return jsonify({
+                'status': 'error',
+                'message': 'App ID is required'
+            }), 400
+
+        count = min(int(request.json.get('count', 100)), 300)  # Limit max reviews to 300
+        sort = request.json.get('sort', 'most_relevant')
+        aspect = request.json.get('aspect')
+        snapshot = request.json.get('snapshot')
+        try:
+            # Cursors look like '<snapshot>:<position>'
+            cursor = 0
+            if request.json.get('cursor'):
+                cursor_snapshot, cursor = str(request.json['cursor']).rsplit(':', 1)
+                cursor = int(cursor)
+                if snapshot and snapshot != cursor_snapshot:
+                    raise ValueError(f"cursor of snapshot {cursor_snapshot}, expected {snapshot}")
+                snapshot = cursor_snapshot
+            limit = min(int(request.json.get('limit', REVIEW_ASPECTS_PAGE_SIZE)), REVIEW_ASPECTS_MAX_PAGE_SIZE)
+            if cursor < 0 or limit < 1:
+                raise ValueError(f"cursor {cursor}, limit {limit}")
+        except (TypeError, ValueError):
+            return jsonify({
+                'status': 'error',
+                'message': 'cursor must be a next_cursor of this analysis and limit a positive integer'
+            }), 400
+
+        with app.app_context():
+            if not snapshot:
+                reviews = get_app_reviews(app_id, count=count, sort=sort)
+                if not reviews:
+                    return jsonify({
+                        'status': 'error',
+                        'message': 'No reviews found or error fetching reviews'
+                    }), 404
+                _, _, sentiment_batch = analyze_reviews_cached(reviews)
+                snapshot = store_review_snapshot(app_id, reviews, sentiment_batch)
+            stored_snapshot = load_review_snapshot(app_id, snapshot)
+
+        if stored_snapshot is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'The reviews of this analysis have expired, reload the analysis',
+                'snapshot': snapshot
+            }), 410
+        aspect_names, tagged = stored_snapshot
+
+        if aspect and aspect not in aspect_names:
+            return jsonify({
+                'status': 'error',
+                'message': f"Unknown aspect '{aspect}'"
+            }), 400
+        required = 1 << aspect_names.index(aspect) if aspect else 0
+
+        # Collect the next page of tagged reviews; the first match past the page,
+        # if any, is where the next page starts
+        page_reviews = []
+        next_cursor = None
+        for position in range(cursor, len(tagged)):
+            review = tagged[position]
+            if not required or review['aspects'] & required:
+                if len(page_reviews) == limit:
+                    next_cursor = f"{snapshot}:{position}"
+                    break
+                page_reviews.append(dict(review, aspect_sentiment=categorize_sentiment(review['sentiment_score'])))
+
+        return jsonify({
+            'status': 'success',
+            'aspect_names': aspect_names,
+            'snapshot': snapshot,
+            'reviews': page_reviews,
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        logger.error(f"Error fetching review aspects: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f"Failed to fetch review aspects: {str(e)}"
+        }), 500
+
 if __name__ == '__main__':
     db.init_app(app)
     with app.app_context():
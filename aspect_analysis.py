@@ -1,107 +1,344 @@
+import json
 import logging
+import os
+import re
+import threading
 from collections import Counter, defaultdict
+from aspect_matcher import dictionary_hash, get_aspect_matcher
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Define common aspects for app reviews
-APP_ASPECTS = {
-    'ui': ['ui', 'interface', 'design', 'layout', 'screen', 'theme', 'color', 'dark mode', 'light mode', 'appearance', 'look', 'visual'],
-    'performance': ['performance', 'speed', 'fast', 'slow', 'lag', 'crash', 'hang', 'freeze', 'loading', 'battery', 'memory', 'responsive'],
-    'usability': ['usability', 'user-friendly', 'easy', 'difficult', 'simple', 'complex', 'intuitive', 'confusing', 'navigation', 'accessible'],
-    'features': ['feature', 'function', 'functionality', 'capability', 'option', 'setting', 'tool', 'ability', 'control'],
-    'reliability': ['reliable', 'stability', 'stable', 'consistent', 'dependable', 'error', 'bug', 'issue', 'problem', 'glitch', 'fix'],
-    'updates': ['update', 'upgrade', 'version', 'release', 'improvement', 'enhancement', 'change', 'new', 'latest'],
-    'content': ['content', 'post', 'photo', 'video', 'story', 'feed', 'timeline', 'quality', 'relevance', 'recommendation'],
-    'privacy': ['privacy', 'security', 'data', 'permission', 'tracking', 'safe', 'secure', 'protection', 'personal'],
-    'ads': ['ad', 'ads', 'advertisement', 'commercial', 'promotion', 'sponsored', 'marketing', 'popup']
-}
-
-def extract_aspects(reviews, aspect_keywords=APP_ASPECTS):
+# Aspect dictionaries are read from <ASPECT_CONFIG_DIR>/<name>.json, a JSON
+# object mapping each aspect to its list of keywords
+ASPECT_CONFIG_DIR = os.environ.get('ASPECT_CONFIG_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'aspects'))
+
+# Dictionary used when extract_aspects isn't given one
+DEFAULT_ASPECT_DICTIONARY = 'app'
+
+_DICTIONARY_NAME_PATTERN = re.compile(r'[a-z0-9_-]+')
+
+# name -> (file signature, aspect_keywords, content_hash)
+_dictionaries = {}
+_dictionaries_lock = threading.Lock()
+
+def aspect_dictionary_path(name):
+    """
+    Path of a named aspect dictionary
+
+    Raises:
+        ValueError: If the name isn't a plain lowercase file name
+    """
+    if not _DICTIONARY_NAME_PATTERN.fullmatch(name or ''):
+        raise ValueError(f"Invalid aspect dictionary name '{name}'")
+    return os.path.join(ASPECT_CONFIG_DIR, f"{name}.json")
+
+def _read_aspect_dictionary(path):
+    """Read and validate an aspect dictionary file"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(
+            isinstance(aspect, str) and isinstance(keywords, list) and all(isinstance(k, str) for k in keywords)
+            for aspect, keywords in data.items()):
+        raise ValueError(f"{path} must map each aspect to a list of keyword strings")
+    return data
+
+def _load_aspect_dictionary(name):
+    """
+    Return (aspect_keywords, content_hash) for a named dictionary
+
+    The file is stat()ed on every call and re-read when its modification
+    time or size changes, so edits are picked up without a restart. If an
+    edited file can't be parsed the previously loaded version stays in use.
+    """
+    path = aspect_dictionary_path(name)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    entry = _dictionaries.get(name)
+    if entry is not None and entry[0] == signature:
+        return entry[1], entry[2]
+
+    with _dictionaries_lock:
+        entry = _dictionaries.get(name)
+        if entry is not None and entry[0] == signature:
+            return entry[1], entry[2]
+        try:
+            aspect_keywords = _read_aspect_dictionary(path)
+        except (OSError, ValueError) as e:
+            if entry is None:
+                raise
+            logger.error(f"Error reloading aspect dictionary {path}, keeping the previous version: {str(e)}")
+            # Don't retry until the file changes again
+            _dictionaries[name] = (signature, entry[1], entry[2])
+            return entry[1], entry[2]
+
+        content_hash = dictionary_hash(aspect_keywords)
+        _dictionaries[name] = (signature, aspect_keywords, content_hash)
+        logger.info(f"{'Reloaded' if entry else 'Loaded'} aspect dictionary '{name}' "
+                    f"({len(aspect_keywords)} aspects) from {path}")
+        return aspect_keywords, content_hash
+
+def load_aspect_dictionary(name=DEFAULT_ASPECT_DICTIONARY):
+    """
+    Load a named aspect dictionary from ASPECT_CONFIG_DIR
+
+    Args:
+        name (str): Dictionary name, e.g. 'app' or 'banking'
+
+    Returns:
+        dict: Dictionary mapping aspect categories to keywords
+    """
+    return _load_aspect_dictionary(name)[0]
+
+def aspect_dictionary_hash(name=DEFAULT_ASPECT_DICTIONARY):
+    """Content hash of a named aspect dictionary, changes whenever the file's contents do"""
+    return _load_aspect_dictionary(name)[1]
+
+def resolve_aspects(aspect_keywords=None, dictionary=DEFAULT_ASPECT_DICTIONARY):
+    """
+    Return an aspect dictionary together with its compiled matcher
+
+    Args:
+        aspect_keywords (dict, optional): Explicit dictionary mapping aspect categories to keywords
+        dictionary (str): Name of the configured dictionary used when aspect_keywords is None
+
+    Returns:
+        tuple: (aspect_keywords, AspectMatcher)
+    """
+    if aspect_keywords is None:
+        aspect_keywords, content_hash = _load_aspect_dictionary(dictionary)
+        return aspect_keywords, get_aspect_matcher(aspect_keywords, content_hash)
+    return aspect_keywords, get_aspect_matcher(aspect_keywords)
+
+SENTIMENT_CATEGORIES = ('positive', 'neutral', 'negative')
+
+class AspectAggregate:
+    """
+    Mergeable aspect counters
+
+    Holds, per aspect, the number of positive, neutral and negative
+    mentions, the sum of their sentiment scores and keyword counts. Unlike
+    the finalised extract_aspects output nothing is averaged, so aggregates
+    over disjoint sets of reviews (e.g. one per app and day) can be merged in
+    any grouping and finalised once at the end.
+
+    Args:
+        aspects (iterable, optional): Aspects to report even without mentions,
+            e.g. the keys of an aspect dictionary
+    """
+
+    def __init__(self, aspects=()):
+        self.review_count = 0
+        self.aspects = {aspect: self._empty_counters() for aspect in aspects}
+
+    @staticmethod
+    def _empty_counters():
+        return {'positive': 0, 'neutral': 0, 'negative': 0, 'total': 0, 'sentiment_sum': 0.0, 'keywords': Counter()}
+
+    def add_review(self, found_aspects, sentiment_category, sentiment_score):
+        """
+        Count one review
+
+        Args:
+            found_aspects (dict): Aspect -> keywords found in the review, see AspectMatcher.find
+            sentiment_category (str): 'positive', 'neutral' or 'negative'
+            sentiment_score (float): Review sentiment score
+        """
+        self.review_count += 1
+        for aspect, keywords in found_aspects.items():
+            counters = self.aspects.get(aspect)
+            if counters is None:
+                counters = self.aspects[aspect] = self._empty_counters()
+            counters[sentiment_category] += 1
+            counters['total'] += 1
+            counters['sentiment_sum'] += sentiment_score
+            counters['keywords'].update(keywords)
+
+    def update(self, other):
+        """Merge another aggregate into this one in place and return self"""
+        self.review_count += other.review_count
+        for aspect, other_counters in other.aspects.items():
+            counters = self.aspects.get(aspect)
+            if counters is None:
+                counters = self.aspects[aspect] = self._empty_counters()
+            for key in ('positive', 'neutral', 'negative', 'total', 'sentiment_sum'):
+                counters[key] += other_counters[key]
+            counters['keywords'].update(other_counters['keywords'])
+        return self
+
+    def merge(self, other):
+        """Return a new aggregate combining this one and other"""
+        return AspectAggregate().update(self).update(other)
+
+    __add__ = merge
+
+    @classmethod
+    def merge_all(cls, aggregates, aspects=()):
+        """Merge any number of aggregates into a new one"""
+        merged = cls(aspects)
+        for aggregate in aggregates:
+            merged.update(aggregate)
+        return merged
+
+    def to_dict(self):
+        """JSON-serialisable form, see from_dict"""
+        return {
+            'review_count': self.review_count,
+            'aspects': {
+                aspect: dict(counters, keywords=dict(counters['keywords']))
+                for aspect, counters in self.aspects.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an aggregate from to_dict output"""
+        aggregate = cls()
+        aggregate.review_count = data.get('review_count', 0)
+        for aspect, counters in data.get('aspects', {}).items():
+            aggregate.aspects[aspect] = dict(counters, keywords=Counter(counters.get('keywords', {})))
+        return aggregate
+
+    def finalize(self, top_keywords=5):
+        """
+        Compute averages and top keywords
+
+        Returns:
+            dict: Per-aspect results in the format of extract_aspects()['aspects']
+        """
+        results = {}
+        for aspect, counters in self.aspects.items():
+            total = counters['total']
+            results[aspect] = {
+                'positive': counters['positive'],
+                'neutral': counters['neutral'],
+                'negative': counters['negative'],
+                'total': total,
+                'avg_sentiment': counters['sentiment_sum'] / total if total > 0 else 0.0,
+                'keywords': [
+                    {'keyword': k, 'count': c}
+                    for k, c in counters['keywords'].most_common(top_keywords)
+                ]
+            }
+        return results
+
+def sentiment_category(sentiment_score, threshold=0.0):
+    """Categorise a score as positive above threshold, negative below -threshold, else neutral"""
+    return 'positive' if sentiment_score > threshold else ('negative' if sentiment_score < -threshold else 'neutral')
+
+def review_text(review):
+    """
+    Text of a review for aspect analysis
+
+    Every aspect-analysis path applies this one rule: a review without
+    content (missing, empty or only whitespace) is skipped, so it neither
+    counts towards review_count nor gets aspect tags.
+
+    Args:
+        review (dict): Review dictionary
+
+    Returns:
+        str: The review content, or None if the review has no content
+    """
+    content = review.get('content') or ''
+    return content if content.strip() else None
+
+def aggregate_aspects(reviews, aspect_keywords=None, dictionary=DEFAULT_ASPECT_DICTIONARY, threshold=0.0):
+    """
+    Count aspect mentions in reviews into a mergeable AspectAggregate
+
+    Reviews without content are skipped (see review_text).
+
+    Args:
+        reviews (iterable): Review dictionaries with content and sentiment scores
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the configured dictionary named by dictionary
+        dictionary (str): Name of the aspect dictionary in ASPECT_CONFIG_DIR
+        threshold (float): Scores above threshold count as positive, below -threshold as negative
+
+    Returns:
+        AspectAggregate: Aspect counters, including aspects without mentions
+    """
+    aspect_keywords, matcher = resolve_aspects(aspect_keywords, dictionary)
+    aggregate = AspectAggregate(aspect_keywords)
+    for review in reviews:
+        content = review_text(review)
+        if content is None:
+            continue
+        sentiment_score = review.get('sentiment_score', 0)
+        aggregate.add_review(matcher.find(content), sentiment_category(sentiment_score, threshold), sentiment_score)
+    return aggregate
+
+def aspect_masks(reviews, aspect_keywords=None, dictionary=DEFAULT_ASPECT_DICTIONARY):
+    """
+    Tag each review with a bitmask of the aspects it mentions
+
+    A compact alternative to extract_aspects()['review_aspects']: the
+    sentiment of every aspect mention is the review's own sentiment, so only
+    which aspects were mentioned needs to be sent per review.
+
+    Args:
+        reviews (iterable): Review dictionaries with content
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the configured dictionary named by dictionary
+        dictionary (str): Name of the aspect dictionary in ASPECT_CONFIG_DIR
+
+    Returns:
+        tuple: (aspect_names, masks) where bit i of a mask stands for aspect_names[i]
+    """
+    aspect_keywords, matcher = resolve_aspects(aspect_keywords, dictionary)
+    return list(matcher.aspects), [matcher.aspect_mask(review.get('content') or '') for review in reviews]
+
+def extract_aspects(reviews, aspect_keywords=None, dictionary=DEFAULT_ASPECT_DICTIONARY, threshold=0.0):
     """
     Extract aspects from review texts and analyze sentiment for each aspect
     
     Args:
         reviews (list): List of review dictionaries with content and sentiment scores
-        aspect_keywords (dict): Dictionary mapping aspect categories to keywords
+        aspect_keywords (dict, optional): Dictionary mapping aspect categories to keywords,
+            defaults to the configured dictionary named by dictionary
+        dictionary (str): Name of the aspect dictionary in ASPECT_CONFIG_DIR
+        threshold (float): Scores above threshold count as positive, below -threshold as negative
         
     Returns:
         dict: Dictionary containing aspect-based sentiment analysis results
     """
     try:
-        # Initialize results structure
-        aspect_results = {
-            'aspects': {},
-            'review_aspects': []
-        }
-        
-        # Initialize counters for each aspect
-        for aspect in aspect_keywords:
-            aspect_results['aspects'][aspect] = {
-                'positive': 0,
-                'neutral': 0,
-                'negative': 0,
-                'total': 0,
-                'avg_sentiment': 0.0,
-                'keywords': []
-            }
+        aspect_keywords, matcher = resolve_aspects(aspect_keywords, dictionary)
+        aggregate = AspectAggregate(aspect_keywords)
+        review_aspect_results = []
         
         # Process each review
         for review in reviews:
-            content = review.get('content', '').lower()
-            sentiment_score = review.get('sentiment_score', 0)
-            sentiment_category = 'positive' if sentiment_score > 0 else ('negative' if sentiment_score < 0 else 'neutral')
-            
             # Skip empty reviews
-            if not content:
+            content = review_text(review)
+            if content is None:
                 continue
-                
+
+            sentiment_score = review.get('sentiment_score', 0)
+            category = sentiment_category(sentiment_score, threshold)
+
             # Find aspects in the review
-            review_aspects = []
+            found_aspects = matcher.find(content)
+            aggregate.add_review(found_aspects, category, sentiment_score)
             
-            for aspect, keywords in aspect_keywords.items():
-                # Check if any keyword is in the review
-                found_keywords = [keyword for keyword in keywords if keyword in content]
-                
-                if found_keywords:
-                    # Add aspect to review's aspects
-                    review_aspects.append({
+            # Add aspects to review if any were found
+            if found_aspects:
+                review_aspect_results.append({
+                    'review_id': review.get('reviewId', ''),
+                    'aspects': [{
                         'aspect': aspect,
-                        'sentiment': sentiment_category,
+                        'sentiment': category,
                         'score': sentiment_score,
                         'keywords': found_keywords
-                    })
-                    
-                    # Update aspect counters
-                    aspect_results['aspects'][aspect][sentiment_category] += 1
-                    aspect_results['aspects'][aspect]['total'] += 1
-                    aspect_results['aspects'][aspect]['avg_sentiment'] += sentiment_score
-                    
-                    # Track keywords found
-                    aspect_results['aspects'][aspect]['keywords'].extend(found_keywords)
-            
-            # Add aspects to review if any were found
-            if review_aspects:
-                aspect_results['review_aspects'].append({
-                    'review_id': review.get('reviewId', ''),
-                    'aspects': review_aspects
+                    } for aspect, found_keywords in found_aspects.items()]
                 })
         
-        # Calculate average sentiment for each aspect
-        for aspect in aspect_keywords:
-            total = aspect_results['aspects'][aspect]['total']
-            if total > 0:
-                aspect_results['aspects'][aspect]['avg_sentiment'] /= total
-                
-            # Count keyword frequencies
-            keyword_counter = Counter(aspect_results['aspects'][aspect]['keywords'])
-            aspect_results['aspects'][aspect]['keywords'] = [
-                {'keyword': k, 'count': c} 
-                for k, c in keyword_counter.most_common(5)
-            ]
-        
-        return aspect_results
+        return {
+            'aspects': aggregate.finalize(),
+            'review_aspects': review_aspect_results
+        }
     except Exception as e:
         logger.error(f"Error in aspect-based sentiment analysis: {str(e)}")
         return {'aspects': {}, 'review_aspects': []}
@@ -0,0 +1,239 @@
+"""
+Compiled keyword matcher for aspect extraction
+
+An aspect dictionary (aspect -> list of keywords) is compiled into an
+Aho-Corasick automaton over word tokens, so every keyword of every aspect is
+found in a single pass over a review. Matching whole tokens means keywords
+only match on word boundaries: 'ad' no longer matches 'tidak ada' and 'cs'
+no longer matches inside other words. Multi-word keywords such as
+'customer service' or 'user-friendly' match across any run of separators.
+
+Review tokens that aren't keyword tokens are reduced to a keyword token by
+stripping common inflections, so 'fiturnya', 'lambatlah', 'ditransfer' and
+'transfers' still match 'fitur', 'lambat' and 'transfer' without
+reintroducing substring matches.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import deque
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+# Compiled matchers are kept for this many distinct dictionaries
+MATCHER_CACHE_SIZE = 32
+
+# Review tokens whose base form is remembered per matcher
+BASE_FORM_CACHE_SIZE = 100000
+
+# Inflections stripped from review tokens, in this order: Indonesian particles (loginlah),
+# possessive enclitics (aplikasinya), English plurals (transfers, fees, stories) and
+# Indonesian passive/superlative prefixes (ditransfer, terlambat)
+_PARTICLE_SUFFIXES = ('lah', 'kah', 'pun', 'tah')
+_POSSESSIVE_SUFFIXES = ('nya', 'ku', 'mu')
+_PREFIXES = ('di', 'ter')
+_MIN_BASE_LENGTH = 2
+
+def inflection_bases(token):
+    """
+    Candidate base forms of a token, least stripped first
+
+    Args:
+        token (str): Lowercase word token
+
+    Returns:
+        list: Forms with inflections stripped, not including the token itself
+    """
+    forms = [token]
+    for suffix in _PARTICLE_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_BASE_LENGTH:
+            forms.append(token[:-len(suffix)])
+            break
+    for form in list(forms):
+        for suffix in _POSSESSIVE_SUFFIXES:
+            if form.endswith(suffix) and len(form) - len(suffix) >= _MIN_BASE_LENGTH:
+                forms.append(form[:-len(suffix)])
+                break
+    for form in list(forms):
+        if form.endswith('ies') and len(form) > 4:
+            forms.append(form[:-3] + 'y')
+        if form.endswith('es') and len(form) - 2 >= _MIN_BASE_LENGTH:
+            forms.append(form[:-2])
+        if form.endswith('s') and not form.endswith('ss') and len(form) - 1 >= _MIN_BASE_LENGTH:
+            forms.append(form[:-1])
+    for form in list(forms):
+        for prefix in _PREFIXES:
+            if form.startswith(prefix) and len(form) - len(prefix) >= _MIN_BASE_LENGTH:
+                forms.append(form[len(prefix):])
+    return forms[1:]
+
+class AspectMatcher:
+    """
+    Aho-Corasick automaton over the word tokens of an aspect dictionary
+
+    Args:
+        aspect_keywords (dict): Dictionary mapping aspect categories to keywords
+    """
+
+    def __init__(self, aspect_keywords):
+        self.aspects = list(aspect_keywords)
+        # (aspect index, keyword) per pattern, in dictionary order
+        self.keywords = []
+
+        goto = [{}]
+        outputs = [[]]
+        for aspect_index, keywords in enumerate(aspect_keywords.values()):
+            for keyword in keywords:
+                tokens = _WORD_PATTERN.findall(keyword.lower())
+                if not tokens:
+                    logger.warning(f"Ignoring aspect keyword without word characters: {keyword!r}")
+                    continue
+                state = 0
+                for token in tokens:
+                    next_state = goto[state].get(token)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][token] = next_state
+                        goto.append({})
+                        outputs.append([])
+                    state = next_state
+                outputs[state].append(len(self.keywords))
+                self.keywords.append((aspect_index, keyword))
+
+        # Failure links, breadth first so shorter suffixes are resolved first
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(token, 0)
+                outputs[next_state].extend(outputs[fail[next_state]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(output) for output in outputs]
+        self._vocabulary = frozenset(token for edges in goto for token in edges)
+        self._base_forms = {}
+
+    def _base_form(self, token):
+        """
+        Map a review token that isn't a keyword token to the keyword token it inflects
+
+        Args:
+            token (str): Lowercase word token
+
+        Returns:
+            str: The first base form that is a keyword token, or the token itself
+        """
+        base = self._base_forms.get(token)
+        if base is None:
+            base = next((form for form in inflection_bases(token) if form in self._vocabulary), token)
+            if len(self._base_forms) >= BASE_FORM_CACHE_SIZE:
+                self._base_forms.clear()
+            self._base_forms[token] = base
+        return base
+
+    def match_ids(self, text):
+        """
+        Find the keywords mentioned in a text
+
+        Args:
+            text (str): Review text
+
+        Returns:
+            set: Indices into self.keywords of the keywords found
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        vocabulary = self._vocabulary
+        found = set()
+        state = 0
+        for token in _WORD_PATTERN.findall(text.lower()):
+            if token not in vocabulary:
+                token = self._base_form(token)
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def find(self, text):
+        """
+        Find the aspects mentioned in a text
+
+        Args:
+            text (str): Review text
+
+        Returns:
+            dict: Mapping of each mentioned aspect to the keywords found for it,
+            both in dictionary order
+        """
+        found = {}
+        if not text:
+            return found
+        for keyword_id in sorted(self.match_ids(text)):
+            aspect_index, keyword = self.keywords[keyword_id]
+            found.setdefault(self.aspects[aspect_index], []).append(keyword)
+        return found
+
+    def aspect_mask(self, text):
+        """
+        Encode the aspects mentioned in a text as a bitmask
+
+        Args:
+            text (str): Review text
+
+        Returns:
+            int: Bit i is set when self.aspects[i] is mentioned
+        """
+        mask = 0
+        if text:
+            for keyword_id in self.match_ids(text):
+                mask |= 1 << self.keywords[keyword_id][0]
+        return mask
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+def dictionary_hash(aspect_keywords):
+    """SHA-1 hex digest of an aspect dictionary's contents, keyword order included"""
+    return hashlib.sha1(json.dumps(aspect_keywords, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def get_aspect_matcher(aspect_keywords, content_hash=None):
+    """
+    Return the compiled matcher for an aspect dictionary, building it on first use
+
+    Matchers are cached by content hash, so a dictionary is only compiled
+    once however many requests use it, and an edited dictionary gets a new
+    matcher.
+
+    Args:
+        aspect_keywords (dict): Dictionary mapping aspect categories to keywords
+        content_hash (str, optional): dictionary_hash of aspect_keywords, if already known
+
+    Returns:
+        AspectMatcher: Compiled matcher
+    """
+    key = content_hash or dictionary_hash(aspect_keywords)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(key)
+            if matcher is None:
+                matcher = AspectMatcher(aspect_keywords)
+                if len(_matchers) >= MATCHER_CACHE_SIZE:
+                    _matchers.pop(next(iter(_matchers)))
+                _matchers[key] = matcher
+                logger.debug(f"Compiled aspect matcher for {len(matcher.aspects)} aspects, "
+                             f"{len(matcher.keywords)} keywords")
+    return matcher
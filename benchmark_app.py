@@ -0,0 +1,152 @@
+"""
+Offline load test for the Flask app using recorded Play Store responses
+
+First record fixtures once (needs network access):
+
+    python benchmark_app.py --record --apps com.jago.digitalBanking com.bcadigital.blu
+
+Then benchmark throughput and tail latency on an isolated machine:
+
+    python benchmark_app.py --apps com.jago.digitalBanking com.bcadigital.blu \\
+        --requests 500 --concurrency 16 --latency-ms 150 --jitter-ms 100 --error-rate 0.02
+"""
+import argparse
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Flask app against recorded Play Store fixtures")
+    parser.add_argument('--apps', nargs='+', required=True, help="App package names to exercise")
+    parser.add_argument('--app-module', default='app', choices=['app', 'simple_app'], help="Flask app to benchmark")
+    parser.add_argument('--fixtures', default=None, help="Fixture directory (defaults to PLAY_FIXTURES_DIR)")
+    parser.add_argument('--record', action='store_true', help="Record fixtures from the live Play Store instead of benchmarking")
+    parser.add_argument('--count', type=int, default=100, help="Reviews requested per endpoint call")
+    parser.add_argument('--requests', type=int, default=200, help="Total number of requests to send")
+    parser.add_argument('--concurrency', type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Simulated Play Store latency per call")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Maximum random latency added per call")
+    parser.add_argument('--error-rate', type=float, default=0, help="Fraction of Play Store calls that fail")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for latency and error injection")
+    parser.add_argument('--with-cache', action='store_true', help="Keep the persistent response cache enabled")
+    parser.add_argument('--with-rate-limit', action='store_true', help="Keep the scraper's Play Store rate limiter enabled")
+    return parser.parse_args()
+
+def build_scenario(app_ids, count):
+    """
+    Build the list of requests a dashboard visit makes for each app
+
+    Args:
+        app_ids (list): App package names
+        count (int): Reviews requested per endpoint call
+
+    Returns:
+        list: List of (label, method, path, json_body) tuples
+    """
+    scenario = []
+    for app_id in app_ids:
+        scenario.extend([
+            ('POST /fetch_app_info', 'POST', '/fetch_app_info', {'app_packages': [app_id]}),
+            ('GET /app/<app_id>', 'GET', f'/app/{app_id}', None),
+            ('GET /app/<app_id>/reviews', 'GET', f'/app/{app_id}/reviews', None),
+            ('POST /fetch_app_reviews', 'POST', '/fetch_app_reviews', {'app_id': app_id, 'count': count}),
+            ('POST /fetch_aspect_analysis', 'POST', '/fetch_aspect_analysis', {'app_id': app_id, 'count': count}),
+            ('POST /fetch_app_reviews_for_data_analysis', 'POST', '/fetch_app_reviews_for_data_analysis',
+             {'app_id': app_id, 'count': count}),
+            ('POST /fetch_tfidf_analysis', 'POST', '/fetch_tfidf_analysis', {'app_id': app_id, 'count': count}),
+        ])
+    return scenario
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def main():
+    args = parse_args()
+
+    # Configure the scraper before it is imported
+    if args.fixtures:
+        os.environ['PLAY_FIXTURES_DIR'] = args.fixtures
+    os.environ['PLAY_BACKEND'] = 'record' if args.record else 'replay'
+    if not args.with_cache:
+        os.environ['PLAY_CACHE_ENABLED'] = '0'
+    if not args.with_rate_limit:
+        # The limiter protects the real Play Store; against fixtures it would only cap throughput
+        for name in ('SCRAPER_RATE', 'SCRAPER_MIN_RATE', 'SCRAPER_MAX_RATE', 'SCRAPER_BURST'):
+            os.environ[name] = '1000000'
+
+    import logging
+    import scraper
+    from scraper_replay import ReplayBackend, FIXTURES_DIR
+    from models import db
+
+    flask_module = __import__(args.app_module)
+    flask_app = flask_module.app
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all()
+
+    # Request logging would dominate the measurements
+    logging.disable(logging.WARNING)
+
+    scenario = build_scenario(args.apps, args.count)
+
+    if args.record:
+        client = flask_app.test_client()
+        for _, method, path, body in scenario:
+            response = client.open(path, method=method, json=body)
+            print(f"Recorded {method} {path}: {response.status_code}")
+        print(f"Fixtures written to {os.environ.get('PLAY_FIXTURES_DIR', FIXTURES_DIR)}")
+        return
+
+    scraper.set_play_backend(ReplayBackend(
+        fixtures_dir=os.environ.get('PLAY_FIXTURES_DIR', FIXTURES_DIR),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed
+    ))
+
+    local = threading.local()
+    latencies = defaultdict(list)
+    statuses = Counter()
+    results_lock = threading.Lock()
+
+    def send(i):
+        # Flask test clients aren't shared between threads
+        if not hasattr(local, 'client'):
+            local.client = flask_app.test_client()
+        endpoint, method, path, body = scenario[i % len(scenario)]
+
+        start = time.perf_counter()
+        response = local.client.open(path, method=method, json=body)
+        elapsed = time.perf_counter() - start
+
+        with results_lock:
+            latencies[endpoint].append(elapsed)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(send, range(args.requests)))
+    wall_time = time.perf_counter() - started
+
+    all_latencies = sorted(value for values in latencies.values() for value in values)
+    print(f"Requests: {args.requests}  Concurrency: {args.concurrency}  Wall time: {wall_time:.2f}s")
+    print(f"Throughput: {args.requests / wall_time:.1f} requests/second")
+    print(f"Status codes: {dict(statuses)}")
+    print(f"{'endpoint':45} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for endpoint, values in sorted(latencies.items()) + [('ALL', all_latencies)]:
+        values = sorted(values)
+        print(f"{endpoint:45} {len(values):>6} "
+              f"{percentile(values, 0.50) * 1000:>9.1f} {percentile(values, 0.95) * 1000:>9.1f} "
+              f"{percentile(values, 0.99) * 1000:>9.1f} {values[-1] * 1000:>9.1f}")
+    print(f"Scraper stats: {scraper.get_scraper_stats()}")
+
+if __name__ == '__main__':
+    main()
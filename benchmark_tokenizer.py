@@ -0,0 +1,125 @@
+"""
+Benchmark the preprocessing tokenizers and report where they disagree
+
+The corpus is read from recorded Play Store fixtures (see benchmark_app.py)
+and/or review exports:
+
+    python benchmark_tokenizer.py --fixtures fixtures/play
+    python benchmark_tokenizer.py --file reviews_com.jago.digitalBanking.csv --file reviews.ndjson
+
+CSV files are read from their 'Review' column (the /export_reviews_csv
+format); JSON and NDJSON files from each record's 'content' field.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import time
+from collections import Counter
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare preprocessing tokenizers for speed and output parity")
+    parser.add_argument('--fixtures', default=None, help="Fixture directory to read review texts from")
+    parser.add_argument('--file', action='append', default=[], help="CSV, JSON or NDJSON review export (repeatable)")
+    parser.add_argument('--baseline', default='nltk', help="Reference tokenizer")
+    parser.add_argument('--candidate', default='whitespace', help="Tokenizer compared against the reference")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing runs per tokenizer (best run is reported)")
+    parser.add_argument('--examples', type=int, default=10, help="Number of differing reviews to print")
+    return parser.parse_args()
+
+def load_fixture_texts(fixtures_dir):
+    """Collect review texts from recorded reviews() fixtures"""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, 'reviews-*.json'))):
+        with open(path, encoding='utf-8') as f:
+            fixture = json.load(f)
+        texts.extend(review.get('content') for review in fixture.get('response', []))
+    return texts
+
+def load_file_texts(path):
+    """Collect review texts from a CSV, JSON or NDJSON export"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            return [row.get('Review') for row in csv.DictReader(f)]
+        if path.endswith('.ndjson') or path.endswith('.jsonl'):
+            return [json.loads(line).get('content') for line in f if line.strip()]
+        return [review.get('content') for review in json.load(f)]
+
+def time_tokenizer(tokenize, texts, repeat):
+    """Best wall time of tokenizing every text, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            tokenize(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    args = parse_args()
+
+    from analysis import TOKENIZERS, _check_punkt, clean_review_text
+
+    for name in (args.baseline, args.candidate):
+        if name not in TOKENIZERS:
+            raise SystemExit(f"Unknown tokenizer '{name}', expected one of {', '.join(TOKENIZERS)}")
+    # Without punkt the 'nltk' tokenizer silently splits on whitespace, which would compare the fallback with itself
+    if 'nltk' in (args.baseline, args.candidate) and not _check_punkt():
+        raise SystemExit("NLTK punkt data is not installed, so the 'nltk' tokenizer would fall back to "
+                         "whitespace splitting; install it with: python -m nltk.downloader punkt_tab")
+
+    raw_texts = []
+    if args.fixtures:
+        raw_texts.extend(load_fixture_texts(args.fixtures))
+    for path in args.file:
+        raw_texts.extend(load_file_texts(path))
+    # Tokenizers see the same cleaned text preprocess_reviews feeds them
+    texts = [clean_review_text(text) for text in raw_texts if text]
+    if not texts:
+        raise SystemExit("No review texts found, pass --fixtures and/or --file")
+
+    baseline = TOKENIZERS[args.baseline]
+    candidate = TOKENIZERS[args.candidate]
+
+    baseline_tokens = [baseline(text) for text in texts]
+    candidate_tokens = [candidate(text) for text in texts]
+
+    # Timing
+    baseline_time = time_tokenizer(baseline, texts, args.repeat)
+    candidate_time = time_tokenizer(candidate, texts, args.repeat)
+    print(f"Reviews: {len(texts)}  Characters: {sum(len(text) for text in texts)}")
+    print(f"{args.baseline:>10}: {baseline_time * 1000:9.1f} ms  ({len(texts) / baseline_time:,.0f} reviews/s)")
+    print(f"{args.candidate:>10}: {candidate_time * 1000:9.1f} ms  ({len(texts) / candidate_time:,.0f} reviews/s)")
+    print(f"Speedup: {baseline_time / candidate_time:.1f}x")
+
+    # Parity
+    differing = [i for i, (a, b) in enumerate(zip(baseline_tokens, candidate_tokens)) if a != b]
+    baseline_only = Counter()
+    candidate_only = Counter()
+    for i in differing:
+        a, b = Counter(baseline_tokens[i]), Counter(candidate_tokens[i])
+        baseline_only.update(a - b)
+        candidate_only.update(b - a)
+
+    total_tokens = sum(len(tokens) for tokens in baseline_tokens)
+    print()
+    print(f"Identical token lists: {len(texts) - len(differing)}/{len(texts)} "
+          f"({(len(texts) - len(differing)) / len(texts) * 100:.2f}%)")
+    print(f"Token counts: {args.baseline} {total_tokens}, "
+          f"{args.candidate} {sum(len(tokens) for tokens in candidate_tokens)}")
+    if baseline_only or candidate_only:
+        print(f"Tokens only produced by {args.baseline}: "
+              f"{', '.join(f'{token!r} x{count}' for token, count in baseline_only.most_common(15))}")
+        print(f"Tokens only produced by {args.candidate}: "
+              f"{', '.join(f'{token!r} x{count}' for token, count in candidate_only.most_common(15))}")
+
+    for i in differing[:args.examples]:
+        print()
+        print(f"Review {i}: {texts[i]!r}")
+        print(f"  {args.baseline:>10}: {baseline_tokens[i]}")
+        print(f"  {args.candidate:>10}: {candidate_tokens[i]}")
+
+if __name__ == '__main__':
+    main()
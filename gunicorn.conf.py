@@ -0,0 +1,20 @@
+"""
+Gunicorn settings
+
+    gunicorn main:app
+
+The app is imported once in the master process and NLP resources are warmed
+up there before the workers are forked, so every worker shares the same
+stemmer dictionary and lexicons instead of building its own.
+"""
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = True
+
+def when_ready(server):
+    """Warm up NLP resources in the master before workers are forked"""
+    from analysis import warmup
+    warmup()
@@ -42,6 +42,8 @@ class ScrapedApp(db.Model):
 
 class ScrapedReview(db.Model):
     __tablename__ = 'scraped_reviews'
+    # A review is stored once per app however many fetches or syncs return it
+    __table_args__ = (db.UniqueConstraint('app_id', 'review_id', name='uq_scraped_reviews_app_review'),)
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     app_id = db.Column(db.String)
     review_id = db.Column(db.String)
@@ -53,4 +55,59 @@ class ScrapedReview(db.Model):
     def __repr__(self):
         return f'<ScrapedReview {self.id}>'
 
+class ReviewAnalysis(db.Model):
+    __tablename__ = 'review_analysis'
+    content_hash = db.Column(db.String(40), primary_key=True)
+    pipeline_version = db.Column(db.String, primary_key=True)
+    processed_text = db.Column(db.Text)
+    polarity = db.Column(db.Float)
+    subjectivity = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
 
+    def __repr__(self):
+        return f'<ReviewAnalysis {self.content_hash[:8]} {self.pipeline_version}>'
+
+class AspectDailyAggregate(db.Model):
+    __tablename__ = 'aspect_daily_aggregates'
+    app_id = db.Column(db.String, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    version = db.Column(db.String, primary_key=True)
+    review_count = db.Column(db.Integer, default=0)
+    # Stored reviews merged into the row, empty ones included, to check the rollup covers every stored review
+    source_count = db.Column(db.Integer, default=0)
+    data = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f'<AspectDailyAggregate {self.app_id} {self.day} {self.version}>'
+
+class ReviewSyncState(db.Model):
+    __tablename__ = 'review_sync_state'
+    app_id = db.Column(db.String, primary_key=True)
+    # Locale the sync is pinned to; watermarks and tokens of one locale's stream mean nothing in another's
+    lang = db.Column(db.String)
+    country = db.Column(db.String)
+    # Newest review reached by the incremental sync: its date and the JSON list of review IDs posted then
+    watermark = db.Column(db.DateTime)
+    watermark_review_ids = db.Column(db.Text)
+    # JSON list of the stretches of the review stream a sync stopped short of, newest first, each
+    # with the continuation token to resume from and the watermark (date and IDs) where it ends
+    backfill = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ReviewSyncState {self.app_id} {self.watermark}>'
+
+class ReviewSnapshot(db.Model):
+    __tablename__ = 'review_snapshots'
+    # review_list_snapshot() of the analysed reviews
+    snapshot_id = db.Column(db.String(16), primary_key=True)
+    app_id = db.Column(db.String, primary_key=True)
+    # JSON list of aspect names, and of the reviews tagged with at least one aspect in analysis
+    # order, each with its sentiment and aspect bitmask
+    aspect_names = db.Column(db.Text)
+    reviews = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ReviewSnapshot {self.app_id} {self.snapshot_id}>'
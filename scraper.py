@@ -1,49 +1,159 @@
 
-from google_play_scraper import app, Sort, reviews
+from google_play_scraper import Sort
+from concurrent.futures import ThreadPoolExecutor
+from scraper_cache import response_cache
+from scraper_transport import play_transport, ScraperError
+from scraper_replay import create_play_backend, _token_from_json, _token_to_json
+import datetime
+import hashlib
+import json
 import logging
+import os
+import threading
 import time
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-def get_app_info(app_packages):
+# Backend serving Play Store calls: live, recording or replaying fixtures (see PLAY_BACKEND)
+play_backend = create_play_backend()
+
+# Maximum number of apps fetched concurrently by get_app_info
+APP_INFO_MAX_WORKERS = int(os.environ.get('SCRAPER_APP_INFO_WORKERS', 8))
+
+# Number of reviews requested per page when following continuation tokens
+REVIEW_PAGE_SIZE = 100
+
+# Maximum number of score buckets fetched concurrently for one app
+REVIEW_BUCKET_MAX_WORKERS = int(os.environ.get('SCRAPER_REVIEW_BUCKET_WORKERS', 5))
+
+# Locales tried in order, as (lang, country) pairs
+LOCALES = [('id', 'id'), ('en', 'us')]
+
+# How long to remember which locale worked for a package, in seconds
+LOCALE_MEMORY_TTL = int(os.environ.get('SCRAPER_LOCALE_MEMORY_TTL', 7 * 24 * 60 * 60))
+
+# (kind, package) -> (locale, expires_at) for the locale that last worked
+_locale_memory = {}
+_locale_lock = threading.Lock()
+_locale_stats = {
+    'fallback_round_trips': 0,
+    'fallback_round_trips_saved': 0
+}
+
+def set_play_backend(backend):
+    """
+    Replace the backend serving Play Store calls, e.g. with a ReplayBackend for benchmarks
+
+    Args:
+        backend (object): Backend with app() and reviews() methods
+    """
+    global play_backend
+    play_backend = backend
+
+def _locale_order(kind, package):
+    """
+    Get the locales to try for a package, the one that last worked first
+
+    Args:
+        kind (str): Request kind, 'metadata' or 'reviews'
+        package (str): App package name
+
+    Returns:
+        list: List of (lang, country) pairs
+    """
+    with _locale_lock:
+        remembered = _locale_memory.get((kind, package))
+        if remembered and remembered[1] <= time.time():
+            del _locale_memory[(kind, package)]
+            remembered = None
+
+    if not remembered:
+        return list(LOCALES)
+    return [remembered[0]] + [locale for locale in LOCALES if locale != remembered[0]]
+
+def _remember_locale(kind, package, locale, attempt):
+    """
+    Record the locale that worked for a package
+
+    Args:
+        kind (str): Request kind, 'metadata' or 'reviews'
+        package (str): App package name
+        locale (tuple): The (lang, country) pair that worked
+        attempt (int): Index of the locale in the order it was tried
+    """
+    with _locale_lock:
+        _locale_memory[(kind, package)] = (locale, time.time() + LOCALE_MEMORY_TTL)
+        _locale_stats['fallback_round_trips'] += attempt
+        # A remembered non-default locale that works first time skips the failing default
+        if attempt == 0 and locale != LOCALES[0]:
+            _locale_stats['fallback_round_trips_saved'] += 1
+
+def _fetch_single_app_info(package):
+    """
+    Fetch app information for a single package, trying each locale in turn
+
+    Args:
+        package (str): App package name
+
+    Returns:
+        dict: App information dictionary, or None if all locales failed
+    """
+    hit, cached = response_cache.get('metadata', package)
+    if hit:
+        return cached
+
+    last_error = None
+    for attempt, (lang, country) in enumerate(_locale_order('metadata', package)):
+        try:
+            result = play_transport.call(play_backend.app, package, lang=lang, country=country)
+            logger.info(f"Successfully fetched info for app {package} with lang={lang}")
+            _remember_locale('metadata', package, (lang, country), attempt)
+            response_cache.set('metadata', package, result)
+            return result
+        except Exception as e:
+            # Fall through to the next locale
+            logger.warning(f"Failed to fetch app {package} with lang={lang}: {str(e)}")
+            last_error = e
+
+    logger.error(f"Error fetching info for app {package} with all locales: {str(last_error)}")
+    return None
+
+def get_app_info(app_packages, max_workers=APP_INFO_MAX_WORKERS):
     """
     Scrape app information from Google Play Store
 
+    Packages are fetched concurrently on a bounded thread pool, so the total
+    latency is roughly that of the slowest app rather than the sum of all of them.
+
     Args:
         app_packages (list): List of app package names
+        max_workers (int): Maximum number of concurrent fetches (1 fetches sequentially)
 
     Returns:
-        list: List of dictionaries containing app information
+        list: List of dictionaries containing app information, in input order
 
     Raises:
         Exception: If no valid app information could be retrieved
     """
+    app_packages = list(app_packages)
     app_info_list = []
     failed_packages = []
 
-    for package in app_packages:
-        try:
-            # First try with Indonesian locale
-            try:
-                result = app(package, lang='id', country='id')
-                app_info_list.append(result)
-                logger.info(f"Successfully fetched info for app {package}")
-            except Exception as e_id:
-                # If Indonesian locale fails, try with English/US locale
-                logger.warning(f"Failed to fetch app {package} with ID locale: {str(e_id)}")
-                try:
-                    result = app(package, lang='en', country='us')
-                    app_info_list.append(result)
-                    logger.info(f"Successfully fetched info for app {package} with EN locale")
-                except Exception as e_en:
-                    # Both locales failed
-                    logger.error(f"Failed to fetch app {package} with both locales: {str(e_en)}")
-                    failed_packages.append(package)
-                    raise Exception(f"Could not fetch app info for {package}: {str(e_en)}")
-        except Exception as e:
-            logger.error(f"Error fetching info for app {package}: {str(e)}")
+    workers = max(1, min(max_workers or 1, len(app_packages)))
+    if workers == 1:
+        results = [_fetch_single_app_info(package) for package in app_packages]
+    else:
+        logger.debug(f"Fetching info for {len(app_packages)} apps with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in input order regardless of completion order
+            results = list(executor.map(_fetch_single_app_info, app_packages))
+
+    for package, result in zip(app_packages, results):
+        if result is not None:
+            app_info_list.append(result)
+        else:
             failed_packages.append(package)
 
     # If we couldn't fetch any app info, raise an exception
@@ -54,7 +164,312 @@ def get_app_info(app_packages):
 
     return app_info_list
 
-def get_app_reviews(app_package, count=100, score=None, sort='most_relevant'):
+def _generated_review_id(r, app_package):
+    """
+    Derive a stable ID for a review the Play Store returned without one
+
+    The ID is a hash of the review's author, timestamp and text, so the same
+    review fetched through different score buckets or pages gets the same ID
+    and distinct reviews get distinct IDs.
+
+    Args:
+        r (dict): Raw review dictionary
+        app_package (str): App package name
+
+    Returns:
+        str: Generated review ID
+    """
+    key = '\x1f'.join([app_package, str(r.get('userName') or ''), str(r.get('at') or ''), r.get('content') or ''])
+    return f"generated-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]}"
+
+def _normalize_review(r, app_package, sort_order, default_score):
+    """
+    Fill in missing fields of a raw review returned by google_play_scraper
+
+    Args:
+        r (dict): Raw review dictionary (modified in place)
+        app_package (str): App package name
+        sort_order (Sort): Sort order the review was fetched with
+        default_score (int): Score to use when the review has none
+
+    Returns:
+        dict: The normalized review
+    """
+    r['sortOrder'] = 'most_relevant' if sort_order == Sort.MOST_RELEVANT else 'newest'
+    r['appId'] = app_package
+
+    # Ensure all required fields have valid values
+    if 'reviewId' not in r or not r['reviewId']:
+        # Hash the raw fields, before defaults such as the current time are filled in
+        r['reviewId'] = _generated_review_id(r, app_package)
+
+    if 'userName' not in r or not r['userName']:
+        r['userName'] = "Anonymous"
+
+    if 'score' not in r or not isinstance(r['score'], (int, float)):
+        r['score'] = default_score
+
+    if 'content' not in r or not r['content']:
+        r['content'] = ""
+
+    if 'at' not in r:
+        r['at'] = int(time.time() * 1000)  # Current time in milliseconds
+
+    return r
+
+def iter_app_reviews(app_package, batch_size=REVIEW_PAGE_SIZE, sort='most_relevant', score=None,
+                     lang='id', country='id', max_reviews=None):
+    """
+    Harvest reviews page by page by following Google Play continuation tokens
+
+    Only one page is held in memory at a time, so callers can stream thousands
+    of reviews and stop iterating whenever they have enough.
+
+    Args:
+        app_package (str): App package name
+        batch_size (int): Number of reviews requested per page
+        sort (str): Sort by 'most_relevant' or 'newest'
+        score (int, optional): Filter by score (1-5)
+        lang (str): Language code for the request
+        country (str): Country code for the request
+        max_reviews (int, optional): Stop after this many reviews (None for all)
+
+    Yields:
+        list: Batches of normalized review dictionaries
+
+    Raises:
+        ScraperError: If the Play Store can't be reached after retries
+    """
+    sort_order = Sort.MOST_RELEVANT if sort == 'most_relevant' else Sort.NEWEST
+    continuation_token = None
+    fetched = 0
+
+    while max_reviews is None or fetched < max_reviews:
+        page_size = batch_size if max_reviews is None else min(batch_size, max_reviews - fetched)
+
+        rvs, continuation_token = play_transport.call(
+            play_backend.reviews,
+            app_package,
+            lang=lang,
+            country=country,
+            sort=sort_order,
+            count=page_size,
+            filter_score_with=score,
+            continuation_token=continuation_token
+        )
+
+        # The token fixes the page size of the first request, so trim the last page
+        if max_reviews is not None:
+            rvs = rvs[:max_reviews - fetched]
+
+        batch = []
+        for r in rvs:
+            if r and isinstance(r, dict):
+                batch.append(_normalize_review(r, app_package, sort_order, score or 3))
+
+        if batch:
+            fetched += len(batch)
+            logger.debug(f"Harvested page of {len(batch)} reviews for {app_package} ({fetched} total)")
+            yield batch
+
+        if not rvs or continuation_token is None or continuation_token.token is None:
+            break
+
+def _fetch_reviews_with_fallback(app_package, count, sort, score):
+    """
+    Collect up to count reviews for one score bucket, trying each locale in turn
+
+    Args:
+        app_package (str): App package name
+        count (int): Number of reviews to collect
+        sort (str): Sort by 'most_relevant' or 'newest'
+        score (int, optional): Filter by score (1-5)
+
+    Returns:
+        list: List of review dictionaries, empty if the app has no such reviews
+
+    Raises:
+        ScraperError: If every locale failed rather than returning no reviews
+    """
+    last_error = None
+    failed_attempts = 0
+    for attempt, (lang, country) in enumerate(_locale_order('reviews', app_package)):
+        try:
+            collected = []
+            for batch in iter_app_reviews(app_package, sort=sort, score=score, lang=lang,
+                                          country=country, max_reviews=count):
+                collected.extend(batch)
+
+            if collected:
+                # A bucket that is merely empty in the earlier locales says nothing about the app,
+                # only remember a locale that took over from failing ones
+                if failed_attempts == attempt:
+                    _remember_locale('reviews', app_package, (lang, country), attempt)
+                return collected
+
+            logger.warning(f"No reviews found for score {score} with lang={lang}")
+            last_error = None
+        except ScraperError as e:
+            logger.warning(f"Error in reviews API call with lang={lang}: {str(e)}")
+            last_error = e
+            failed_attempts += 1
+
+    # Only report a failure if the last locale failed outright, not if it came back empty
+    if last_error is not None:
+        raise last_error
+    return []
+
+def _review_datetime(value):
+    """
+    Convert a review timestamp (datetime or epoch milliseconds) to a datetime
+
+    Args:
+        value: Review 'at' value
+
+    Returns:
+        datetime.datetime: Timestamp as a datetime, or None if it can't be converted
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.datetime.fromtimestamp(value / 1000)
+        except Exception:
+            return None
+    return None
+
+class IncompleteSyncError(ScraperError):
+    """Raised when the review stream ends before an incremental fetch reaches its watermark"""
+
+def serialize_review_token(token):
+    """
+    Serialize a review continuation token so a fetch can be resumed later
+
+    Args:
+        token (_ContinuationToken): Token returned with a page of reviews
+
+    Returns:
+        str: JSON representation of the token
+    """
+    return json.dumps(_token_to_json(token))
+
+def deserialize_review_token(data):
+    """
+    Rebuild a review continuation token serialized by serialize_review_token
+
+    Args:
+        data (str): JSON representation of the token
+
+    Returns:
+        _ContinuationToken: Token to pass back to the review stream
+    """
+    return _token_from_json(json.loads(data))
+
+def fetch_review_segment(app_package, lang='id', country='id', since=None, known_review_ids=None,
+                         max_reviews=None, resume_token=None, batch_size=REVIEW_PAGE_SIZE):
+    """
+    Fetch a stretch of the newest-first review stream, down to a watermark
+
+    Starting from the newest review (or from `resume_token`), pages through
+    the stream until it reaches a review older than `since` or one of
+    `known_review_ids`, so an app refreshed hourly costs only a few pages
+    instead of a full re-scrape. Without a watermark the segment runs to the
+    end of the review history. Once `max_reviews` reviews are collected the
+    fetch stops at the page boundary and returns a token to resume from, so
+    the rest of the segment can be fetched by a later call instead of being
+    skipped.
+
+    A stream that ends before reaching the watermark would leave a silent gap
+    between the fetched reviews and the watermark, so it fails instead of
+    returning the partial segment.
+
+    Args:
+        app_package (str): App package name
+        lang (str): Language code for the request
+        country (str): Country code for the request
+        since (datetime.datetime, optional): Date of the newest review already fetched
+        known_review_ids (set, optional): IDs of the already fetched reviews posted at `since`
+        max_reviews (int, optional): Stop at the first page boundary past this many reviews (None for no limit)
+        resume_token (_ContinuationToken, optional): Token returned by an earlier call for the same segment
+        batch_size (int): Number of reviews requested per page
+
+    Returns:
+        tuple: (review dictionaries newest first, token to resume the segment from or None once it is complete)
+
+    Raises:
+        IncompleteSyncError: If the stream ended before reaching the watermark
+        ScraperError: If the Play Store can't be reached after retries
+    """
+    known_review_ids = known_review_ids or set()
+    has_watermark = since is not None or bool(known_review_ids)
+    continuation_token = resume_token
+    new_reviews = []
+
+    while True:
+        rvs, continuation_token = play_transport.call(
+            play_backend.reviews,
+            app_package,
+            lang=lang,
+            country=country,
+            sort=Sort.NEWEST,
+            count=batch_size,
+            filter_score_with=None,
+            continuation_token=continuation_token
+        )
+
+        for r in rvs:
+            if not r or not isinstance(r, dict):
+                continue
+            review = _normalize_review(r, app_package, Sort.NEWEST, 3)
+            review_date = _review_datetime(review.get('at'))
+            if review['reviewId'] in known_review_ids or (
+                    since is not None and review_date is not None and review_date < since):
+                logger.info(f"Found {len(new_reviews)} new reviews for {app_package} since {since}")
+                return new_reviews, None
+            new_reviews.append(review)
+
+        if not rvs or continuation_token is None or continuation_token.token is None:
+            if has_watermark:
+                raise IncompleteSyncError(
+                    f"The review stream of {app_package} ended after {len(new_reviews)} reviews "
+                    f"without reaching the last synced review ({since})",
+                    app_package
+                )
+            logger.info(f"Reached the end of the review history of {app_package} after {len(new_reviews)} reviews")
+            return new_reviews, None
+
+        if max_reviews is not None and len(new_reviews) >= max_reviews:
+            logger.info(f"Stopped after {len(new_reviews)} reviews for {app_package}, the rest of the segment is resumable")
+            return new_reviews, continuation_token
+
+def get_app_reviews(app_package, count=100, score=None, sort='most_relevant', use_cache=True):
+    """
+    Get reviews for an app, served from the persistent response cache when fresh
+
+    Args:
+        app_package (str): App package name
+        count (int): Number of reviews to fetch
+        score (int, optional): Filter by score (1-5)
+        sort (str): Sort by 'most_relevant' or 'newest'
+        use_cache (bool): Whether to read from and write to the response cache
+
+    Returns:
+        list: List of dictionaries containing review information
+    """
+    cache_key = f"{app_package}|{count}|{score}|{sort}"
+    if use_cache:
+        hit, cached = response_cache.get('reviews', cache_key)
+        if hit:
+            return cached
+
+    app_reviews = _scrape_app_reviews(app_package, count=count, score=score, sort=sort)
+
+    if use_cache and app_reviews:
+        response_cache.set('reviews', cache_key, app_reviews)
+
+    return app_reviews
+
+def _scrape_app_reviews(app_package, count=100, score=None, sort='most_relevant'):
     """
     Scrape reviews for an app from Google Play Store
 
@@ -66,182 +481,104 @@ def get_app_reviews(app_package, count=100, score=None, sort='most_relevant'):
 
     Returns:
         list: List of dictionaries containing review information
+
+    Raises:
+        ScraperError: If every score bucket failed to fetch
     """
     app_reviews = []
 
-    try:
-        # Validate input parameters
-        if not app_package:
-            logger.error("App package name is required")
-            return []
+    # Validate input parameters
+    if not app_package:
+        logger.error("App package name is required")
+        return []
+
+    logger.info(f"Starting review fetch for {app_package}, count={count}, score={score}, sort={sort}")
+
+    # If score is provided, filter by that score
+    if score:
+        scores = [score]
+    else:
+        scores = list(range(1, 6))
 
-        logger.info(f"Starting review fetch for {app_package}, count={count}, score={score}, sort={sort}")
+    # Split the requested count evenly across score buckets
+    per_score_count = max(1, -(-count // len(scores)))
+    logger.debug(f"Will fetch {per_score_count} reviews per score rating")
 
-        sort_order = Sort.MOST_RELEVANT if sort == 'most_relevant' else Sort.NEWEST
+    # Review IDs already collected, so no review is returned twice
+    seen_ids = set()
 
-        # If score is provided, filter by that score
-        if score:
-            scores = [score]
+    # First try with score filtering; the buckets are independent, so fetch them concurrently
+    def fetch_bucket(score_filter):
+        logger.debug(f"Fetching reviews for {app_package} with score {score_filter}")
+        try:
+            return _fetch_reviews_with_fallback(app_package, per_score_count, sort, score_filter), None
+        except ScraperError as e:
+            return [], e
+
+    workers = max(1, min(REVIEW_BUCKET_MAX_WORKERS, len(scores)))
+    if workers == 1:
+        bucket_results = [fetch_bucket(score_filter) for score_filter in scores]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            bucket_results = list(executor.map(fetch_bucket, scores))
+
+    # Merge in score order so the result doesn't depend on completion order
+    errors = []
+    for score_filter, (rvs, error) in zip(scores, bucket_results):
+        if error is not None:
+            logger.warning(f"Failed to fetch reviews for score {score_filter}: {str(error)}")
+            errors.append(error)
+        elif rvs:
+            logger.info(f"Found {len(rvs)} reviews for score {score_filter}")
+            for r in rvs:
+                if r['reviewId'] not in seen_ids:
+                    seen_ids.add(r['reviewId'])
+                    app_reviews.append(r)
         else:
-            scores = list(range(1, 6))
-
-        # Reduce reviews per score and add delay between requests
-        per_score_count = max(5, min(20, count // len(scores)))
-        logger.debug(f"Will fetch {per_score_count} reviews per score rating")
-
-        # If we can't get enough reviews with filtering, try without filtering
-        total_fetched = 0
-
-        # First try with score filtering
-        for score_filter in scores:
-            try:
-                logger.debug(f"Fetching reviews for {app_package} with score {score_filter}")
-
-                # Add more specific error handling for the reviews fetch
-                try:
-                    rvs, _ = reviews(  # _ to ignore continuation_token
-                        app_package,
-                        lang='id',  # Try Indonesian first
-                        country='id',
-                        sort=sort_order,
-                        count=per_score_count,
-                        filter_score_with=score_filter
-                    )
-
-                    if not rvs:
-                        logger.warning(f"No reviews found for score {score_filter} with lang=id")
-                        # Try with English as fallback
-                        try:
-                            rvs, _ = reviews(  # _ to ignore continuation_token
-                                app_package,
-                                lang='en',
-                                country='us',
-                                sort=sort_order,
-                                count=per_score_count,
-                                filter_score_with=score_filter
-                            )
-                        except Exception as e_fallback:
-                            logger.warning(f"Fallback to English also failed: {str(e_fallback)}")
-                            continue
-
-                except Exception as e:
-                    logger.error(f"Error in reviews API call: {str(e)}")
-                    # Try with English as fallback
-                    try:
-                        rvs, _ = reviews(  # _ to ignore continuation_token
-                            app_package,
-                            lang='en',
-                            country='us',
-                            sort=sort_order,
-                            count=per_score_count,
-                            filter_score_with=score_filter
-                        )
-                    except Exception as e_fallback:
-                        logger.warning(f"Fallback to English also failed: {str(e_fallback)}")
-                        continue
-
-                # Process the reviews
-                if rvs:
-                    logger.info(f"Found {len(rvs)} reviews for score {score_filter}")
-                    for r in rvs:
-                        if r and isinstance(r, dict):
-                            # Ensure all required fields exist
-                            r['sortOrder'] = 'most_relevant' if sort_order == Sort.MOST_RELEVANT else 'newest'
-                            r['appId'] = app_package
-
-                            # Ensure all required fields have valid values
-                            if 'reviewId' not in r or not r['reviewId']:
-                                r['reviewId'] = f"generated-{len(app_reviews)}-{int(time.time())}"
-
-                            if 'userName' not in r or not r['userName']:
-                                r['userName'] = "Anonymous"
-
-                            if 'score' not in r or not isinstance(r['score'], (int, float)):
-                                r['score'] = score_filter
-
-                            if 'content' not in r or not r['content']:
-                                r['content'] = ""
-
-                            if 'at' not in r:
-                                r['at'] = int(time.time() * 1000)  # Current time in milliseconds
-
-                            app_reviews.append(r)
-                            total_fetched += 1
-                else:
-                    logger.warning(f"No reviews found for score {score_filter} after fallback attempts")
-
-            except Exception as e:
-                logger.warning(f"Error fetching reviews for score {score_filter}: {str(e)}")
-                continue
+            logger.warning(f"No reviews found for score {score_filter} after fallback attempts")
 
-        # If we didn't get enough reviews with filtering, try without filtering
-        if total_fetched < count // 2:
-            logger.info(f"Only fetched {total_fetched} reviews with filtering, trying without filtering")
-            try:
-                # Try without score filtering
-                rvs, _ = reviews(  # _ to ignore continuation_token
-                    app_package,
-                    lang='id',
-                    country='id',
-                    sort=sort_order,
-                    count=count - total_fetched
-                )
+    # If every bucket failed, report the failure instead of returning an empty list
+    if len(errors) == len(scores):
+        logger.error(f"Error fetching reviews for app {app_package}: {str(errors[0])}")
+        raise errors[0]
 
-                if rvs:
-                    logger.info(f"Found {len(rvs)} additional reviews without filtering")
-                    for r in rvs:
-                        if r and isinstance(r, dict):
-                            # Ensure all required fields exist
-                            r['sortOrder'] = 'most_relevant' if sort_order == Sort.MOST_RELEVANT else 'newest'
-                            r['appId'] = app_package
-
-                            # Ensure all required fields have valid values
-                            if 'reviewId' not in r or not r['reviewId']:
-                                r['reviewId'] = f"generated-{len(app_reviews)}-{int(time.time())}"
-
-                            if 'userName' not in r or not r['userName']:
-                                r['userName'] = "Anonymous"
-
-                            if 'score' not in r or not isinstance(r['score'], (int, float)):
-                                r['score'] = 3  # Default to neutral
-
-                            if 'content' not in r or not r['content']:
-                                r['content'] = ""
-
-                            if 'at' not in r:
-                                r['at'] = int(time.time() * 1000)  # Current time in milliseconds
-
-                            app_reviews.append(r)
-            except Exception as e:
-                logger.warning(f"Error fetching additional reviews without filtering: {str(e)}")
-
-        # If we still don't have any reviews, create a dummy review
-        if not app_reviews:
-            logger.warning(f"No reviews found for {app_package}, creating dummy review")
-            dummy_review = {
-                'reviewId': f"dummy-{int(time.time())}",
-                'userName': "No Reviews Available",
-                'score': 0,
-                'content': "No reviews are currently available for this app.",
-                'at': int(time.time() * 1000),  # Current time in milliseconds
-                'sortOrder': sort,
-                'appId': app_package
-            }
-            app_reviews.append(dummy_review)
-
-    except Exception as e:
-        logger.error(f"Error fetching reviews for app {app_package}: {str(e)}")
-        # Create a dummy review instead of raising an exception
-        dummy_review = {
-            'reviewId': f"error-{int(time.time())}",
-            'userName': "Error Fetching Reviews",
-            'score': 0,
-            'content': f"An error occurred while fetching reviews: {str(e)}",
-            'at': int(time.time() * 1000),  # Current time in milliseconds
-            'sortOrder': sort,
-            'appId': app_package
-        }
-        app_reviews.append(dummy_review)
+    # If we didn't get enough reviews with filtering, top up without filtering
+    if len(app_reviews) < count and not score:
+        logger.info(f"Only fetched {len(app_reviews)} reviews with filtering, trying without filtering")
+        try:
+            added = 0
+            lang, country = _locale_order('reviews', app_package)[0]
+            for batch in iter_app_reviews(app_package, sort=sort, lang=lang, country=country):
+                for r in batch:
+                    if r['reviewId'] not in seen_ids:
+                        seen_ids.add(r['reviewId'])
+                        app_reviews.append(r)
+                        added += 1
+                if len(app_reviews) >= count:
+                    break
+            logger.info(f"Found {added} additional reviews without filtering")
+        except ScraperError as e:
+            logger.warning(f"Error fetching additional reviews without filtering: {str(e)}")
+
+    if not app_reviews:
+        logger.warning(f"No reviews found for {app_package}")
 
     logger.info(f"Returning {len(app_reviews[:count])} reviews for {app_package}")
     return app_reviews[:count]  # Ensure we don't exceed requested count
+
+def get_scraper_stats():
+    """
+    Get scraper statistics
+
+    Returns:
+        dict: Dictionary containing response cache, locale memory and transport statistics
+    """
+    with _locale_lock:
+        locale_stats = dict(_locale_stats)
+        locale_stats['remembered_packages'] = len(_locale_memory)
+
+    return {
+        'cache': response_cache.stats(),
+        'locale': locale_stats,
+        'transport': play_transport.stats()
+    }
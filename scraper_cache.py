@@ -0,0 +1,255 @@
+import atexit
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Cache settings, overridable through the environment
+CACHE_PATH = os.environ.get('PLAY_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'play_cache.db'))
+CACHE_ENABLED = os.environ.get('PLAY_CACHE_ENABLED', '1') != '0'
+METADATA_TTL = int(os.environ.get('PLAY_CACHE_METADATA_TTL', 24 * 60 * 60))  # App info changes daily
+REVIEWS_TTL = int(os.environ.get('PLAY_CACHE_REVIEWS_TTL', 6 * 60 * 60))
+COUNTER_FLUSH_INTERVAL = float(os.environ.get('PLAY_CACHE_COUNTER_FLUSH_INTERVAL', 30))  # Seconds
+PURGE_INTERVAL = float(os.environ.get('PLAY_CACHE_PURGE_INTERVAL', 60 * 60))  # Seconds between purges of expired entries
+
+class ResponseCache:
+    """
+    Persistent cache for Google Play Store responses backed by SQLite
+
+    The database file is shared by every process that points at it (e.g. all
+    gunicorn workers) and survives restarts. Entries live in namespaces with
+    their own TTLs. Hit/miss counters are kept in memory so reads never write
+    to the database, and are added to the shared counters table every
+    `COUNTER_FLUSH_INTERVAL` seconds, on stats() and at exit, so the totals
+    reflect all workers. Expired entries are deleted by set() at most every
+    `purge_interval` seconds, so the file doesn't grow without bound.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttls=None, purge_interval=PURGE_INTERVAL):
+        """
+        Args:
+            path (str): Path of the SQLite database file
+            ttls (dict, optional): Mapping of namespace to TTL in seconds
+            purge_interval (float): Seconds between purges of expired entries
+        """
+        self.path = path
+        self.ttls = ttls or {'metadata': METADATA_TTL, 'reviews': REVIEWS_TTL}
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._counts = {}
+        self._counts_pid = os.getpid()
+        self._counts_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.purge_interval = purge_interval
+        # Purge on the first write, entries may have expired since the last run
+        self._last_purge = None
+        self._purge_lock = threading.Lock()
+        atexit.register(self.flush_counters)
+
+    def _connect(self):
+        """Return the calling thread's connection, creating the schema on first use"""
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork, so forked workers open their own
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    with conn:
+                        conn.execute(
+                            'CREATE TABLE IF NOT EXISTS entries ('
+                            'namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, '
+                            'expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))'
+                        )
+                        conn.execute(
+                            'CREATE TABLE IF NOT EXISTS counters ('
+                            'name TEXT PRIMARY KEY, value INTEGER NOT NULL DEFAULT 0)'
+                        )
+                    self._initialized = True
+        return conn
+
+    def _count(self, name):
+        """Count a hit or miss in memory, flushing the counts once the flush interval has passed"""
+        with self._counts_lock:
+            # Counts inherited across a fork belong to the parent process
+            if self._counts_pid != os.getpid():
+                self._counts = {}
+                self._counts_pid = os.getpid()
+            self._counts[name] = self._counts.get(name, 0) + 1
+            due = time.monotonic() - self._last_flush >= COUNTER_FLUSH_INTERVAL
+        if due:
+            self.flush_counters()
+
+    def flush_counters(self):
+        """Add this process's pending hit/miss counts to the shared counters table"""
+        with self._counts_lock:
+            if self._counts_pid != os.getpid():
+                self._counts = {}
+                self._counts_pid = os.getpid()
+            counts, self._counts = self._counts, {}
+            self._last_flush = time.monotonic()
+        if not counts:
+            return
+
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    'INSERT INTO counters (name, value) VALUES (?, ?) '
+                    'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                    list(counts.items())
+                )
+        except Exception as e:
+            logger.warning(f"Error flushing cache counters: {str(e)}")
+            # Keep the counts for the next flush
+            with self._counts_lock:
+                for name, value in counts.items():
+                    self._counts[name] = self._counts.get(name, 0) + value
+
+    def get(self, namespace, key):
+        """
+        Look up a cached value
+
+        Args:
+            namespace (str): Cache namespace, e.g. 'metadata' or 'reviews'
+            key (str): Cache key within the namespace
+
+        Returns:
+            tuple: (hit, value) where value is None on a miss
+        """
+        hit = False
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?',
+                (namespace, key)
+            ).fetchone()
+
+            # Expired entries are overwritten by set() or removed by purge_expired()
+            hit = row is not None and row[1] > time.time()
+            if hit:
+                logger.debug(f"Cache hit for {namespace}:{key}")
+                value = pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Error reading cache entry {namespace}:{key}: {str(e)}")
+            hit = False
+
+        self._count(f"{namespace}.{'hits' if hit else 'misses'}")
+        if hit:
+            return True, value
+        return False, None
+
+    def set(self, namespace, key, value, ttl=None):
+        """
+        Store a value in the cache
+
+        Args:
+            namespace (str): Cache namespace, e.g. 'metadata' or 'reviews'
+            key (str): Cache key within the namespace
+            value: Picklable value to store
+            ttl (int, optional): TTL in seconds, defaults to the namespace TTL
+        """
+        if ttl is None:
+            ttl = self.ttls.get(namespace, METADATA_TTL)
+
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                    (namespace, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time() + ttl)
+                )
+        except Exception as e:
+            logger.warning(f"Error writing cache entry {namespace}:{key}: {str(e)}")
+
+        self._purge_if_due()
+
+    def _purge_if_due(self):
+        """Purge expired entries if the purge interval has passed since the last purge"""
+        with self._purge_lock:
+            now = time.monotonic()
+            if self._last_purge is not None and now - self._last_purge < self.purge_interval:
+                return
+            self._last_purge = now
+        purged = self.purge_expired()
+        if purged:
+            logger.debug(f"Purged {purged} expired cache entries")
+
+    def purge_expired(self):
+        """
+        Delete all expired entries
+
+        Returns:
+            int: Number of entries deleted
+        """
+        try:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute('DELETE FROM entries WHERE expires_at <= ?', (time.time(),))
+            return cursor.rowcount
+        except Exception as e:
+            logger.warning(f"Error purging expired cache entries: {str(e)}")
+            return 0
+
+    def stats(self):
+        """
+        Get cache statistics shared by all processes using the cache file
+
+        Flushes this process's pending counts first; other processes' counts
+        lag by up to COUNTER_FLUSH_INTERVAL seconds.
+
+        Returns:
+            dict: Hit/miss counters, hit ratio and entry count per namespace
+        """
+        stats = {'enabled': True, 'path': self.path, 'namespaces': {}}
+        self.flush_counters()
+        try:
+            conn = self._connect()
+            counters = dict(conn.execute('SELECT name, value FROM counters').fetchall())
+            entries = dict(conn.execute(
+                'SELECT namespace, COUNT(*) FROM entries WHERE expires_at > ? GROUP BY namespace',
+                (time.time(),)
+            ).fetchall())
+
+            for namespace, ttl in self.ttls.items():
+                hits = counters.get(f"{namespace}.hits", 0)
+                misses = counters.get(f"{namespace}.misses", 0)
+                stats['namespaces'][namespace] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_ratio': round(hits / (hits + misses), 3) if hits + misses > 0 else 0,
+                    'entries': entries.get(namespace, 0),
+                    'ttl_seconds': ttl
+                }
+        except Exception as e:
+            logger.warning(f"Error reading cache statistics: {str(e)}")
+        return stats
+
+class NullCache:
+    """Cache stand-in used when caching is disabled"""
+
+    def get(self, namespace, key):
+        return False, None
+
+    def set(self, namespace, key, value, ttl=None):
+        pass
+
+    def purge_expired(self):
+        return 0
+
+    def stats(self):
+        return {'enabled': False, 'namespaces': {}}
+
+response_cache = ResponseCache() if CACHE_ENABLED else NullCache()
@@ -0,0 +1,252 @@
+import datetime
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import google_play_scraper
+from google_play_scraper import Sort
+from google_play_scraper.constants.element import ElementSpecs
+from google_play_scraper.constants.request import Formats
+from google_play_scraper.exceptions import NotFoundError
+from google_play_scraper.features.reviews import MAX_COUNT_EACH_FETCH, _ContinuationToken, _fetch_review_items
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Backend settings, overridable through the environment
+BACKEND_MODE = os.environ.get('PLAY_BACKEND', 'live')  # 'live', 'record' or 'replay'
+FIXTURES_DIR = os.environ.get('PLAY_FIXTURES_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'play'))
+REPLAY_LATENCY_MS = float(os.environ.get('PLAY_REPLAY_LATENCY_MS', 0))
+REPLAY_JITTER_MS = float(os.environ.get('PLAY_REPLAY_JITTER_MS', 0))
+REPLAY_ERROR_RATE = float(os.environ.get('PLAY_REPLAY_ERROR_RATE', 0))
+
+class ReplayInjectedError(Exception):
+    """Transient error raised on purpose by the replay backend"""
+
+class LiveBackend:
+    """Backend that calls the real Google Play Store"""
+
+    def app(self, app_id, lang='en', country='us'):
+        return google_play_scraper.app(app_id, lang=lang, country=country)
+
+    def reviews(self, app_id, lang='en', country='us', sort=Sort.NEWEST, count=100,
+                filter_score_with=None, continuation_token=None):
+        """
+        Fetch one page of reviews
+
+        google_play_scraper.reviews() swallows request errors and returns what
+        it has with no continuation token, which is indistinguishable from the
+        end of the stream. This fetches a single page with the library's
+        lower-level helper instead, so failures raise and reach the
+        transport's retries, rate limiter and circuit breaker.
+        """
+        filter_device_with = None
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            lang = continuation_token.lang
+            country = continuation_token.country
+            sort = continuation_token.sort
+            count = continuation_token.count
+            filter_score_with = continuation_token.filter_score_with
+            filter_device_with = continuation_token.filter_device_with
+            token = continuation_token.token
+        else:
+            sort = getattr(sort, 'value', sort)
+            token = None
+
+        items, token = _fetch_review_items(
+            Formats.Reviews.build(lang=lang, country=country),
+            app_id,
+            sort,
+            min(count, MAX_COUNT_EACH_FETCH),
+            filter_score_with,
+            filter_device_with,
+            token
+        )
+        if isinstance(token, list):
+            # The last page carries a list instead of a token
+            token = None
+
+        result = [{k: spec.extract_content(item) for k, spec in ElementSpecs.Review.items()} for item in items]
+        return result, _ContinuationToken(token, lang, country, sort, count, filter_score_with, filter_device_with)
+
+def _to_json(value):
+    """Convert a response to JSON-compatible data, tagging datetimes"""
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    return value
+
+def _from_json(value):
+    """Reverse _to_json"""
+    if isinstance(value, dict):
+        if set(value) == {'__datetime__'}:
+            return datetime.datetime.fromisoformat(value['__datetime__'])
+        return {k: _from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    return value
+
+def _token_to_json(token):
+    return {slot: getattr(token, slot) for slot in _ContinuationToken.__slots__}
+
+def _token_from_json(data):
+    return _ContinuationToken(**data)
+
+def _app_key(app_id, lang, country):
+    return {'call': 'app', 'app_id': app_id, 'lang': lang, 'country': country}
+
+def _reviews_key(app_id, lang, country, sort, count, filter_score_with, continuation_token):
+    # Follow-up pages are identified by the token alone; the token carries the other parameters
+    if continuation_token is not None:
+        return {'call': 'reviews', 'app_id': app_id, 'token': continuation_token.token}
+    return {
+        'call': 'reviews',
+        'app_id': app_id,
+        'lang': lang,
+        'country': country,
+        'sort': sort.value if isinstance(sort, Sort) else sort,
+        'count': count,
+        'filter_score_with': filter_score_with
+    }
+
+def _fixture_path(fixtures_dir, key):
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(fixtures_dir, f"{key['call']}-{key['app_id']}-{digest}.json")
+
+class RecordingBackend:
+    """
+    Backend that forwards calls to another backend and saves each response as a fixture
+
+    One JSON file is written per distinct request, so a recording session can
+    later be served by ReplayBackend without network access.
+    """
+
+    def __init__(self, inner=None, fixtures_dir=FIXTURES_DIR):
+        """
+        Args:
+            inner (object, optional): Backend to record, defaults to LiveBackend
+            fixtures_dir (str): Directory to write fixture files to
+        """
+        self.inner = inner or LiveBackend()
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def _save(self, key, payload):
+        path = _fixture_path(self.fixtures_dir, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'request': key, **payload}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # Atomic, so concurrent recorders never leave half-written files
+        logger.debug(f"Recorded fixture {os.path.basename(path)}")
+
+    def app(self, app_id, lang='en', country='us'):
+        key = _app_key(app_id, lang, country)
+        try:
+            result = self.inner.app(app_id, lang=lang, country=country)
+        except NotFoundError as e:
+            # Missing apps are a stable answer, so they are worth replaying too
+            self._save(key, {'error': 'NotFoundError', 'message': str(e)})
+            raise
+        self._save(key, {'response': _to_json(result)})
+        return result
+
+    def reviews(self, app_id, lang='en', country='us', sort=Sort.NEWEST, count=100,
+                filter_score_with=None, continuation_token=None):
+        key = _reviews_key(app_id, lang, country, sort, count, filter_score_with, continuation_token)
+        result, token = self.inner.reviews(app_id, lang=lang, country=country, sort=sort, count=count,
+                                           filter_score_with=filter_score_with,
+                                           continuation_token=continuation_token)
+        self._save(key, {'response': _to_json(result), 'continuation_token': _token_to_json(token)})
+        return result, token
+
+class ReplayBackend:
+    """
+    Backend that serves recorded fixtures with configurable latency and error injection
+
+    Requests without a fixture behave like an unknown app: app() raises
+    NotFoundError and reviews() returns no reviews.
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency_ms=REPLAY_LATENCY_MS, jitter_ms=REPLAY_JITTER_MS,
+                 error_rate=REPLAY_ERROR_RATE, seed=None):
+        """
+        Args:
+            fixtures_dir (str): Directory to read fixture files from
+            latency_ms (float): Latency added to every call, in milliseconds
+            jitter_ms (float): Maximum random latency added on top, in milliseconds
+            error_rate (float): Fraction of calls that raise ReplayInjectedError
+            seed (int, optional): Seed for the latency and error random generator
+        """
+        self.fixtures_dir = fixtures_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._fixtures = {}
+        self._fixtures_lock = threading.Lock()
+
+    def _load(self, key):
+        path = _fixture_path(self.fixtures_dir, key)
+        with self._fixtures_lock:
+            if path not in self._fixtures:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        self._fixtures[path] = json.load(f)
+                except FileNotFoundError:
+                    logger.warning(f"No fixture recorded for {key}")
+                    self._fixtures[path] = None
+            return self._fixtures[path]
+
+    def _simulate_network(self):
+        with self._random_lock:
+            delay_ms = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        if fail:
+            raise ReplayInjectedError("Injected replay error")
+
+    def app(self, app_id, lang='en', country='us'):
+        self._simulate_network()
+        fixture = self._load(_app_key(app_id, lang, country))
+        if fixture is None or fixture.get('error') == 'NotFoundError':
+            raise NotFoundError("App not found(404).")
+        return _from_json(fixture['response'])
+
+    def reviews(self, app_id, lang='en', country='us', sort=Sort.NEWEST, count=100,
+                filter_score_with=None, continuation_token=None):
+        self._simulate_network()
+        fixture = self._load(_reviews_key(app_id, lang, country, sort, count, filter_score_with,
+                                          continuation_token))
+        if fixture is None:
+            return [], _ContinuationToken(None, lang, country, sort, count, filter_score_with, None)
+        return _from_json(fixture['response']), _token_from_json(fixture['continuation_token'])
+
+def create_play_backend(mode=BACKEND_MODE, fixtures_dir=FIXTURES_DIR):
+    """
+    Create the Play Store backend for a mode
+
+    Args:
+        mode (str): 'live', 'record' or 'replay'
+        fixtures_dir (str): Fixture directory used by the record and replay modes
+
+    Returns:
+        object: Backend with app() and reviews() methods
+    """
+    if mode == 'record':
+        logger.info(f"Recording Play Store responses to {fixtures_dir}")
+        return RecordingBackend(fixtures_dir=fixtures_dir)
+    if mode == 'replay':
+        logger.info(f"Replaying Play Store responses from {fixtures_dir}")
+        return ReplayBackend(fixtures_dir=fixtures_dir)
+    return LiveBackend()
@@ -0,0 +1,245 @@
+import logging
+import os
+import random
+import threading
+import time
+from google_play_scraper.exceptions import NotFoundError
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Transport settings, overridable through the environment
+INITIAL_RATE = float(os.environ.get('SCRAPER_RATE', 5))  # Requests per second
+MAX_RATE = float(os.environ.get('SCRAPER_MAX_RATE', 10))
+MIN_RATE = float(os.environ.get('SCRAPER_MIN_RATE', 0.5))
+BURST = int(os.environ.get('SCRAPER_BURST', 10))
+MAX_RETRIES = int(os.environ.get('SCRAPER_MAX_RETRIES', 3))
+BACKOFF_BASE = float(os.environ.get('SCRAPER_BACKOFF_BASE', 0.5))  # Seconds
+BACKOFF_MAX = float(os.environ.get('SCRAPER_BACKOFF_MAX', 8))
+BREAKER_THRESHOLD = int(os.environ.get('SCRAPER_BREAKER_THRESHOLD', 5))
+BREAKER_RESET = float(os.environ.get('SCRAPER_BREAKER_RESET', 60))  # Seconds
+
+class ScraperError(Exception):
+    """Base class for typed Play Store scraping failures"""
+
+    def __init__(self, message, package=None):
+        super().__init__(message)
+        self.package = package
+
+class CircuitOpenError(ScraperError):
+    """Raised when calls for a package are blocked by its open circuit breaker"""
+
+class RetriesExhaustedError(ScraperError):
+    """Raised when a call keeps failing after all retries"""
+
+class AppNotFoundError(ScraperError):
+    """Raised when the Play Store has no such app (or not in the requested locale)"""
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter that adapts its rate to upstream throttling
+
+    The rate is halved whenever a call fails and grows back additively on
+    success (AIMD), so bulk refreshes settle near the highest rate the Play
+    Store tolerates.
+    """
+
+    def __init__(self, rate=INITIAL_RATE, burst=BURST, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        """
+        Args:
+            rate (float): Initial rate in requests per second
+            burst (int): Bucket capacity
+            min_rate (float): Lowest rate the limiter will back off to
+            max_rate (float): Highest rate the limiter will grow to
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        """Additively increase the rate after a successful call"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def on_throttle(self):
+        """Halve the rate after a failed or throttled call"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            logger.debug(f"Rate limiter backed off to {self.rate:.2f} requests/second")
+
+class CircuitBreaker:
+    """
+    Per-package circuit breaker
+
+    After `threshold` consecutive failed calls for a package its circuit
+    opens and calls fail fast. After `reset_timeout` seconds one trial call
+    is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        """
+        Args:
+            threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds before a trial call is allowed
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    def allow(self, package):
+        """
+        Check whether a call for a package may proceed
+
+        Args:
+            package (str): App package name
+
+        Returns:
+            bool: False if the circuit is open
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(package)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                # Half-open: let one trial call through and re-arm the timer
+                self._opened_at[package] = time.monotonic()
+                return True
+            return False
+
+    def record_success(self, package):
+        """Close the circuit for a package"""
+        with self._lock:
+            self._failures.pop(package, None)
+            self._opened_at.pop(package, None)
+
+    def record_failure(self, package):
+        """Count a failed call and open the circuit once the threshold is reached"""
+        with self._lock:
+            self._failures[package] = self._failures.get(package, 0) + 1
+            if self._failures[package] >= self.threshold:
+                if package not in self._opened_at:
+                    logger.warning(f"Opening circuit for {package} after {self._failures[package]} failures")
+                self._opened_at[package] = time.monotonic()
+
+    def open_circuits(self):
+        """
+        Returns:
+            list: Packages whose circuit is currently open
+        """
+        with self._lock:
+            return sorted(self._opened_at)
+
+class PlayTransport:
+    """
+    Wraps Play Store calls with rate limiting, jittered retries and circuit breaking
+    """
+
+    def __init__(self, rate_limiter=None, breaker=None, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        """
+        Args:
+            rate_limiter (AdaptiveRateLimiter, optional): Shared rate limiter
+            breaker (CircuitBreaker, optional): Per-package circuit breaker
+            max_retries (int): Retries after the first attempt
+            backoff_base (float): Base delay of the exponential backoff, in seconds
+            backoff_max (float): Maximum backoff delay, in seconds
+        """
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._stats = {'calls': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def call(self, fn, package, *args, **kwargs):
+        """
+        Call a google_play_scraper function for a package
+
+        Args:
+            fn (callable): Function taking the package as first argument
+            package (str): App package name
+            *args: Extra positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The return value of fn
+
+        Raises:
+            CircuitOpenError: If the package's circuit is open
+            RetriesExhaustedError: If every attempt failed
+            AppNotFoundError: If the package doesn't exist (not retried)
+        """
+        if not self.breaker.allow(package):
+            self._count('rejected')
+            raise CircuitOpenError(f"Circuit open for {package}, not calling the Play Store", package)
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            self._count('calls')
+            try:
+                result = fn(package, *args, **kwargs)
+            except NotFoundError as e:
+                # A missing app (or locale) is an answer, not a transport failure
+                self.breaker.record_success(package)
+                raise AppNotFoundError(f"App {package} not found on the Play Store", package) from e
+            except Exception as e:
+                last_error = e
+                self.rate_limiter.on_throttle()
+                if attempt < self.max_retries:
+                    self._count('retries')
+                    # Full jitter keeps concurrent retries from synchronizing
+                    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                    logger.warning(f"Play Store call for {package} failed ({str(e)}), retrying in {delay:.2f}s")
+                    time.sleep(delay)
+                continue
+
+            self.rate_limiter.on_success()
+            self.breaker.record_success(package)
+            return result
+
+        self._count('failures')
+        self.breaker.record_failure(package)
+        raise RetriesExhaustedError(
+            f"Play Store call for {package} failed after {self.max_retries + 1} attempts: {str(last_error)}",
+            package
+        ) from last_error
+
+    def stats(self):
+        """
+        Returns:
+            dict: Call counters, current rate and open circuits
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['current_rate'] = round(self.rate_limiter.rate, 2)
+        stats['open_circuits'] = self.breaker.open_circuits()
+        return stats
+
+play_transport = PlayTransport()
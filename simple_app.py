@@ -5,7 +5,7 @@ import io
 import pandas as pd
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, send_file, Response
 import datetime
-from scraper import get_app_info, get_app_reviews
+from scraper import get_app_info, get_app_reviews, get_scraper_stats
 from models import db, ScrapedApp, ScrapedReview
 from aspect_analysis import extract_aspects, generate_aspect_summary
 from analysis import calculate_tf_idf
@@ -253,7 +253,19 @@ def fetch_app_reviews():
         # Step 2: Save reviews to database - with detailed error handling
         try:
             with app.app_context():
+                # Skip reviews stored by an earlier fetch (and repeats within this
+                # batch) so the (app_id, review_id) unique constraint is never hit
+                stored_ids = {
+                    row.review_id for row in
+                    ScrapedReview.query.with_entities(ScrapedReview.review_id).filter_by(app_id=app_id)
+                }
+                added = 0
                 for review in reviews:
+                    review_id = review.get('reviewId', '')
+                    if review_id in stored_ids:
+                        continue
+                    stored_ids.add(review_id)
+
                     # Convert timestamp to datetime for database storage
                     timestamp_ms = review.get('at')
                     if timestamp_ms is None:
@@ -272,21 +284,23 @@ def fetch_app_reviews():
                     try:
                         new_review = ScrapedReview(
                             app_id = app_id,
-                            review_id = review.get('reviewId', ''),
+                            review_id = review_id,
                             user_name = review.get('userName', 'Anonymous'),
                             rating = review.get('score', 0),
                             text = review.get('content', ''),
                             date = date_obj
                         )
                         db.session.add(new_review)
+                        added += 1
                     except Exception as db_error:
                         logger.error(f"Error adding review to database: {str(db_error)}")
                         # Continue with next review instead of failing completely
                         continue
 
                 db.session.commit()
-                logger.debug("Reviews saved to database")
+                logger.debug(f"Saved {added} new reviews to database ({len(reviews) - added} already stored)")
         except Exception as db_error:
+            db.session.rollback()
             logger.error(f"Database error: {str(db_error)}")
             # Continue processing even if database save fails
 
@@ -709,6 +723,14 @@ def fetch_aspect_analysis():
             'message': f"Failed to perform aspect analysis: {str(e)}"
         }), 500
 
+@app.route('/scraper_stats')
+def scraper_stats():
+    """API endpoint exposing Play Store response cache statistics"""
+    return jsonify({
+        'status': 'success',
+        'stats': get_scraper_stats()
+    })
+
 @app.route('/preprocessing')
 def preprocessing():
     """Page to show the preprocessing step by step"""
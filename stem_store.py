@@ -0,0 +1,181 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Stem store settings, overridable through the environment
+STEM_STORE_PATH = os.environ.get('STEM_STORE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stem_cache.db'))
+STEM_STORE_ENABLED = os.environ.get('STEM_STORE_ENABLED', '1') != '0'
+STEM_LRU_SIZE = int(os.environ.get('STEM_LRU_SIZE', 50000))
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK_SIZE = 500
+
+class StemStore:
+    """
+    Persistent token -> stem dictionary with an in-process LRU in front
+
+    The SQLite file is shared by all processes that point at it, so every
+    gunicorn worker reads the stems the others have computed, and the
+    dictionary survives restarts. Stems are keyed by stemmer version as well
+    as token, so upgrading Sastrawi or its dictionary never serves stems the
+    old stemmer computed; call use_version() before looking stems up.
+    """
+
+    def __init__(self, path=STEM_STORE_PATH, lru_size=STEM_LRU_SIZE):
+        """
+        Args:
+            path (str): Path of the SQLite database file
+            lru_size (int): Maximum number of stems kept in process memory
+        """
+        self.path = path
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._stats = {'lru_hits': 0, 'store_hits': 0, 'misses': 0}
+        self.version = ''
+
+    def _connect(self):
+        """Return the calling thread's connection, creating the schema on first use"""
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork, so forked workers open their own
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    with conn:
+                        # Stems of the unversioned layout can't be attributed to a stemmer
+                        conn.execute('DROP TABLE IF EXISTS stems')
+                        conn.execute(
+                            'CREATE TABLE IF NOT EXISTS versioned_stems ('
+                            'version TEXT NOT NULL, token TEXT NOT NULL, stem TEXT NOT NULL, '
+                            'PRIMARY KEY (version, token))'
+                        )
+                    self._initialized = True
+        return conn
+
+    def use_version(self, version):
+        """
+        Set the stemmer version that stems are looked up and stored under
+
+        Args:
+            version (str): Stemmer version, e.g. from analysis.stemmer_version()
+        """
+        with self._lru_lock:
+            if version != self.version:
+                self._lru.clear()
+                self.version = version
+
+    def _remember(self, mapping):
+        """Add stems to the LRU, evicting the least recently used ones"""
+        with self._lru_lock:
+            for token, stem in mapping.items():
+                self._lru[token] = stem
+                self._lru.move_to_end(token)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def lookup(self, tokens):
+        """
+        Look up known stems, first in process memory, then in the shared store
+
+        Args:
+            tokens (iterable): Tokens to look up
+
+        Returns:
+            dict: Mapping of the tokens that have a known stem
+        """
+        found = {}
+        missing = []
+        with self._lru_lock:
+            for token in tokens:
+                stem = self._lru.get(token)
+                if stem is None:
+                    missing.append(token)
+                else:
+                    self._lru.move_to_end(token)
+                    found[token] = stem
+            self._stats['lru_hits'] += len(found)
+
+        if missing:
+            from_store = {}
+            try:
+                conn = self._connect()
+                for start in range(0, len(missing), _QUERY_CHUNK_SIZE):
+                    chunk = missing[start:start + _QUERY_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    from_store.update(conn.execute(
+                        f'SELECT token, stem FROM versioned_stems WHERE version = ? AND token IN ({placeholders})',
+                        [self.version] + chunk
+                    ).fetchall())
+            except Exception as e:
+                logger.warning(f"Error reading stem store: {str(e)}")
+
+            self._remember(from_store)
+            found.update(from_store)
+            with self._lru_lock:
+                self._stats['store_hits'] += len(from_store)
+                self._stats['misses'] += len(missing) - len(from_store)
+
+        return found
+
+    def add(self, mapping):
+        """
+        Store newly computed stems
+
+        Args:
+            mapping (dict): Mapping of token to stem
+        """
+        if not mapping:
+            return
+
+        self._remember(mapping)
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO versioned_stems (version, token, stem) VALUES (?, ?, ?)',
+                    [(self.version, token, stem) for token, stem in mapping.items()]
+                )
+        except Exception as e:
+            logger.warning(f"Error writing stem store: {str(e)}")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Lookup counters for this process and the LRU size
+        """
+        with self._lru_lock:
+            return {'enabled': True, 'path': self.path, 'version': self.version, 'lru_entries': len(self._lru),
+                    **self._stats}
+
+class NullStemStore:
+    """Stem store stand-in used when the persistent store is disabled"""
+
+    def use_version(self, version):
+        pass
+
+    def lookup(self, tokens):
+        return {}
+
+    def add(self, mapping):
+        pass
+
+    def stats(self):
+        return {'enabled': False}
+
+stem_store = StemStore() if STEM_STORE_ENABLED else NullStemStore()
@@ -0,0 +1,69 @@
+import json
+import random
+
+import pytest
+
+from aspect_analysis import AspectAggregate, aggregate_aspects, extract_aspects
+
+DICTIONARY = {
+    'performance': ['lambat', 'crash'],
+    'transaction': ['transfer', 'bayar']
+}
+
+REVIEWS = [
+    {'reviewId': 'r1', 'content': 'Transfer lambat', 'sentiment_score': -0.6},
+    {'reviewId': 'r2', 'content': 'bayar cepat', 'sentiment_score': 0.7},
+    {'reviewId': 'r3', 'content': '', 'sentiment_score': 0.0},
+    {'reviewId': 'r4', 'content': '   ', 'sentiment_score': 0.0},
+    {'reviewId': 'r5', 'sentiment_score': 0.0},
+    {'reviewId': 'r6', 'content': 'sering crash', 'sentiment_score': 0.0},
+]
+
+def test_empty_reviews_are_skipped_by_every_path():
+    aggregate = aggregate_aspects(REVIEWS, DICTIONARY)
+    extracted = extract_aspects(REVIEWS, DICTIONARY)
+    assert aggregate.review_count == 3
+    assert aggregate.finalize() == extracted['aspects']
+    assert [review['review_id'] for review in extracted['review_aspects']] == ['r1', 'r2', 'r6']
+
+WORDS = ['transfer', 'lambat', 'crash', 'bayar', 'cepat', 'bagus', 'aplikasi', 'tidak']
+
+def random_reviews(rng, count):
+    # Scores on a quarter grid keep sentiment sums exact, whatever order they are added in
+    return [{
+        'content': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 6))),
+        'sentiment_score': rng.randint(-4, 4) / 4
+    } for _ in range(count)]
+
+def aggregate(reviews):
+    return aggregate_aspects(reviews, DICTIONARY, threshold=0.1)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_merge_equals_aggregating_the_combined_input(seed):
+    rng = random.Random(seed)
+    reviews = random_reviews(rng, rng.randint(0, 60))
+    split = rng.randint(0, len(reviews))
+    a, b = reviews[:split], reviews[split:]
+    assert (aggregate(a) + aggregate(b)).to_dict() == aggregate(reviews).to_dict()
+
+@pytest.mark.parametrize('seed', range(20))
+def test_merge_is_associative_and_commutative(seed):
+    rng = random.Random(seed)
+    x, y, z = (aggregate(random_reviews(rng, rng.randint(0, 30))) for _ in range(3))
+    assert ((x + y) + z).to_dict() == (x + (y + z)).to_dict()
+    assert (x + y).to_dict() == (y + x).to_dict()
+    assert AspectAggregate.merge_all([z, x, y]).to_dict() == ((x + y) + z).to_dict()
+    assert (x + AspectAggregate()).to_dict() == x.to_dict()
+
+def test_merge_does_not_modify_its_operands():
+    rng = random.Random(0)
+    x, y = aggregate(random_reviews(rng, 20)), aggregate(random_reviews(rng, 20))
+    before = json.dumps([x.to_dict(), y.to_dict()], sort_keys=True)
+    x + y
+    assert json.dumps([x.to_dict(), y.to_dict()], sort_keys=True) == before
+
+def test_serialization_round_trip_merges_the_same():
+    rng = random.Random(1)
+    parts = [aggregate(random_reviews(rng, 25)) for _ in range(5)]
+    stored = [AspectAggregate.from_dict(json.loads(json.dumps(part.to_dict()))) for part in parts]
+    assert AspectAggregate.merge_all(stored).finalize() == AspectAggregate.merge_all(parts).finalize()
@@ -0,0 +1,105 @@
+import pytest
+
+from aspect_matcher import AspectMatcher, get_aspect_matcher, inflection_bases
+
+BANKING = {
+    'ui': ['ui', 'tampilan', 'desain'],
+    'performance': ['slow', 'lag', 'crash', 'cepat', 'lambat', 'loading'],
+    'security': ['aman', 'pin', 'otp'],
+    'features': ['feature', 'fitur'],
+    'usability': ['user-friendly', 'mudah', 'sulit'],
+    'customer_service': ['customer service', 'service', 'cs', 'call center'],
+    'transaction': ['transfer', 'payment', 'pembayaran', 'kirim', 'bill'],
+    'reliability': ['error', 'bug', 'issue', 'masalah'],
+    'ads': ['ad', 'ads']
+}
+
+class ExactTokenMatcher(AspectMatcher):
+    """The matcher without inflection handling, as shipped before base forms were added"""
+
+    def _base_form(self, token):
+        return token
+
+# Representative reviews with the aspects a reader would tag them with
+LABELLED_REVIEWS = [
+    ("Fiturnya lengkap tapi loadingnya lama", {'features', 'performance'}),
+    ("Aplikasinya sering crash waktu transfer", {'performance', 'transaction'}),
+    ("Uang sudah ditransfer tapi belum masuk", {'transaction'}),
+    ("Pembayarannya gagal terus, masalahnya tidak selesai", {'transaction', 'reliability'}),
+    ("Transfers keep failing and the app crashes", {'transaction', 'performance'}),
+    ("Too many bugs and issues since the update", {'reliability'}),
+    ("Bills and payments are easy to track", {'transaction'}),
+    ("Tampilannya bagus, desainnya rapi", {'ui'}),
+    ("Keamanan oke, pinnya mudah diingat", {'security', 'usability'}),
+    ("CS-nya lambat membalas", {'customer_service', 'performance'}),
+    ("Aplikasi terlambat sekali dibuka", {'performance'}),
+    ("Kenapa sulitlah login di hp saya", {'usability'}),
+    ("Customer services never answer", {'customer_service'}),
+    ("Pengiriman OTP-nya lama, dikirim ulang juga tidak masuk", {'security', 'transaction'}),
+    ("Great features, very user-friendly", {'features', 'usability'}),
+]
+
+# Tokens that merely contain a keyword must not be tagged
+NEGATIVE_REVIEWS = [
+    "Tidak ada yang salah, hanya terus dipakai",
+    "Saya suka banget, semuanya oke",
+    "The bus was late",
+]
+
+def recall(matcher):
+    expected = sum(len(aspects) for _, aspects in LABELLED_REVIEWS)
+    found = sum(len(aspects & set(matcher.find(text))) for text, aspects in LABELLED_REVIEWS)
+    return found / expected
+
+def test_inflected_forms_recall():
+    exact = recall(ExactTokenMatcher(BANKING))
+    inflected = recall(AspectMatcher(BANKING))
+    assert exact < 0.6
+    assert inflected == 1.0
+
+@pytest.mark.parametrize('text, aspects', LABELLED_REVIEWS)
+def test_labelled_review(text, aspects):
+    assert set(AspectMatcher(BANKING).find(text)) == aspects
+
+@pytest.mark.parametrize('text', NEGATIVE_REVIEWS)
+def test_no_substring_matches(text):
+    assert AspectMatcher(BANKING).find(text) == {}
+
+def test_inflection_bases():
+    assert inflection_bases('fiturnya') == ['fitur']
+    assert 'lambat' in inflection_bases('terlambat')
+    assert 'transfer' in inflection_bases('ditransfernya')
+    assert 'story' in inflection_bases('stories')
+    assert 'fee' in inflection_bases('fees')
+    assert inflection_bases('class') == []
+
+def test_overlapping_keywords():
+    matcher = AspectMatcher({'a': ['b c', 'a b', 'b'], 'z': ['a b c d']})
+    assert matcher.find('x a b c y') == {'a': ['b c', 'a b', 'b']}
+    assert matcher.find('a b c d') == {'a': ['b c', 'a b', 'b'], 'z': ['a b c d']}
+
+def test_failure_links_restart_partial_matches():
+    matcher = AspectMatcher({'a': ['call center'], 'b': ['center point']})
+    assert matcher.find('call call center point') == {'a': ['call center'], 'b': ['center point']}
+    assert matcher.find('call the center') == {}
+
+def test_multi_word_keywords_match_across_separators():
+    matcher = AspectMatcher(BANKING)
+    for text in ('very user-friendly', 'very user friendly', 'User -- Friendly!'):
+        assert matcher.find(text) == {'usability': ['user-friendly']}
+    assert matcher.find('the customer  service team') == {'customer_service': ['customer service', 'service']}
+
+def test_keywords_are_reported_in_dictionary_order():
+    matcher = AspectMatcher(BANKING)
+    assert matcher.find('bug error issue') == {'reliability': ['error', 'bug', 'issue']}
+
+def test_aspect_mask():
+    matcher = AspectMatcher(BANKING)
+    mask = matcher.aspect_mask('lambat dan error')
+    assert mask == (1 << matcher.aspects.index('performance')) | (1 << matcher.aspects.index('reliability'))
+    assert matcher.aspect_mask('') == 0
+
+def test_matchers_are_cached_by_content():
+    first = get_aspect_matcher({'a': ['x', 'y']})
+    assert get_aspect_matcher({'a': ['x', 'y']}) is first
+    assert get_aspect_matcher({'a': ['y', 'x']}) is not first
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+import analysis
+
+@pytest.fixture
+def lexicon_file(tmp_path, monkeypatch):
+    path = tmp_path / 'lexicon.json'
+    monkeypatch.setattr(analysis, 'SENTIMENT_LEXICON_PATH', str(path))
+    monkeypatch.setattr(analysis, '_lexicon', None)
+
+    def write(words):
+        path.write_text(json.dumps({'words': words, 'negations': ['tidak']}), encoding='utf-8')
+        # A new process would load the edited file
+        analysis._lexicon = None
+    return write
+
+def test_lexicon_edit_changes_pipeline_version(lexicon_file):
+    lexicon_file({'bagus': 2.5, 'buruk': -2.5})
+    before = analysis.pipeline_version(tokenizer='whitespace', engine='lexicon')
+    assert analysis.pipeline_version(tokenizer='whitespace', engine='lexicon') == before
+
+    lexicon_file({'bagus': 2.5, 'buruk': -3.0})
+    after = analysis.pipeline_version(tokenizer='whitespace', engine='lexicon')
+    assert after != before
+    assert after.startswith('v') and '-lexicon.' in after
+
+def test_other_engines_ignore_the_lexicon(lexicon_file):
+    lexicon_file({'bagus': 2.5})
+    before = analysis.pipeline_version(tokenizer='whitespace', engine='textblob')
+    lexicon_file({'bagus': 1.0})
+    assert analysis.pipeline_version(tokenizer='whitespace', engine='textblob') == before
@@ -0,0 +1,88 @@
+import datetime
+
+import pytest
+from google_play_scraper.features.reviews import _ContinuationToken
+
+import scraper
+from scraper import (IncompleteSyncError, deserialize_review_token, fetch_review_segment,
+                     serialize_review_token)
+
+START = datetime.datetime(2024, 1, 1)
+
+class StreamBackend:
+    """Newest-first review stream of `total` reviews, optionally ending early after `truncate_at`"""
+
+    def __init__(self, total, truncate_at=None):
+        self.total = total
+        self.truncate_at = truncate_at
+        self.calls = 0
+
+    def review(self, position):
+        # Position 0 is the newest review
+        return {
+            'reviewId': f'r{self.total - position}',
+            'userName': 'user',
+            'score': 4,
+            'content': f'review {position}',
+            'at': START + datetime.timedelta(minutes=self.total - position)
+        }
+
+    def reviews(self, app_id, lang='id', country='id', sort=None, count=100, filter_score_with=None,
+                continuation_token=None):
+        self.calls += 1
+        offset = continuation_token.token if continuation_token is not None else 0
+        end = min(offset + count, self.total)
+        if self.truncate_at is not None and end > self.truncate_at:
+            # Like google_play_scraper.reviews() swallowing a failed request: a short page and no token
+            return [self.review(p) for p in range(offset, self.truncate_at)], _ContinuationToken(
+                None, lang, country, sort, count, filter_score_with, None)
+        next_offset = end if end < self.total else None
+        page = [self.review(p) for p in range(offset, end)]
+        return page, _ContinuationToken(next_offset, lang, country, sort, count, filter_score_with, None)
+
+@pytest.fixture
+def stream(monkeypatch):
+    def install(total, truncate_at=None):
+        backend = StreamBackend(total, truncate_at)
+        monkeypatch.setattr(scraper, 'play_backend', backend)
+        return backend
+    return install
+
+def test_stops_at_watermark(stream):
+    backend = stream(500)
+    watermark = backend.review(30)
+    reviews, token = fetch_review_segment('com.example', since=watermark['at'],
+                                          known_review_ids={watermark['reviewId']}, batch_size=20)
+    assert [r['reviewId'] for r in reviews] == [backend.review(p)['reviewId'] for p in range(30)]
+    assert token is None
+    assert backend.calls == 2
+
+def test_without_watermark_reads_to_end_of_history(stream):
+    stream(45)
+    reviews, token = fetch_review_segment('com.example', batch_size=20)
+    assert len(reviews) == 45
+    assert token is None
+
+def test_truncated_stream_before_watermark_raises(stream):
+    backend = stream(500, truncate_at=50)
+    watermark = backend.review(120)
+    with pytest.raises(IncompleteSyncError):
+        fetch_review_segment('com.example', since=watermark['at'], known_review_ids={watermark['reviewId']},
+                             batch_size=20)
+
+def test_limit_returns_resumable_token(stream):
+    backend = stream(500)
+    watermark = backend.review(130)
+    since, known = watermark['at'], {watermark['reviewId']}
+
+    first, token = fetch_review_segment('com.example', since=since, known_review_ids=known,
+                                        max_reviews=50, batch_size=20)
+    assert len(first) == 60
+    assert token is not None
+
+    # The token survives a round trip through the sync state
+    rest, token = fetch_review_segment('com.example', since=since, known_review_ids=known,
+                                       resume_token=deserialize_review_token(serialize_review_token(token)),
+                                       batch_size=20)
+    assert token is None
+    assert [r['reviewId'] for r in first + rest] == [backend.review(p)['reviewId'] for p in range(130)]
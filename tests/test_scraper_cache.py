@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+
+from scraper_cache import ResponseCache
+
+def entry_count(cache):
+    with sqlite3.connect(cache.path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'play_cache.db')
+
+def test_get_returns_stored_value(cache_path):
+    cache = ResponseCache(path=cache_path)
+    cache.set('reviews', 'com.example', [{'reviewId': 'r1'}])
+    assert cache.get('reviews', 'com.example') == (True, [{'reviewId': 'r1'}])
+    assert cache.get('reviews', 'com.other') == (False, None)
+
+def test_expired_entry_is_a_miss(cache_path):
+    cache = ResponseCache(path=cache_path)
+    cache.set('reviews', 'com.example', [], ttl=-1)
+    assert cache.get('reviews', 'com.example') == (False, None)
+
+def test_set_purges_expired_entries(cache_path):
+    cache = ResponseCache(path=cache_path, purge_interval=0)
+    for i in range(5):
+        cache.set('reviews', f'com.expired{i}', [], ttl=-1)
+    cache.set('reviews', 'com.fresh', [])
+    assert entry_count(cache) == 1
+    assert cache.get('reviews', 'com.fresh') == (True, [])
+
+def test_purge_waits_for_interval(cache_path):
+    cache = ResponseCache(path=cache_path, purge_interval=3600)
+    cache.set('reviews', 'com.first', [])
+    for i in range(5):
+        cache.set('reviews', f'com.expired{i}', [], ttl=-1)
+    # The first write purged, the next purge isn't due for an hour
+    assert entry_count(cache) == 6
+    assert cache.purge_expired() == 5
+    assert entry_count(cache) == 1
+
+def test_stats_include_unflushed_counts(cache_path):
+    cache = ResponseCache(path=cache_path)
+    cache.set('metadata', 'com.example', {'title': 'Example'})
+    cache.get('metadata', 'com.example')
+    cache.get('metadata', 'com.missing')
+
+    stats = cache.stats()['namespaces']['metadata']
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+    # A second cache on the same file sees the flushed totals
+    assert ResponseCache(path=cache_path).stats()['namespaces']['metadata']['hits'] == 1
@@ -0,0 +1,41 @@
+import pytest
+
+import scraper
+from scraper import LOCALES, _fetch_reviews_with_fallback, _locale_order
+
+PACKAGE = 'com.example'
+
+class LocaleBackend:
+    """Review pages per language: a list of reviews, or an exception to raise"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def reviews(self, app_id, lang='id', country='id', sort=None, count=100, filter_score_with=None,
+                continuation_token=None):
+        page = self.pages[lang]
+        if isinstance(page, Exception):
+            raise page
+        return page, None
+
+def review(review_id):
+    return {'reviewId': review_id, 'userName': 'user', 'score': 4, 'content': 'ok', 'at': None}
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(scraper, '_locale_memory', {})
+    monkeypatch.setattr(scraper.play_transport, 'max_retries', 0)
+
+    def install(pages):
+        monkeypatch.setattr(scraper, 'play_backend', LocaleBackend(pages))
+    return install
+
+def test_empty_primary_locale_is_not_forgotten(backend):
+    backend({'id': [], 'en': [review('en1')]})
+    assert [r['reviewId'] for r in _fetch_reviews_with_fallback(PACKAGE, 10, 'newest', 1)] == ['en1']
+    assert _locale_order('reviews', PACKAGE) == LOCALES
+
+def test_failing_primary_locale_is_skipped_next_time(backend):
+    backend({'id': RuntimeError('blocked'), 'en': [review('en1')]})
+    _fetch_reviews_with_fallback(PACKAGE, 10, 'newest', None)
+    assert _locale_order('reviews', PACKAGE)[0] == ('en', 'us')
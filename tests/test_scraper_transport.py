@@ -0,0 +1,133 @@
+import time
+
+import pytest
+from google_play_scraper.exceptions import NotFoundError
+
+import scraper_replay
+from scraper_replay import LiveBackend
+
+from scraper_transport import (AdaptiveRateLimiter, AppNotFoundError, CircuitBreaker, CircuitOpenError,
+                               PlayTransport, RetriesExhaustedError, ScraperError)
+
+RESET_TIMEOUT = 0.05
+
+class FlakyCall:
+    """Play Store stand-in failing with the given errors before succeeding"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, package):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"result for {package}"
+
+def make_transport(threshold=2, max_retries=2):
+    return PlayTransport(
+        rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000, max_rate=1000),
+        breaker=CircuitBreaker(threshold=threshold, reset_timeout=RESET_TIMEOUT),
+        max_retries=max_retries,
+        backoff_base=0,
+        backoff_max=0
+    )
+
+def open_circuit(transport, package='com.example'):
+    for _ in range(transport.breaker.threshold):
+        with pytest.raises(RetriesExhaustedError):
+            transport.call(FlakyCall([Exception('boom')] * 10), package)
+
+def test_retries_then_succeeds():
+    transport = make_transport()
+    fn = FlakyCall([Exception('throttled')])
+    assert transport.call(fn, 'com.example') == 'result for com.example'
+    assert fn.calls == 2
+    assert transport.stats()['retries'] == 1
+
+def test_retries_exhausted():
+    transport = make_transport(max_retries=2)
+    fn = FlakyCall([Exception('boom')] * 10)
+    with pytest.raises(RetriesExhaustedError) as excinfo:
+        transport.call(fn, 'com.example')
+    assert fn.calls == 3
+    assert excinfo.value.package == 'com.example'
+    assert transport.stats()['failures'] == 1
+
+def test_not_found_is_not_retried():
+    transport = make_transport(threshold=1)
+    fn = FlakyCall([NotFoundError('no such app')])
+    with pytest.raises(AppNotFoundError) as excinfo:
+        transport.call(fn, 'com.missing')
+    # Typed like every other scraping failure, so `except ScraperError` handlers see it
+    assert isinstance(excinfo.value, ScraperError)
+    assert isinstance(excinfo.value.__cause__, NotFoundError)
+    assert fn.calls == 1
+    assert transport.stats()['retries'] == 0
+    # A missing app doesn't count towards opening the circuit
+    assert transport.breaker.allow('com.missing')
+    assert transport.stats()['open_circuits'] == []
+
+def test_circuit_opens_after_threshold():
+    transport = make_transport(threshold=2)
+    open_circuit(transport)
+    assert transport.stats()['open_circuits'] == ['com.example']
+
+    fn = FlakyCall()
+    with pytest.raises(CircuitOpenError):
+        transport.call(fn, 'com.example')
+    assert fn.calls == 0
+    assert transport.stats()['rejected'] == 1
+
+    # Other packages are unaffected
+    assert transport.call(fn, 'com.other') == 'result for com.other'
+
+def test_half_open_success_closes_circuit():
+    transport = make_transport(threshold=2)
+    open_circuit(transport)
+    time.sleep(RESET_TIMEOUT * 1.5)
+
+    fn = FlakyCall()
+    assert transport.call(fn, 'com.example') == 'result for com.example'
+    assert transport.stats()['open_circuits'] == []
+    assert transport.call(fn, 'com.example') == 'result for com.example'
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker(threshold=1, reset_timeout=RESET_TIMEOUT)
+    breaker.record_failure('com.example')
+    assert not breaker.allow('com.example')
+    time.sleep(RESET_TIMEOUT * 1.5)
+    assert breaker.allow('com.example')
+    # The trial re-armed the timer, so further calls wait for its outcome
+    assert not breaker.allow('com.example')
+
+def test_half_open_failure_reopens_circuit():
+    transport = make_transport(threshold=2, max_retries=0)
+    open_circuit(transport)
+    time.sleep(RESET_TIMEOUT * 1.5)
+
+    fn = FlakyCall([Exception('still down')])
+    with pytest.raises(RetriesExhaustedError):
+        transport.call(fn, 'com.example')
+    assert fn.calls == 1
+
+    with pytest.raises(CircuitOpenError):
+        transport.call(FlakyCall(), 'com.example')
+    assert transport.stats()['open_circuits'] == ['com.example']
+
+def test_live_review_page_failure_is_retried(monkeypatch):
+    pages = FlakyCall([Exception('PlayGatewayError')])
+
+    def fetch_review_items(url, app_id, *args):
+        # Raises like the library's page fetch, then serves an empty last page
+        pages(app_id)
+        return [], ['end']
+
+    monkeypatch.setattr(scraper_replay, '_fetch_review_items', fetch_review_items)
+    transport = make_transport()
+
+    result, token = transport.call(LiveBackend().reviews, 'com.example', lang='id', country='id')
+    assert result == []
+    assert token.token is None
+    assert pages.calls == 2
+    assert transport.stats()['retries'] == 1
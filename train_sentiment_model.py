@@ -0,0 +1,202 @@
+"""
+Train the rating-supervised sentiment model used by the 'model' sentiment engine
+
+Star ratings of stored reviews are the labels: 4-5 stars count as positive,
+1-2 as negative and 3-star reviews are skipped. The model is a naive Bayes
+log-count ratio over binary hashed unigrams + bigrams (see
+analysis.hashed_ngram_features), trained in one streaming pass.
+
+    python train_sentiment_model.py --database-url sqlite:///reviews.db
+    python train_sentiment_model.py --file reviews_com.jago.digitalBanking.csv --file reviews.ndjson
+
+Writes the weight vector as .npy (loaded memory-mapped at inference time)
+and a .json metadata file next to it. Then run the app with
+SENTIMENT_ENGINE=model.
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import time
+import zlib
+import numpy as np
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the hashed n-gram sentiment model on rated reviews")
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help="SQLAlchemy URL of the database holding scraped_reviews (defaults to DATABASE_URL)")
+    parser.add_argument('--file', action='append', default=[],
+                        help="CSV, JSON or NDJSON review export with ratings (repeatable)")
+    parser.add_argument('--output', default=None, help="Model path (defaults to SENTIMENT_MODEL_PATH)")
+    parser.add_argument('--n-features', type=int, default=None, help="Hashed feature space size, a power of two")
+    parser.add_argument('--no-bigrams', action='store_true', help="Only use unigram features")
+    parser.add_argument('--alpha', type=float, default=1.0, help="Additive smoothing")
+    parser.add_argument('--holdout', type=float, default=0.1, help="Fraction of reviews held out for evaluation")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Reviews featurized at a time")
+    return parser.parse_args()
+
+def iter_database_reviews(database_url, batch_size):
+    """Yield (text, rating) pairs from the scraped_reviews table"""
+    from sqlalchemy import create_engine, select
+    from models import ScrapedReview
+
+    table = ScrapedReview.__table__
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            select(table.c.text, table.c.rating)
+        )
+        for text, rating in result:
+            yield text, rating
+
+def iter_file_reviews(path):
+    """Yield (text, rating) pairs from a CSV (/export_reviews_csv format), JSON or NDJSON export"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield row.get('Review'), row.get('Rating')
+        elif path.endswith('.ndjson') or path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    review = json.loads(line)
+                    yield review.get('content'), review.get('score')
+        else:
+            for review in json.load(f):
+                yield review.get('content'), review.get('score')
+
+def iter_batches(pairs, batch_size):
+    batch = []
+    for pair in pairs:
+        batch.append(pair)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def write_metadata(output, metadata):
+    """Atomically write the model metadata next to the weights"""
+    path = os.path.splitext(output)[0] + '.json'
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, path)
+
+def label_for_rating(rating):
+    """1 for positive, 0 for negative, None for neutral or missing ratings"""
+    try:
+        rating = int(rating)
+    except (TypeError, ValueError):
+        return None
+    if rating >= 4:
+        return 1
+    if 1 <= rating <= 2:
+        return 0
+    return None
+
+def main():
+    args = parse_args()
+
+    import analysis
+    from analysis import hashed_ngram_features
+
+    output = args.output or analysis.SENTIMENT_MODEL_PATH
+    n_features = args.n_features or analysis.HASHED_FEATURES
+    if n_features & (n_features - 1):
+        raise SystemExit("--n-features must be a power of two")
+    bigrams = not args.no_bigrams
+
+    sources = []
+    if args.database_url:
+        sources.append(iter_database_reviews(args.database_url, args.batch_size))
+    for path in args.file:
+        sources.append(iter_file_reviews(path))
+    if not sources:
+        raise SystemExit("No training data, pass --database-url (or set DATABASE_URL) and/or --file")
+
+    def labelled_reviews():
+        for source in sources:
+            for text, rating in source:
+                label = label_for_rating(rating)
+                if text and label is not None:
+                    yield text, label
+
+    started = time.perf_counter()
+    positive_counts = np.zeros(n_features, dtype=np.float64)
+    negative_counts = np.zeros(n_features, dtype=np.float64)
+    class_counts = [0, 0]
+    holdout = []
+
+    for batch in iter_batches(labelled_reviews(), args.batch_size):
+        train = []
+        for text, label in batch:
+            # Deterministic split, so retraining on the same data evaluates on the same reviews
+            if zlib.crc32(text.encode('utf-8')) % 10000 < args.holdout * 10000:
+                holdout.append((text, label))
+            else:
+                train.append((text, label))
+        if not train:
+            continue
+
+        labels = np.array([label for _, label in train], dtype=np.int8)
+        doc_ids, feature_ids = hashed_ngram_features([text for text, _ in train], n_features=n_features,
+                                                     bigrams=bigrams)
+        positive = labels[doc_ids] == 1
+        positive_counts += np.bincount(feature_ids[positive], minlength=n_features)
+        negative_counts += np.bincount(feature_ids[~positive], minlength=n_features)
+        class_counts[1] += int(labels.sum())
+        class_counts[0] += int(len(labels) - labels.sum())
+
+    if min(class_counts) == 0:
+        raise SystemExit(f"Need both positive and negative reviews, got {class_counts[1]} positive "
+                         f"and {class_counts[0]} negative")
+
+    # Naive Bayes log-count ratio; features never seen in training keep weight 0
+    p = positive_counts + args.alpha
+    q = negative_counts + args.alpha
+    weights = np.log((p / p.sum()) / (q / q.sum()))
+    weights[(positive_counts == 0) & (negative_counts == 0)] = 0
+    weights = weights.astype(np.float32)
+    bias = float(np.log(class_counts[1] / class_counts[0]))
+
+    # Write atomically, so running workers keep their mapped copy of the old model
+    tmp_output = f"{os.path.splitext(output)[0]}.{os.getpid()}.tmp.npy"
+    np.save(tmp_output, weights)
+    os.replace(tmp_output, output)
+
+    metadata = {
+        'version': hashlib.sha1(weights.tobytes()).hexdigest()[:12],
+        'n_features': n_features,
+        'bigrams': bigrams,
+        'bias': bias,
+        'alpha': args.alpha,
+        'train_count': sum(class_counts),
+        'positive_count': class_counts[1],
+        'negative_count': class_counts[0],
+        'trained_at': datetime.datetime.now().isoformat(timespec='seconds')
+    }
+
+    if holdout:
+        # Evaluate with the same code path the app uses
+        analysis.SENTIMENT_MODEL_PATH = output
+        write_metadata(output, metadata)
+        polarity, _ = analysis.model_sentiment_scores([text for text, _ in holdout])
+        predicted = polarity > 0
+        actual = np.array([label for _, label in holdout], dtype=bool)
+        metadata['holdout_count'] = len(holdout)
+        metadata['holdout_accuracy'] = round(float((predicted == actual).mean()), 4)
+        metadata['holdout_negative_recall'] = round(float((~predicted[~actual]).mean()), 4) if (~actual).any() else None
+
+    write_metadata(output, metadata)
+
+    print(f"Trained on {metadata['train_count']} reviews ({class_counts[1]} positive, {class_counts[0]} negative) "
+          f"in {time.perf_counter() - started:.1f}s")
+    if holdout:
+        print(f"Holdout accuracy on {metadata['holdout_count']} reviews: {metadata['holdout_accuracy']:.3f} "
+              f"(negative recall {metadata['holdout_negative_recall']})")
+    print(f"Model {metadata['version']} written to {output}")
+
+if __name__ == '__main__':
+    main()